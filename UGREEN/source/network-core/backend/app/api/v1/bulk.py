@@ -0,0 +1,83 @@
+"""
+Request-body handling shared by the bulk endpoints.
+
+A bulk body is either a JSON array or, with Content-Type
+application/x-ndjson, one JSON object per line. NDJSON is parsed while it
+streams in, so a client can pipe an export straight into the API. Items are
+validated one by one: an invalid item is reported in the results and the
+rest of the request still goes through.
+"""
+import json
+from collections import Counter
+from fastapi import HTTPException, Request
+from pydantic import BaseModel, ValidationError
+from app.schemas.bulk import BulkItemResult, BulkResult
+
+MAX_BULK_ITEMS = 50_000
+NDJSON_TYPES = ("application/x-ndjson", "application/jsonl", "application/jsonlines")
+
+_INVALID_JSON = object()
+
+
+def _too_many() -> HTTPException:
+    return HTTPException(status_code=413, detail=f"At most {MAX_BULK_ITEMS} items per request")
+
+
+def _parse_line(line: bytes):
+    try:
+        return json.loads(line)
+    except ValueError:
+        return _INVALID_JSON
+
+
+async def read_items(request: Request) -> list:
+    """Raw items of a JSON array or NDJSON body; 422 if it is neither, 413 if too long."""
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_TYPES:
+        items = []
+        buffer = bytearray()
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, rest = buffer.split(b"\n")
+            buffer = bytearray(rest)
+            items.extend(_parse_line(line) for line in lines if line.strip())
+            if len(items) > MAX_BULK_ITEMS:
+                raise _too_many()
+        if buffer.strip():
+            items.append(_parse_line(bytes(buffer)))
+    else:
+        try:
+            items = json.loads(await request.body())
+        except ValueError:
+            items = None
+        if not isinstance(items, list):
+            raise HTTPException(status_code=422, detail="Body must be a JSON array or NDJSON")
+    if len(items) > MAX_BULK_ITEMS:
+        raise _too_many()
+    return items
+
+
+def _describe(exc: ValidationError) -> str:
+    error = exc.errors()[0]
+    location = ".".join(str(part) for part in error["loc"])
+    return f"{location}: {error['msg']}" if location else error["msg"]
+
+
+def validate_items(items: list, model: type[BaseModel]) -> tuple[list[tuple[int, BaseModel]], list[BulkItemResult]]:
+    """Split raw items into (index, model) pairs and "invalid" results."""
+    valid, invalid = [], []
+    for index, raw in enumerate(items):
+        if raw is _INVALID_JSON:
+            invalid.append(BulkItemResult(index=index, status="invalid", error="Invalid JSON"))
+            continue
+        try:
+            valid.append((index, model.model_validate(raw)))
+        except ValidationError as exc:
+            invalid.append(BulkItemResult(index=index, status="invalid", error=_describe(exc)))
+    return valid, invalid
+
+
+def bulk_result(results: list[BulkItemResult], **extra_counts: int) -> BulkResult:
+    """Results in request order, with a count per status."""
+    results.sort(key=lambda r: -1 if r.index is None else r.index)
+    return BulkResult(counts={**Counter(r.status for r in results), **extra_counts}, results=results)
@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from app.services import read_cache
+
+router = APIRouter(prefix="/cache", tags=["cache"])
+
+
+@router.get("/stats")
+async def cache_stats():
+    """Size and hit/miss/eviction counters of each in-process read cache."""
+    return read_cache.stats()
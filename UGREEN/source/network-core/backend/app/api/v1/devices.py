@@ -1,15 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
-from app.schemas.device import DeviceCreate, DeviceRead, DevicePatch
-from app.services import device_service
+from app.api.v1.bulk import bulk_result, read_items, validate_items
+from app.api.v1.encoding import rows_response
+from app.db.session import get_db, get_read_db
+from app.schemas.bulk import BulkItemResult, BulkResult, DeviceBulkDelete
+from app.schemas.device import DeviceBulkPatch, DeviceCreate, DeviceRead, DevicePatch, ProbeRollupRead
+from app.services import device_service, probe_service
 
 router = APIRouter(prefix="/devices", tags=["devices"])
 
 
+DEFAULT_PAGE_SIZE = 500
+MAX_PAGE_SIZE = 5000
+
+
 @router.get("", response_model=list[DeviceRead])
-async def list_devices(db: AsyncSession = Depends(get_db)):
-    return await device_service.list_devices(db)
+async def list_devices(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    device_type: list[str] | None = Query(None),
+    status_: list[str] | None = Query(None, alias="status"),
+    vendor: str | None = Query(None, description="Case-insensitive vendor prefix"),
+    cidr: str | None = Query(None, description="IP range, e.g. 192.168.0.0/24"),
+    db: AsyncSession = Depends(get_read_db),
+):
+    try:
+        devices, next_cursor = await device_service.list_devices(
+            db, limit=limit, cursor=cursor,
+            device_type=device_type, status=status_, vendor_prefix=vendor, cidr=cidr,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return rows_response(device_service.READ_COLUMNS, devices, headers)
 
 
 @router.post("", response_model=DeviceRead, status_code=status.HTTP_201_CREATED)
@@ -17,6 +41,48 @@ async def create_device(data: DeviceCreate, db: AsyncSession = Depends(get_db)):
     return await device_service.create_device(db, data)
 
 
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_devices(request: Request, db: AsyncSession = Depends(get_db)):
+    """JSON array or NDJSON of DeviceCreate; per item: created | exists | invalid."""
+    valid, results = validate_items(await read_items(request), DeviceCreate)
+    created = await device_service.bulk_create_devices(db, [data for _, data in valid])
+    for (index, _), (outcome, device_id) in zip(valid, created):
+        results.append(BulkItemResult(index=index, status=outcome, id=device_id))
+    return bulk_result(results)
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_patch_devices(request: Request, db: AsyncSession = Depends(get_db)):
+    """JSON array or NDJSON of {"id", ...DevicePatch}; per item: updated | not_found | invalid."""
+    valid, results = validate_items(await read_items(request), DeviceBulkPatch)
+    found = await device_service.bulk_update_devices(db, [(data.id, data) for _, data in valid])
+    for index, data in valid:
+        results.append(BulkItemResult(index=index, status="updated" if data.id in found else "not_found", id=data.id))
+    return bulk_result(results)
+
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_devices(body: DeviceBulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete by {"ids": [...]} or {"filter": {...}}; links touching the devices go too."""
+    filters = body.filter.model_dump() if body.filter else {}
+    try:
+        deleted, links_deleted = await device_service.bulk_delete_devices(
+            db, body.ids,
+            device_type=filters.get("device_type"), status=filters.get("status"),
+            vendor_prefix=filters.get("vendor"), cidr=filters.get("cidr"),
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    if body.ids is None:
+        results = [BulkItemResult(status="deleted", id=device_id) for device_id in sorted(deleted)]
+    else:
+        results = [
+            BulkItemResult(index=index, status="deleted" if device_id in deleted else "not_found", id=device_id)
+            for index, device_id in enumerate(body.ids)
+        ]
+    return bulk_result(results, links_deleted=links_deleted)
+
+
 @router.get("/{device_id}", response_model=DeviceRead, status_code=status.HTTP_200_OK)
 async def get_device(device_id: str, db: AsyncSession = Depends(get_db)):
     device = await device_service.get_device(db, device_id)
@@ -25,6 +91,24 @@ async def get_device(device_id: str, db: AsyncSession = Depends(get_db)):
     return device
 
 
+@router.get("/{device_id}/probes", response_model=list[ProbeRollupRead])
+async def get_device_probes(
+    device_id: str,
+    resolution: str = Query("1m", description="Bucket width: 1m or 1h"),
+    since: datetime | None = Query(None, description="Window start (UTC), inclusive"),
+    until: datetime | None = Query(None, description="Window end (UTC), exclusive"),
+    db: AsyncSession = Depends(get_db),
+    read_db: AsyncSession = Depends(get_read_db),
+):
+    # The existence check goes through the read cache, which only the primary fills.
+    if not await device_service.get_device(db, device_id):
+        raise HTTPException(status_code=404, detail="Device not found")
+    try:
+        return await probe_service.get_rollups(read_db, device_id, resolution, since, until)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+
+
 @router.patch("/{device_id}", response_model=DeviceRead)
 async def patch_device(device_id: str, data: DevicePatch, db: AsyncSession = Depends(get_db)):
     device = await device_service.update_device(db, device_id, data)
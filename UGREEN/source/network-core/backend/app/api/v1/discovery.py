@@ -1,15 +1,32 @@
-from fastapi import APIRouter, Depends, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
+from app.schemas.discovery import DiscoveryJobRead
+from app.services import discovery_service
 
 router = APIRouter(prefix="/discovery", tags=["discovery"])
 
 
 @router.post("/run")
-async def run_discovery(background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db)):
-    # Lazy import — nmap_service is created in Task 9.
-    # Importing inside the function body prevents ImportError at startup
-    # when the module does not yet exist.
-    from app.services import nmap_service
-    background_tasks.add_task(nmap_service.import_from_files, db)
-    return {"status": "discovery started"}
+async def run_discovery(db: AsyncSession = Depends(get_db)):
+    # The import runs as a background job on its own sessions; a trigger
+    # while a job is active attaches to that job instead of starting another.
+    job, started = await discovery_service.start(db)
+    return {
+        "status": "discovery started" if started else "discovery already running",
+        "job_id": job.id,
+        "state": job.state,
+    }
+
+
+@router.get("/jobs", response_model=list[DiscoveryJobRead])
+async def list_jobs(limit: int = Query(20, ge=1, le=100), db: AsyncSession = Depends(get_db)):
+    return await discovery_service.list_jobs(db, limit)
+
+
+@router.get("/jobs/{job_id}", response_model=DiscoveryJobRead)
+async def get_job(job_id: str, db: AsyncSession = Depends(get_db)):
+    job = await discovery_service.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Discovery job not found")
+    return job
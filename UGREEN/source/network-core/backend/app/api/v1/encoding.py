@@ -0,0 +1,37 @@
+"""
+JSON responses for big row lists, without Pydantic.
+
+List endpoints get plain row tuples from the services and encode them here
+straight to bytes: with orjson when installed (the "fast" extra, used in
+the Docker image), else the standard library. Both produce the same JSON
+as the Pydantic read schemas — naive datetimes in ISO 8601 without an
+offset. The routes keep response_model for the OpenAPI docs; returning a
+Response bypasses its validation.
+"""
+import json
+from collections.abc import Iterable, Sequence
+from datetime import date, datetime
+from fastapi import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def rows_response(columns: Sequence[str], rows: Iterable[Sequence], headers: dict[str, str] | None = None) -> Response:
+    """A JSON array of objects keyed by `columns`, one per row."""
+    body = dumps([dict(zip(columns, row)) for row in rows])
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,20 +1,76 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
-from app.schemas.link import LinkCreate, LinkRead, LinkPatch
+from app.api.v1.bulk import bulk_result, read_items, validate_items
+from app.api.v1.encoding import rows_response
+from app.db.session import get_db, get_read_db
+from app.schemas.bulk import BulkItemResult, BulkResult, LinkBulkDelete
+from app.schemas.link import LinkBulkPatch, LinkCreate, LinkRead, LinkPatch
 from app.services import link_service
+from app.api.v1.devices import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
 
 router = APIRouter(prefix="/links", tags=["links"])
 
 
 @router.get("", response_model=list[LinkRead])
-async def list_links(db: AsyncSession = Depends(get_db)):
-    return await link_service.list_links(db)
+async def list_links(
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+    device_id: str | None = Query(None, description="Links with this device as source or target"),
+    link_type: str | None = None,
+    db: AsyncSession = Depends(get_read_db),
+):
+    links, next_cursor = await link_service.list_links(
+        db, limit=limit, cursor=cursor, device_id=device_id, link_type=link_type,
+    )
+    headers = {"X-Next-Cursor": next_cursor} if next_cursor else None
+    return rows_response(link_service.READ_COLUMNS, links, headers)
 
 
 @router.post("", response_model=LinkRead, status_code=status.HTTP_201_CREATED)
 async def create_link(data: LinkCreate, db: AsyncSession = Depends(get_db)):
-    return await link_service.create_link(db, data)
+    try:
+        return await link_service.create_link(db, data)
+    except IntegrityError:
+        await db.rollback()
+        if await link_service.find_link(db, data.source_id, data.target_id):
+            raise HTTPException(status_code=409, detail="Link already exists")
+        raise HTTPException(status_code=422, detail="Unknown source or target device")
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_create_links(request: Request, db: AsyncSession = Depends(get_db)):
+    """JSON array or NDJSON of LinkCreate; per item: created | exists | unknown_device | invalid."""
+    valid, results = validate_items(await read_items(request), LinkCreate)
+    created = await link_service.bulk_create_links(db, [data for _, data in valid])
+    for (index, _), (outcome, link_id) in zip(valid, created):
+        results.append(BulkItemResult(index=index, status=outcome, id=link_id))
+    return bulk_result(results)
+
+
+@router.patch("/bulk", response_model=BulkResult)
+async def bulk_patch_links(request: Request, db: AsyncSession = Depends(get_db)):
+    """JSON array or NDJSON of {"id", "link_type"}; per item: updated | not_found | invalid."""
+    valid, results = validate_items(await read_items(request), LinkBulkPatch)
+    found = await link_service.bulk_update_links(db, [(data.id, data) for _, data in valid])
+    for index, data in valid:
+        results.append(BulkItemResult(index=index, status="updated" if data.id in found else "not_found", id=data.id))
+    return bulk_result(results)
+
+
+@router.post("/bulk/delete", response_model=BulkResult)
+async def bulk_delete_links(body: LinkBulkDelete, db: AsyncSession = Depends(get_db)):
+    """Delete by {"ids": [...]} or {"filter": {"device_id", "link_type"}}."""
+    filters = body.filter.model_dump() if body.filter else {}
+    deleted = await link_service.bulk_delete_links(db, body.ids, **filters)
+    if body.ids is None:
+        results = [BulkItemResult(status="deleted", id=link_id) for link_id in sorted(deleted)]
+    else:
+        results = [
+            BulkItemResult(index=index, status="deleted" if link_id in deleted else "not_found", id=link_id)
+            for index, link_id in enumerate(body.ids)
+        ]
+    return bulk_result(results)
 
 
 @router.patch("/{link_id}", response_model=LinkRead)
@@ -0,0 +1,124 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.v1.encoding import dumps
+from app.db.session import get_db
+from app.services import events, layout_service, read_cache, topology_service
+from app.services.graph_service import graph_index
+
+router = APIRouter(prefix="/topology", tags=["topology"])
+
+KEEPALIVE_SECONDS = 15
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison: GZipMiddleware may re-encode the body, so W/ prefixes are ignored.
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+@router.get("")
+async def get_topology(request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    All devices and links in one payload, with ETag / If-None-Match support.
+
+    Nodes carry x/y from the cached server-side layout, so the map can use a
+    preset layout instead of running one in the browser. The encoded
+    snapshot is kept in read_cache.topology until the next topology event.
+    """
+    generation = read_cache.topology.generation
+    cached = read_cache.topology.get("snapshot")
+    version = cached[0] if cached else await topology_service.topology_version(db)
+    etag = f'W/"{version}"'
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if cached:
+        body = cached[1]
+    else:
+        snapshot = await topology_service.get_snapshot(db)
+        await layout_service.apply_layout(db, snapshot)
+        body = dumps({"version": version, **snapshot})
+        read_cache.topology.put("snapshot", (version, body), generation)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def _require_devices(graph, *device_ids: str) -> None:
+    for device_id in device_ids:
+        if device_id not in graph.index:
+            raise HTTPException(status_code=404, detail="Device not found")
+
+
+@router.get("/path")
+async def shortest_path(source: str, target: str, db: AsyncSession = Depends(get_db)):
+    """Fewest-hop path between two devices over links; path is [] when they are not connected."""
+    graph = await graph_index.get(db)
+    _require_devices(graph, source, target)
+    path = graph.shortest_path(source, target)
+    return {"source": source, "target": target, "hops": len(path) - 1 if path else None, "path": path or []}
+
+
+@router.get("/blast-radius/{device_id}")
+async def blast_radius(device_id: str, db: AsyncSession = Depends(get_db)):
+    """Devices that lose every path to a router if device_id goes down."""
+    graph = await graph_index.get(db)
+    _require_devices(graph, device_id)
+    devices = graph.blast_radius(device_id)
+    return {"device_id": device_id, "count": len(devices), "devices": devices}
+
+
+@router.get("/components")
+async def components(
+    limit: int = Query(100, ge=1, le=10_000),
+    min_size: int = Query(1, ge=1),
+    db: AsyncSession = Depends(get_db),
+):
+    """Connected components, largest first."""
+    graph = await graph_index.get(db)
+    found = [c for c in graph.components() if len(c) >= min_size]
+    return {
+        "count": len(found),
+        "components": [{"size": len(c), "devices": c} for c in found[:limit]],
+    }
+
+
+async def sse_events(queue: asyncio.Queue):
+    """Format broker events from `queue` as a Server-Sent Events stream."""
+    yield "retry: 5000\n\n"
+    while True:
+        try:
+            event = await asyncio.wait_for(queue.get(), timeout=KEEPALIVE_SECONDS)
+        except TimeoutError:
+            yield ": keepalive\n\n"
+            continue
+        yield f"data: {json.dumps(event, separators=(',', ':'), default=str)}\n\n"
+
+
+@router.get("/stream")
+async def stream_topology():
+    """
+    Server-Sent Events feed of topology deltas (see app.services.events).
+
+    Holds no database session — events come from the process-wide
+    LISTEN connection.
+    """
+    queue = events.broker.subscribe()
+
+    async def body():
+        try:
+            async for chunk in sse_events(queue):
+                yield chunk
+        finally:
+            events.broker.unsubscribe(queue)
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
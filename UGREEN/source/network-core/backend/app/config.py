@@ -6,7 +6,21 @@ class Settings(BaseSettings):
     model_config = ConfigDict(env_file=".env")
 
     DATABASE_URL: str
+    DATABASE_READ_URL: str = ""  # read replica for list/history GETs (app/db/session.py); "" = primary
     DEBUG: bool = False
+    # API engine pools (PostgreSQL only); defaults are SQLAlchemy's
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # seconds a request waits for a connection before failing
+    DB_POOL_RECYCLE: int = -1  # seconds before a connection is replaced; -1 = never
+    DB_POOL_PRE_PING: bool = False  # test connections on checkout (replica failover, idle timeouts)
+    DB_STATEMENT_CACHE_SIZE: int = 100  # asyncpg prepared statements per connection; 0 behind pgbouncer
+    NMAP_INGEST_WORKERS: int = 0  # processes parsing scan files; 0 = one per CPU
+    DEVICE_RULES_PATH: str = ""  # device type rules; "" = app/services/device_rules.json
+    OUI_DB_PATH: str = ""  # compiled IEEE OUI index (app/services/oui_db.py); "" = nmap vendors only
+    READ_CACHE_SIZE: int = 4096  # entries per read cache (app/services/read_cache.py); 0 = off
+    READ_CACHE_TTL: float = 30.0  # seconds; bounds staleness for writes that publish no event
+    METRICS_QUERY_WARN: int = 50  # log requests issuing more DB queries than this (N+1 hint); 0 = off
 
 
 settings = Settings()
@@ -0,0 +1,53 @@
+from collections.abc import Iterator, Sequence
+from sqlalchemy import bindparam, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+# Rows per multi-row statement. Keeps every statement well under the bind
+# parameter limits of PostgreSQL (32767) and SQLite (32766).
+BULK_BATCH_SIZE = 1000
+
+
+def chunks(items: Sequence, size: int = BULK_BATCH_SIZE) -> Iterator[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+async def existing_ids(db: AsyncSession, model, ids: Sequence[str]) -> set[str]:
+    """The subset of `ids` present in model's table, one SELECT per batch."""
+    found: set[str] = set()
+    for batch in chunks(list(dict.fromkeys(ids))):
+        result = await db.execute(select(model.id).where(model.id.in_(batch)))
+        found.update(result.scalars())
+    return found
+
+
+async def update_by_id(db: AsyncSession, model, patches: Sequence[tuple[str, dict]]) -> set[str]:
+    """
+    Apply per-row field patches keyed by primary key.
+
+    Patches for the same id are merged (later fields win); rows are then
+    grouped by the set of columns they touch, and each group is one
+    executemany UPDATE per batch. updated_at is refreshed on every row
+    written. Returns the ids that exist (patched or not).
+    """
+    merged: dict[str, dict] = {}
+    for row_id, fields in patches:
+        merged.setdefault(row_id, {}).update(fields)
+    found = await existing_ids(db, model, list(merged))
+
+    groups: dict[tuple[str, ...], list[dict]] = {}
+    for row_id, fields in merged.items():
+        if row_id in found and fields:
+            params = {"_id": row_id, **{f"v_{f}": value for f, value in fields.items()}}
+            groups.setdefault(tuple(sorted(fields)), []).append(params)
+
+    table = model.__table__
+    for columns, rows in groups.items():
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("_id"))
+            .values({**{c: bindparam(f"v_{c}") for c in columns}, "updated_at": func.now()})
+        )
+        for batch in chunks(rows):
+            await db.execute(stmt, list(batch))
+    return found
@@ -0,0 +1,39 @@
+from sqlalchemy import String, cast, func
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def dialect_name(db: AsyncSession) -> str:
+    return db.get_bind().dialect.name
+
+
+def upsert_insert(db: AsyncSession, table):
+    """
+    Return an INSERT construct with ON CONFLICT support for the session's dialect.
+
+    PostgreSQL is used in production, SQLite by the test fixtures — both
+    expose the same on_conflict_do_update / on_conflict_do_nothing API.
+    """
+    name = dialect_name(db)
+    if name == "postgresql":
+        return postgresql.insert(table)
+    if name == "sqlite":
+        return sqlite.insert(table)
+    raise NotImplementedError(f"ON CONFLICT inserts are not supported for dialect {name!r}")
+
+
+def uuid_sql(db: AsyncSession):
+    """
+    SQL expression producing a fresh UUID string per row, for INSERT ... SELECT
+    statements where the Python-side id default cannot run.
+    """
+    name = dialect_name(db)
+    if name == "postgresql":
+        return cast(func.gen_random_uuid(), String)
+    if name == "sqlite":
+        parts = [func.lower(func.hex(func.randomblob(n))) for n in (4, 2, 2, 2, 6)]
+        expr = parts[0]
+        for part in parts[1:]:
+            expr = expr.op("||")("-").op("||")(part)
+        return expr
+    raise NotImplementedError(f"UUID generation is not supported for dialect {name!r}")
@@ -1,10 +1,74 @@
+from fastapi import Depends
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.config import settings
+from app.metrics import instrument_engine
 
-engine = create_async_engine(settings.DATABASE_URL, echo=settings.DEBUG)
+
+def engine_options(url: str, **overrides) -> dict:
+    """
+    create_async_engine() arguments for `url` from the DB_* settings.
+
+    Pool and statement-cache settings apply to PostgreSQL only; SQLite keeps
+    SQLAlchemy's own pool choice (one shared connection for :memory:).
+    """
+    options = {"echo": settings.DEBUG}
+    url = make_url(url)
+    if url.get_backend_name() != "postgresql":
+        return options
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+    )
+    if url.get_driver_name() == "asyncpg":
+        # SQLAlchemy's prepared-statement LRU and asyncpg's own cache; both
+        # must be 0 behind a transaction-mode pgbouncer.
+        size = settings.DB_STATEMENT_CACHE_SIZE
+        options["connect_args"] = {"prepared_statement_cache_size": size, "statement_cache_size": size}
+    options.update(overrides)
+    return options
+
+
+engine = create_async_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 AsyncSessionLocal = async_sessionmaker(engine, expire_on_commit=False)
+instrument_engine(engine, "api")
+
+# Optional read replica for GET routes that tolerate replication lag (lists,
+# ping history). Routes feeding the in-process caches — single-row lookups,
+# topology and the graph index — stay on the primary: a lagging replica would
+# put a row older than the last write into a cache that was just invalidated.
+if settings.DATABASE_READ_URL:
+    read_engine = create_async_engine(settings.DATABASE_READ_URL, **engine_options(settings.DATABASE_READ_URL))
+    instrument_engine(read_engine, "read")
+else:
+    read_engine = engine
+ReadSessionLocal = async_sessionmaker(read_engine, expire_on_commit=False)
+
+# Background jobs (discovery) get their own small pool, so a long import
+# never takes connections away from API requests. Two connections: the
+# import itself and the job's progress writes.
+job_engine = create_async_engine(
+    settings.DATABASE_URL, **engine_options(settings.DATABASE_URL, pool_size=2, max_overflow=0),
+)
+JobSessionLocal = async_sessionmaker(job_engine, expire_on_commit=False)
+instrument_engine(job_engine, "jobs")
 
 
 async def get_db():
     async with AsyncSessionLocal() as session:
         yield session
+
+
+async def get_read_db(db: AsyncSession = Depends(get_db)):
+    """
+    Session on the read replica (DATABASE_READ_URL), or the request's primary
+    session when none is set, so a route taking both holds one connection.
+    """
+    if read_engine is engine:
+        yield db
+        return
+    async with ReadSessionLocal() as session:
+        yield session
@@ -1,24 +1,43 @@
 import logging
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import text
-from app.db.session import get_db
+from app import metrics
+from app.config import settings
+from app.db.session import get_db, get_read_db
+from app.services import discovery_service, events
 
 log = logging.getLogger(__name__)
 from app.api.v1.devices import router as devices_router
 from app.api.v1.links import router as links_router
 from app.api.v1.discovery import router as discovery_router
+from app.api.v1.topology import router as topology_router
+from app.api.v1.cache import router as cache_router
 
-app = FastAPI(title="Network Core API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await events.broker.start(settings.DATABASE_URL)
+    yield
+    await discovery_service.shutdown()
+    await events.broker.stop()
+
+
+app = FastAPI(title="Network Core API", version="0.1.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+app.add_middleware(metrics.MetricsMiddleware)
 
 
 @app.get("/health/live")
@@ -26,19 +45,32 @@ async def health_live():
     return {"status": "ok"}
 
 
-@app.get("/health/ready")
-async def health_ready(db: AsyncSession = Depends(get_db)):
+async def _check_db(db: AsyncSession, name: str) -> str:
     try:
         await db.execute(text("SELECT 1"))
-        db_status = "ok"
+        return "ok"
     except Exception as exc:
-        log.warning("DB health check failed: %s", exc)
-        db_status = "error"
-    if db_status == "error":
-        return JSONResponse(status_code=503, content={"status": "ok", "db": "error"})
-    return {"status": "ok", "db": db_status}
+        log.warning("%s health check failed: %s", name, exc)
+        return "error"
+
+
+@app.get("/health/ready")
+async def health_ready(db: AsyncSession = Depends(get_db), read_db: AsyncSession = Depends(get_read_db)):
+    content = {"status": "ok", "db": await _check_db(db, "DB")}
+    if settings.DATABASE_READ_URL:
+        content["read_db"] = await _check_db(read_db, "Read replica")
+    if "error" in content.values():
+        return JSONResponse(status_code=503, content=content)
+    return content
+
+
+@app.get("/metrics", include_in_schema=False)
+async def prometheus_metrics():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
 
 
 app.include_router(devices_router, prefix="/api/v1")
 app.include_router(links_router, prefix="/api/v1")
 app.include_router(discovery_router, prefix="/api/v1")
+app.include_router(topology_router, prefix="/api/v1")
+app.include_router(cache_router, prefix="/api/v1")
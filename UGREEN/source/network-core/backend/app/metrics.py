@@ -0,0 +1,278 @@
+"""
+Prometheus metrics for the API process, served at GET /metrics.
+
+- MetricsMiddleware (pure ASGI) times every request under its route
+  template (/api/v1/devices/{device_id}, not the raw path), counts
+  responses by status and tracks requests in flight.
+- instrument_engine() hooks SQLAlchemy cursor events and the pool's
+  connect(): every query is timed, and queries run while a request is in
+  flight are also added to that request's totals (a context variable set
+  by the middleware), giving queries-per-request and DB-time-per-request
+  histograms per route. An N+1 loop shows up as a high query count on its
+  route, and a request above METRICS_QUERY_WARN queries is logged. The
+  totals also go out as a Server-Timing header, visible in browser
+  devtools.
+- Pool checkout wait is a histogram; checked-out connections, overflow
+  and pool size are read from the pool at scrape time.
+
+Metrics are per process: with several uvicorn workers, scrape each one.
+"""
+import bisect
+import contextvars
+import logging
+import time
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250, 1000)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", r"\\").replace('"', r"\"").replace("\n", r"\n")
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, help_text: str, labels: Sequence[str] = ()) -> None:
+        self.name, self.help, self.label_names = name, help_text, tuple(labels)
+        REGISTRY.append(self)
+
+    def render(self) -> list[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}", *self._samples()]
+
+    def _samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def _samples(self) -> list[str]:
+        return [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """A settable gauge, or a callback returning {label values: value} read at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(self, *args, collect: Callable[[], dict[tuple, float]] | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._values: dict[tuple, float] = {} if self.label_names else {(): 0}
+        self._collect = collect
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def _samples(self) -> list[str]:
+        values = self._collect() if self._collect else self._values
+        return [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in sorted(values.items())]
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, *args, buckets: Sequence[float] = LATENCY_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(buckets)
+        self._series: dict[tuple, list] = {}  # labels -> [bucket counts..., +Inf], sum
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def _samples(self) -> list[str]:
+        lines = []
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = "+Inf" if bound == "+Inf" else _number(float(bound))
+                bucket_labels = _labels(self.label_names, labels, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+            lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {cumulative}")
+        return lines
+
+
+REGISTRY: list[_Metric] = []
+
+REQUESTS = Counter("http_requests_total", "HTTP responses by route and status.", ("method", "route", "status"))
+LATENCY = Histogram("http_request_duration_seconds", "Request latency by route.", ("method", "route"))
+IN_FLIGHT = Gauge("http_requests_in_flight", "Requests currently being served (includes open SSE streams).")
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries", "DB queries issued per request.", ("method", "route"), buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram("http_request_db_seconds", "Time spent in DB queries per request.", ("method", "route"))
+QUERY_TIME = Histogram("db_query_duration_seconds", "Duration of single DB queries.", ("engine",))
+CHECKOUT_WAIT = Histogram("db_pool_checkout_wait_seconds", "Time waiting for a pooled connection.", ("engine",))
+
+_pools: dict[str, AsyncEngine] = {}
+
+
+def _pool_stat(method: str) -> Callable[[], dict[tuple, float]]:
+    def collect() -> dict[tuple, float]:
+        values = {}
+        for name, engine in _pools.items():
+            read = getattr(engine.sync_engine.pool, method, None)
+            if read is not None:
+                values[(name,)] = read()
+        return values
+    return collect
+
+
+Gauge("db_pool_checked_out", "Connections currently checked out.", ("engine",), collect=_pool_stat("checkedout"))
+Gauge("db_pool_overflow", "Connections open beyond pool_size (negative: pool not yet full).", ("engine",),
+      collect=_pool_stat("overflow"))
+Gauge("db_pool_size", "Configured pool_size.", ("engine",), collect=_pool_stat("size"))
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: contextvars.ContextVar[RequestStats | None] = contextvars.ContextVar("request_stats", default=None)
+
+
+def render() -> str:
+    return "\n".join(line for metric in REGISTRY for line in metric.render()) + "\n"
+
+
+def _wrap_pool(engine: AsyncEngine, name: str) -> None:
+    pool = engine.sync_engine.pool
+    connect = pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return connect()
+        finally:
+            CHECKOUT_WAIT.observe(time.perf_counter() - started, name)
+
+    pool.connect = timed_connect
+
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Time every query and pool checkout of `engine`, labelled engine=name."""
+    if _pools.get(name) is engine:
+        return
+    _pools[name] = engine
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        QUERY_TIME.observe(elapsed, name)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _error(context):
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started:
+            started.pop()
+
+    @event.listens_for(sync_engine, "engine_disposed")
+    def _disposed(_engine):
+        _wrap_pool(engine, name)  # dispose() swaps in a new pool
+
+    _wrap_pool(engine, name)
+
+
+def route_template(scope) -> str:
+    """The matched route's path template, e.g. /api/v1/devices/{device_id}.
+
+    Routers included with a prefix may report their route's path relative
+    to that prefix, so the prefix is taken from the raw path: the template
+    has as many segments as the part of the path it matched.
+    """
+    route = scope.get("route")
+    template = getattr(route, "path", None)
+    if template is None:
+        return "unmatched"
+    segments = scope["path"].rstrip("/").split("/")
+    depth = template.rstrip("/").count("/")
+    return "/".join(segments[:len(segments) - depth]) + template
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: route latency, status counts, in-flight and per-request DB totals."""
+
+    def __init__(self, app) -> None:
+        self.app = app
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                timing = f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.queries} queries"'
+                message.setdefault("headers", [])
+                message["headers"] = [*message["headers"], (b"server-timing", timing.encode())]
+            await send(message)
+
+        IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            elapsed = time.perf_counter() - started
+            labels = (scope["method"], route_template(scope))
+            LATENCY.observe(elapsed, *labels)
+            REQUESTS.inc(*labels, str(status))
+            REQUEST_QUERIES.observe(stats.queries, *labels)
+            REQUEST_DB_TIME.observe(stats.db_seconds, *labels)
+            if settings.METRICS_QUERY_WARN and stats.queries > settings.METRICS_QUERY_WARN:
+                log.warning(
+                    "%s %s issued %d DB queries (%.1f ms) — possible N+1",
+                    *labels, stats.queries, stats.db_seconds * 1000,
+                )
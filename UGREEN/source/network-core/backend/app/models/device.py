@@ -1,12 +1,18 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, DateTime, func
+from sqlalchemy import String, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
 
 class Device(Base):
     __tablename__ = "devices"
+    # PostgreSQL-only expression indexes for the vendor-prefix and CIDR
+    # filters live in migration c4d5e6f7a8b9.
+    __table_args__ = (
+        Index("ix_devices_device_type", "device_type"),
+        Index("ix_devices_status", "status"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     ip_address: Mapped[str] = mapped_column(String(45), unique=True, nullable=False)
@@ -0,0 +1,32 @@
+import uuid
+from datetime import datetime
+from sqlalchemy import String, DateTime, Integer, Float, Boolean, Text, UniqueConstraint, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class DiscoveryJob(Base):
+    __tablename__ = "discovery_jobs"
+    __table_args__ = (UniqueConstraint("active", name="uq_discovery_jobs_active"),)
+
+    id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
+    state: Mapped[str] = mapped_column(String(16), nullable=False, default="queued")
+    # True while queued/running, NULL afterwards: the unique index allows a
+    # single active job across all API processes.
+    active: Mapped[bool | None] = mapped_column(Boolean, default=True)
+    phase: Mapped[str | None] = mapped_column(String(32))
+    progress: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
+    files_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    files_skipped: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    files_parsed: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hosts_total: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    hosts_done: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    inserted: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    unchanged: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    links_created: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    error: Mapped[str | None] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    started_at: Mapped[datetime | None] = mapped_column(DateTime)
+    finished_at: Mapped[datetime | None] = mapped_column(DateTime)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,31 @@
+from datetime import datetime
+from sqlalchemy import String, BigInteger, DateTime, ForeignKey, Index, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class IngestFile(Base):
+    """Manifest entry for one nmap scan file in NMAP_DIR, keyed by file name."""
+    __tablename__ = "ingest_files"
+
+    path: Mapped[str] = mapped_column(String(1024), primary_key=True)
+    size: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    mtime_ns: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    sha256: Mapped[str] = mapped_column(String(64), nullable=False)
+    scan_start: Mapped[int] = mapped_column(BigInteger, nullable=False)
+    processed_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
+
+class IngestHost(Base):
+    """What one scan file last reported for one host; the input of the per-IP merge."""
+    __tablename__ = "ingest_hosts"
+    __table_args__ = (Index("ix_ingest_hosts_ip_address", "ip_address"),)
+
+    path: Mapped[str] = mapped_column(
+        String(1024), ForeignKey("ingest_files.path", ondelete="CASCADE"), primary_key=True
+    )
+    ip_address: Mapped[str] = mapped_column(String(45), primary_key=True)
+    mac_address: Mapped[str | None] = mapped_column(String(17))
+    vendor: Mapped[str | None] = mapped_column(String(255))
+    hostname: Mapped[str | None] = mapped_column(String(255))
+    open_ports: Mapped[list[int] | None] = mapped_column(JSON)
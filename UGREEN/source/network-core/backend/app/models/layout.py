@@ -0,0 +1,17 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Float, JSON, func
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class LayoutGroup(Base):
+    """Cached map coordinates of one node group, relative to the group's origin."""
+    __tablename__ = "layout_groups"
+
+    group_key: Mapped[str] = mapped_column(String(64), primary_key=True)
+    # Hash of the group's members and their routers; a mismatch means re-layout.
+    signature: Mapped[str] = mapped_column(String(40), nullable=False)
+    width: Mapped[float] = mapped_column(Float, nullable=False)
+    height: Mapped[float] = mapped_column(Float, nullable=False)
+    positions: Mapped[dict] = mapped_column(JSON, nullable=False)  # device_id -> [x, y]
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
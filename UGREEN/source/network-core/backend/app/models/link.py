@@ -1,15 +1,20 @@
 import uuid
 from datetime import datetime
-from sqlalchemy import String, ForeignKey, DateTime, func
+from sqlalchemy import String, ForeignKey, DateTime, Index, func
 from sqlalchemy.orm import Mapped, mapped_column
 from app.models.base import Base
 
 
 class Link(Base):
     __tablename__ = "links"
+    __table_args__ = (
+        Index("uq_links_source_target", "source_id", "target_id", unique=True),
+        Index("ix_links_target_id", "target_id"),
+    )
 
     id: Mapped[str] = mapped_column(String, primary_key=True, default=lambda: str(uuid.uuid4()))
     source_id: Mapped[str] = mapped_column(String, ForeignKey("devices.id"), nullable=False)
     target_id: Mapped[str] = mapped_column(String, ForeignKey("devices.id"), nullable=False)
     link_type: Mapped[str] = mapped_column(String(50), default="ethernet")
     created_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now())
+    updated_at: Mapped[datetime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
@@ -0,0 +1,40 @@
+from datetime import datetime
+from sqlalchemy import String, DateTime, Float, Integer, Boolean
+from sqlalchemy.orm import Mapped, mapped_column
+from app.models.base import Base
+
+
+class DeviceProbe(Base):
+    """
+    One raw ping result, written by the worker with COPY.
+
+    On PostgreSQL the table is partitioned by day on ts (migration
+    e6f7a8b9c0d1); the worker creates upcoming partitions and drops expired
+    ones. No foreign key to devices: probes outlive deletes until their
+    partition is dropped.
+    """
+    __tablename__ = "device_probes"
+
+    device_id: Mapped[str] = mapped_column(String, primary_key=True)
+    ts: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    rtt_ms: Mapped[float | None] = mapped_column(Float)
+    lost: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
+
+
+class DeviceProbeRollup(Base):
+    """
+    Per-device probe aggregate for one time bucket ("1m" or "1h").
+
+    Maintained incrementally by the worker (samples/lost/rtt_sum are added,
+    rtt_min/rtt_max merged) so reads never touch device_probes.
+    """
+    __tablename__ = "device_probe_rollups"
+
+    device_id: Mapped[str] = mapped_column(String, primary_key=True)
+    resolution: Mapped[str] = mapped_column(String(4), primary_key=True)
+    bucket: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    samples: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    lost: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    rtt_min: Mapped[float | None] = mapped_column(Float)
+    rtt_max: Mapped[float | None] = mapped_column(Float)
+    rtt_sum: Mapped[float] = mapped_column(Float, nullable=False, default=0.0)
@@ -0,0 +1,47 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional
+
+
+class BulkItemResult(BaseModel):
+    index: Optional[int] = None  # position in the request; None for filter deletes
+    status: str
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel):
+    counts: dict[str, int]
+    results: list[BulkItemResult]
+
+
+class DeviceFilter(BaseModel):
+    device_type: Optional[list[str]] = None
+    status: Optional[list[str]] = None
+    vendor: Optional[str] = None
+    cidr: Optional[str] = None
+
+
+class LinkFilter(BaseModel):
+    device_id: Optional[str] = None
+    link_type: Optional[str] = None
+
+
+class _BulkDelete(BaseModel):
+    ids: Optional[list[str]] = None
+
+    @model_validator(mode="after")
+    def _ids_or_filter(self):
+        by_filter = self.filter is not None and any(
+            value is not None for value in self.filter.model_dump().values()
+        )
+        if (self.ids is not None) == by_filter:
+            raise ValueError("give either ids or a non-empty filter")
+        return self
+
+
+class DeviceBulkDelete(_BulkDelete):
+    filter: Optional[DeviceFilter] = None
+
+
+class LinkBulkDelete(_BulkDelete):
+    filter: Optional[LinkFilter] = None
@@ -1,4 +1,5 @@
-from pydantic import BaseModel
+import ipaddress
+from pydantic import BaseModel, field_validator
 from typing import Optional
 from datetime import datetime
 
@@ -11,6 +12,12 @@ class DeviceCreate(BaseModel):
     label: Optional[str] = None
     device_type: str = "unknown"
 
+    @field_validator("ip_address")
+    @classmethod
+    def _valid_ip(cls, value: str) -> str:
+        # Must stay castable to inet — the CIDR filter index depends on it.
+        return str(ipaddress.ip_address(value.strip()))
+
 
 class DevicePatch(BaseModel):
     label: Optional[str] = None
@@ -26,7 +33,21 @@ class DeviceRead(BaseModel):
     vendor: Optional[str] = None
     label: Optional[str] = None
     device_type: str = "unknown"
+    status: str = "unknown"
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class ProbeRollupRead(BaseModel):
+    bucket: datetime
+    samples: int
+    loss_pct: Optional[float] = None
+    rtt_min_ms: Optional[float] = None
+    rtt_avg_ms: Optional[float] = None
+    rtt_max_ms: Optional[float] = None
+
+
+class DeviceBulkPatch(DevicePatch):
+    id: str
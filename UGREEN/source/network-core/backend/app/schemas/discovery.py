@@ -0,0 +1,26 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+
+class DiscoveryJobRead(BaseModel):
+    id: str
+    state: str
+    phase: Optional[str] = None
+    progress: float = 0.0
+    files_total: int = 0
+    files_skipped: int = 0
+    files_parsed: int = 0
+    hosts_total: int = 0
+    hosts_done: int = 0
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+    links_created: int = 0
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+
+    model_config = {"from_attributes": True}
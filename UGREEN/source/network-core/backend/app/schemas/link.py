@@ -19,5 +19,10 @@ class LinkRead(BaseModel):
     target_id: str
     link_type: str
     created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
 
     model_config = {"from_attributes": True}
+
+
+class LinkBulkPatch(LinkPatch):
+    id: str
@@ -0,0 +1,123 @@
+"""
+Device type classification from the MAC OUI, the vendor string and open ports.
+
+The rules live in device_rules.json (or DEVICE_RULES_PATH) and are
+compiled once, when the module is imported:
+- "oui":     MAC prefix (AA:BB:CC) -> type; checked first, one dict lookup
+- "vendors": ordered [{"pattern": regex, "type": ...}] matched
+             case-insensitively anywhere in the vendor string; the first
+             rule in the list wins, wherever in the string it matches
+- "ports":   ordered [{"any" | "all": [port, ...], "type": ...}], used when
+             no vendor rule matched
+Nothing matched: "unknown".
+
+All vendor patterns are compiled into one alternation, so a vendor string
+goes through a single regex scan instead of a Python loop over the rules.
+Results are cached per (vendor, port signature) — the open ports that
+appear in any port rule — so a large import costs only a few hundred
+evaluations; every other host is one dict lookup.
+
+Functions:
+- classify(vendor, ports, mac) -> str
+- classify_many(hosts) -> list[str]   — hosts as returned by the nmap parsers
+"""
+import json
+import re
+from collections.abc import Iterable
+from pathlib import Path
+from app.config import settings
+
+RULES_PATH = Path(__file__).with_name("device_rules.json")
+UNKNOWN = "unknown"
+CACHE_SIZE = 4096
+
+
+class DeviceClassifier:
+    """Compiled form of a rule table."""
+
+    def __init__(self, rules: dict) -> None:
+        self.oui = {prefix.upper(): _rule_type(t) for prefix, t in rules.get("oui", {}).items()}
+
+        vendor_rules = rules.get("vendors", [])
+        self._vendor_types = [_rule_type(rule["type"]) for rule in vendor_rules]
+        branches = []
+        for rule in vendor_rules:
+            if re.compile(rule["pattern"]).groups:
+                raise ValueError(f"vendor rule {rule['pattern']!r} must not contain capturing groups")
+            branches.append(f"({rule['pattern']})")
+        # A lookahead matches at every position, so overlapping candidates are
+        # all seen; at a given position the earlier (higher priority) branch wins.
+        self._vendor_re = re.compile(f"(?=(?:{'|'.join(branches)}))", re.IGNORECASE) if branches else None
+
+        self._port_rules: list[tuple[bool, frozenset[int], str]] = []
+        for rule in rules.get("ports", []):
+            if ("any" in rule) == ("all" in rule):
+                raise ValueError(f"port rule {rule!r} needs exactly one of 'any' or 'all'")
+            ports = frozenset(int(p) for p in rule.get("any") or rule.get("all"))
+            self._port_rules.append(("all" in rule, ports, _rule_type(rule["type"])))
+        # Port signature: a bitmask over the ports that appear in any rule.
+        signature_ports = sorted(frozenset().union(*(ports for _, ports, _ in self._port_rules)))
+        self._port_bits = {port: 1 << i for i, port in enumerate(signature_ports)}
+        self._signature_ports = signature_ports
+
+        self._cache: dict[tuple[str, int], str] = {}
+        self.hits = self.misses = 0
+
+    @classmethod
+    def from_file(cls, path: str | Path) -> "DeviceClassifier":
+        with open(path, encoding="utf-8") as fh:
+            return cls(json.load(fh))
+
+    def classify(self, vendor: str | None, ports: Iterable[int] | None = (), mac: str | None = None) -> str:
+        if mac:
+            device_type = self.oui.get(mac[:8].upper())
+            if device_type:
+                return device_type
+        signature = 0
+        for port in ports or ():
+            bit = self._port_bits.get(port)
+            if bit:
+                signature |= bit
+        key = (vendor or "", signature)
+        device_type = self._cache.get(key)
+        if device_type is not None:
+            self.hits += 1
+            return device_type
+        self.misses += 1
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        device_type = self._cache[key] = self._classify(*key)
+        return device_type
+
+    def classify_many(self, hosts: Iterable[dict]) -> list[str]:
+        """Classify host dicts with "vendor", "open_ports" and "mac_address" keys."""
+        classify = self.classify
+        return [classify(h.get("vendor"), h.get("open_ports"), h.get("mac_address")) for h in hosts]
+
+    def _classify(self, vendor: str, signature: int) -> str:
+        if vendor and self._vendor_re is not None:
+            best = None
+            for match in self._vendor_re.finditer(vendor):
+                rule = match.lastindex - 1
+                if best is None or rule < best:
+                    best = rule
+                    if rule == 0:
+                        break
+            if best is not None:
+                return self._vendor_types[best]
+        open_ports = frozenset(p for i, p in enumerate(self._signature_ports) if signature >> i & 1)
+        for require_all, ports, device_type in self._port_rules:
+            if (ports <= open_ports) if require_all else not ports.isdisjoint(open_ports):
+                return device_type
+        return UNKNOWN
+
+
+def _rule_type(value) -> str:
+    if not isinstance(value, str) or not value:
+        raise ValueError(f"invalid device type {value!r} in classification rules")
+    return value
+
+
+classifier = DeviceClassifier.from_file(settings.DEVICE_RULES_PATH or RULES_PATH)
+classify = classifier.classify
+classify_many = classifier.classify_many
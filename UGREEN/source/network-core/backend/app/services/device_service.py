@@ -1,42 +1,333 @@
+import ipaddress
+from collections.abc import Awaitable, Callable, Iterable, Sequence
+from itertools import islice
+from sqlalchemy.dialects.postgresql import CIDR, INET
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import cast, delete, insert, or_, select, func, true, update
+from app.db.bulk import chunks, existing_ids, update_by_id
+from app.db.dialect import dialect_name, upsert_insert
 from app.models.device import Device
-from app.schemas.device import DeviceCreate, DevicePatch
+from app.models.link import Link
+from app.schemas.device import DeviceCreate, DevicePatch, DeviceRead
+from app.services import events, read_cache
+from app.services.topology_service import node_payload
 import uuid
 
+# Columns refreshed by bulk_upsert_devices() when a host is seen again.
+# A None in the incoming row keeps the stored value (scans often miss the MAC
+# or PTR name), device_type is always taken from the latest classification.
+_UPSERT_KEEP_IF_NONE = ("mac_address", "hostname", "vendor")
+UPSERT_BATCH_SIZE = 500
+# Columns returned by list_devices(), in DeviceRead field order.
+READ_COLUMNS = tuple(DeviceRead.model_fields)
 
-async def list_devices(db: AsyncSession) -> list[Device]:
-    result = await db.execute(select(Device))
-    return list(result.scalars().all())
 
+def _ip_in_network(db: AsyncSession, network: ipaddress.IPv4Network | ipaddress.IPv6Network):
+    """
+    Filter expression for devices whose ip_address lies inside `network`.
 
-async def get_device(db: AsyncSession, device_id: str) -> Device | None:
-    return await db.get(Device, device_id)
+    PostgreSQL casts to inet (served by the ix_devices_ip_inet expression
+    index); every stored address is castable — DeviceCreate validates new
+    ones and migration c4d5e6f7a8b9 normalised or rejected older rows.
+    Other dialects — SQLite in the tests — only support octet-aligned IPv4
+    prefixes, translated to a LIKE prefix match.
+    """
+    if dialect_name(db) == "postgresql":
+        return cast(Device.ip_address, INET).op("<<=")(cast(str(network), CIDR))
+    if network.version != 4 or network.prefixlen % 8:
+        raise ValueError("only octet-aligned IPv4 CIDR filters are supported on this database")
+    if network.prefixlen == 32:
+        return Device.ip_address == str(network.network_address)
+    octets = str(network.network_address).split(".")[: network.prefixlen // 8]
+    if not octets:
+        return true()
+    return Device.ip_address.like(_like_prefix(".".join(octets) + "."), escape="/")
+
+
+def _like_prefix(prefix: str) -> str:
+    # Built in Python rather than with startswith() so the pattern reaches the
+    # planner as a single constant and the prefix index can be used.
+    escaped = prefix.replace("/", "//").replace("%", "/%").replace("_", "/_")
+    return escaped + "%"
+
+
+def filter_devices(
+    db: AsyncSession,
+    stmt,
+    *,
+    device_type: Sequence[str] | None = None,
+    status: Sequence[str] | None = None,
+    vendor_prefix: str | None = None,
+    cidr: str | None = None,
+):
+    """
+    Apply the device list filters to `stmt`.
+
+    Raises ValueError for a malformed or unsupported CIDR.
+    """
+    if device_type:
+        stmt = stmt.where(Device.device_type.in_(device_type))
+    if status:
+        stmt = stmt.where(Device.status.in_(status))
+    if vendor_prefix:
+        stmt = stmt.where(func.lower(Device.vendor).like(_like_prefix(vendor_prefix.lower()), escape="/"))
+    if cidr:
+        stmt = stmt.where(_ip_in_network(db, ipaddress.ip_network(cidr, strict=False)))
+    return stmt
+
+
+async def list_devices(
+    db: AsyncSession,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    **filters,
+) -> tuple[list[Row], str | None]:
+    """
+    Return one keyset page of devices ordered by id, plus the cursor of the
+    next page (None on the last page). See filter_devices() for `filters`.
+
+    Rows are plain tuples of the READ_COLUMNS (attribute access works like
+    on a Device) — no ORM instances, so big pages skip hydration and the
+    identity map.
+    """
+    stmt = filter_devices(db, select(*(getattr(Device, c) for c in READ_COLUMNS)), **filters).order_by(Device.id)
+    if cursor:
+        stmt = stmt.where(Device.id > cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    result = await db.execute(stmt)
+    devices = result.all()
+    if limit is not None and len(devices) > limit:
+        devices = devices[:limit]
+        return devices, devices[-1].id
+    return devices, None
+
+
+async def get_device(db: AsyncSession, device_id: str) -> DeviceRead | None:
+    """Served from read_cache.devices when possible; cached as an immutable DeviceRead."""
+    generation = read_cache.devices.generation
+    cached = read_cache.devices.get(device_id)
+    if cached is not None:
+        return cached
+    device = await db.get(Device, device_id)
+    if device is None:
+        return None
+    device = DeviceRead.model_validate(device)
+    read_cache.devices.put(device_id, device, generation)
+    return device
 
 
 async def create_device(db: AsyncSession, data: DeviceCreate) -> Device:
-    device = Device(id=str(uuid.uuid4()), **data.model_dump())
-    db.add(device)
+    """INSERT ... RETURNING: server defaults come back without a refresh SELECT."""
+    stmt = insert(Device).values(id=str(uuid.uuid4()), **data.model_dump()).returning(Device)
+    device = (await db.scalars(stmt)).one()
+    event = {"kind": "device", "op": "create", "id": device.id, "node": node_payload(device)}
+    await events.publish(db, event)
     await db.commit()
-    await db.refresh(device)
+    read_cache.on_event(event)
     return device
 
 
 async def update_device(db: AsyncSession, device_id: str, data: DevicePatch) -> Device | None:
-    device = await db.get(Device, device_id)
+    """
+    UPDATE ... RETURNING in one round-trip; None if the device does not exist.
+
+    An empty patch writes nothing and returns the stored row (the ORM entity,
+    like every other path here, not the cached DeviceRead of get_device).
+    """
+    fields = data.model_dump(exclude_unset=True)
+    if not fields:
+        return await db.get(Device, device_id)
+    stmt = (
+        update(Device).where(Device.id == device_id).values(**fields)
+        .returning(Device).execution_options(populate_existing=True)
+    )
+    device = (await db.scalars(stmt)).one_or_none()
     if not device:
         return None
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(device, field, value)
+    event = {"kind": "device", "op": "update", "id": device.id, "node": node_payload(device)}
+    await events.publish(db, event)
     await db.commit()
-    await db.refresh(device)
+    read_cache.on_event(event)
     return device
 
 
 async def delete_device(db: AsyncSession, device_id: str) -> bool:
-    device = await db.get(Device, device_id)
-    if not device:
+    result = await db.execute(delete(Device).where(Device.id == device_id).returning(Device.id))
+    if result.scalar_one_or_none() is None:
         return False
-    await db.delete(device)
+    event = {"kind": "device", "op": "delete", "id": device_id}
+    await events.publish(db, event)
     await db.commit()
+    read_cache.on_event(event)
     return True
+
+
+async def bulk_create_devices(db: AsyncSession, items: Sequence[DeviceCreate]) -> list[tuple[str, str]]:
+    """
+    Create devices with one INSERT ... ON CONFLICT (ip_address) DO NOTHING
+    RETURNING per batch, all in a single transaction.
+
+    Returns (status, id) per item, in order: "created", or "exists" with the
+    id of the device already holding the IP — possibly an earlier item of
+    the same call.
+    """
+    # Compiled once; executemany with RETURNING is sent as multi-row INSERTs.
+    table = Device.__table__
+    stmt = (
+        upsert_insert(db, table)
+        .on_conflict_do_nothing(index_elements=[table.c.ip_address])
+        .returning(table.c.ip_address)
+    )
+    results = []
+    for batch in chunks(items):
+        new: dict[str, dict] = {}
+        for data in batch:
+            new.setdefault(data.ip_address, {"id": str(uuid.uuid4()), **data.model_dump()})
+        created = set((await db.execute(stmt, list(new.values()))).scalars())
+        known = {}
+        if len(created) < len(new):
+            result = await db.execute(
+                select(Device.ip_address, Device.id).where(Device.ip_address.in_(new.keys() - created))
+            )
+            known = dict(result.all())
+        for data in batch:
+            ip = data.ip_address
+            if ip in created:
+                created.discard(ip)
+                results.append(("created", new[ip]["id"]))
+            else:
+                results.append(("exists", known.get(ip) or new[ip]["id"]))
+    changed = any(status == "created" for status, _ in results)
+    if changed:
+        await events.publish(db, events.RELOAD)
+    await db.commit()
+    if changed:
+        read_cache.on_event(events.RELOAD)
+    return results
+
+
+async def bulk_update_devices(db: AsyncSession, patches: Sequence[tuple[str, DevicePatch]]) -> set[str]:
+    """
+    Patch many devices in a single transaction; returns the ids that exist.
+    See app.db.bulk.update_by_id() for how the UPDATEs are batched.
+    """
+    found = await update_by_id(
+        db, Device, [(device_id, data.model_dump(exclude_unset=True, exclude={"id"})) for device_id, data in patches]
+    )
+    if found:
+        await events.publish(db, events.RELOAD)
+    await db.commit()
+    if found:
+        read_cache.on_event(events.RELOAD)
+    return found
+
+
+async def bulk_delete_devices(
+    db: AsyncSession,
+    ids: Sequence[str] | None = None,
+    **filters,
+) -> tuple[set[str], int]:
+    """
+    Delete the devices listed in `ids`, or else those matching `filters`
+    (see filter_devices()), together with every link touching them.
+
+    One DELETE of links and one of devices per batch, in a single
+    transaction. Returns the deleted device ids and the number of links
+    removed. Raises ValueError for a malformed CIDR filter.
+    """
+    if ids is not None:
+        targets = await existing_ids(db, Device, ids)
+    else:
+        result = await db.execute(filter_devices(db, select(Device.id), **filters))
+        targets = set(result.scalars())
+    links_deleted = 0
+    for batch in chunks(sorted(targets)):
+        result = await db.execute(
+            delete(Link).where(or_(Link.source_id.in_(batch), Link.target_id.in_(batch)))
+        )
+        links_deleted += result.rowcount
+        await db.execute(delete(Device).where(Device.id.in_(batch)))
+    if targets:
+        await events.publish(db, events.RELOAD)
+    await db.commit()
+    if targets:
+        read_cache.on_event(events.RELOAD)
+    return targets, links_deleted
+
+
+def _merge_upsert_row(row: dict, current: dict) -> dict:
+    merged = {
+        field: row.get(field) if row.get(field) is not None else current[field]
+        for field in _UPSERT_KEEP_IF_NONE
+    }
+    merged["device_type"] = row.get("device_type") or current["device_type"]
+    return merged
+
+
+async def _upsert_batch(db: AsyncSession, batch: list[dict], counts: dict[str, int]) -> None:
+    by_ip = {row["ip_address"]: row for row in batch}  # last occurrence wins
+    fields = (*_UPSERT_KEEP_IF_NONE, "device_type")
+    result = await db.execute(
+        select(Device.ip_address, *(getattr(Device, f) for f in fields))
+        .where(Device.ip_address.in_(by_ip))
+    )
+    current = {r[0]: dict(zip(fields, r[1:])) for r in result.all()}
+
+    values = []
+    for ip, row in by_ip.items():
+        if ip in current:
+            merged = _merge_upsert_row(row, current[ip])
+            if merged == current[ip]:
+                counts["unchanged"] += 1
+                continue
+            counts["updated"] += 1
+        else:
+            counts["inserted"] += 1
+        values.append({
+            "id": str(uuid.uuid4()),
+            "ip_address": ip,
+            **{f: row.get(f) for f in _UPSERT_KEEP_IF_NONE},
+            "device_type": row.get("device_type") or "unknown",
+        })
+    if not values:
+        return
+
+    stmt = upsert_insert(db, Device).values(values)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[Device.ip_address],
+        set_={
+            **{f: func.coalesce(stmt.excluded[f], getattr(Device, f)) for f in _UPSERT_KEEP_IF_NONE},
+            "device_type": stmt.excluded.device_type,
+            "updated_at": func.now(),
+        },
+    )
+    await db.execute(stmt)
+
+
+async def bulk_upsert_devices(
+    db: AsyncSession,
+    rows: Iterable[dict],
+    batch_size: int = UPSERT_BATCH_SIZE,
+    on_batch: Callable[[dict[str, int]], Awaitable[None]] | None = None,
+) -> dict[str, int]:
+    """
+    Insert or refresh devices keyed by ip_address in multi-row batches.
+
+    Each batch costs one SELECT (to classify rows) and one
+    INSERT ... ON CONFLICT (ip_address) DO UPDATE; unchanged rows are not
+    written at all. Everything runs in a single transaction; on_batch, if
+    given, is awaited with the running counts after each batch.
+
+    Returns {"inserted": n, "updated": n, "unchanged": n}.
+    """
+    counts = {"inserted": 0, "updated": 0, "unchanged": 0}
+    it = iter(rows)
+    while batch := list(islice(it, batch_size)):
+        await _upsert_batch(db, batch, counts)
+        if on_batch:
+            await on_batch(counts)
+    await db.commit()
+    return counts
@@ -0,0 +1,216 @@
+"""
+Discovery jobs: nmap_service.import_from_files run as a tracked background job.
+
+A run is a row in discovery_jobs (state, phase, progress, counters). Only
+one job is active at a time:
+- within a process, start() is serialised by a lock and attaches callers to
+  the job already running;
+- across API processes, the unique index on discovery_jobs.active rejects a
+  second active row, and the loser attaches to the winner's job.
+
+The job runs on JobSessionLocal (its own small pool), never on the
+request's session. Progress is written at most every PROGRESS_INTERVAL
+seconds, and at least every HEARTBEAT_INTERVAL even while one step runs
+long: an active job with no heartbeat for STALE_AFTER (its process died)
+is marked failed by the next start().
+
+Functions:
+- start(db) -> (DiscoveryJob, started)
+- get_job(db, job_id) -> DiscoveryJob | None
+- list_jobs(db, limit) -> list[DiscoveryJob]
+- shutdown()  — cancel running jobs, called on application shutdown
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.session import JobSessionLocal
+from app.models.discovery_job import DiscoveryJob
+
+log = logging.getLogger(__name__)
+
+QUEUED, RUNNING, SUCCEEDED, FAILED = "queued", "running", "succeeded", "failed"
+PROGRESS_INTERVAL = 1.0
+STALE_AFTER = timedelta(minutes=5)
+HEARTBEAT_INTERVAL = STALE_AFTER.total_seconds() / 4
+
+# Overall progress at the start of each phase; parsing and upserting advance
+# within their range as files and host batches complete.
+PHASE_START = {"planning": 0.0, "parsing": 0.05, "upserting": 0.5, "linking": 0.9}
+
+# Replaced by the tests, which run jobs against their own engine.
+session_factory = JobSessionLocal
+
+_lock = asyncio.Lock()
+_tasks: dict[str, asyncio.Task] = {}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+async def _active_job(db: AsyncSession) -> DiscoveryJob | None:
+    result = await db.execute(
+        select(DiscoveryJob).where(DiscoveryJob.active.is_(True))
+        .execution_options(populate_existing=True)
+    )
+    return result.scalar_one_or_none()
+
+
+async def start(db: AsyncSession) -> tuple[DiscoveryJob, bool]:
+    """
+    Return the active discovery job, queuing a new one if none is running.
+
+    started is False when the caller was attached to an existing job.
+    """
+    async with _lock:
+        job = await _active_job(db)
+        if job is not None:
+            if job.id in _tasks or _utcnow() - job.updated_at < STALE_AFTER:
+                return job, False
+            log.warning("Discovery job %s has no heartbeat since %s, marking failed", job.id, job.updated_at)
+            await _finish(db, job.id, FAILED, "abandoned: no progress reported")
+
+        now = _utcnow()
+        job = DiscoveryJob(state=QUEUED, created_at=now, updated_at=now)
+        db.add(job)
+        try:
+            await db.commit()
+        except IntegrityError:
+            # Another API process queued a job in the meantime.
+            await db.rollback()
+            job = await _active_job(db)
+            if job is None:
+                raise
+            return job, False
+
+        _tasks[job.id] = asyncio.create_task(_run(job.id), name=f"discovery-{job.id}")
+        log.info("Discovery job %s queued", job.id)
+        return job, True
+
+
+async def get_job(db: AsyncSession, job_id: str) -> DiscoveryJob | None:
+    return await db.get(DiscoveryJob, job_id, populate_existing=True)
+
+
+async def list_jobs(db: AsyncSession, limit: int = 20) -> list[DiscoveryJob]:
+    result = await db.execute(
+        select(DiscoveryJob).order_by(DiscoveryJob.created_at.desc()).limit(limit)
+        .execution_options(populate_existing=True)
+    )
+    return list(result.scalars().all())
+
+
+async def shutdown() -> None:
+    """Cancel running jobs and wait until they have recorded the failure."""
+    tasks = list(_tasks.values())
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def _finish(db: AsyncSession, job_id: str, state: str, error: str | None = None) -> None:
+    values = {"state": state, "active": None, "error": error, "finished_at": _utcnow(), "updated_at": _utcnow()}
+    if state == SUCCEEDED:
+        values.update(progress=1.0, phase=None)
+    await db.execute(update(DiscoveryJob).where(DiscoveryJob.id == job_id).values(**values))
+    await db.commit()
+
+
+class _ProgressWriter:
+    """Accumulates job counters and flushes them on its own session."""
+
+    def __init__(self, db: AsyncSession, job_id: str) -> None:
+        self.db = db
+        self.job_id = job_id
+        self.values: dict = {}
+        self._flushed = 0.0
+        # The heartbeat task and progress reports share self.db.
+        self._lock = asyncio.Lock()
+        self._heartbeat: asyncio.Task | None = None
+
+    async def __call__(self, phase: str, **counters) -> None:
+        changed_phase = phase != self.values.get("phase")
+        self.values.update(counters, phase=phase, progress=self._progress(phase))
+        if changed_phase or time.monotonic() - self._flushed >= PROGRESS_INTERVAL:
+            await self.flush()
+
+    async def flush(self, **values) -> None:
+        self.values.update(values)
+        async with self._lock:
+            await self.db.execute(
+                update(DiscoveryJob).where(DiscoveryJob.id == self.job_id)
+                .values(**self.values, updated_at=_utcnow())
+            )
+            await self.db.commit()
+            self._flushed = time.monotonic()
+
+    def start_heartbeat(self) -> None:
+        self._heartbeat = asyncio.create_task(self._beat(), name=f"discovery-{self.job_id}-heartbeat")
+
+    async def stop_heartbeat(self) -> None:
+        """Cancel the heartbeat between two writes, leaving self.db usable."""
+        if self._heartbeat is None:
+            return
+        async with self._lock:
+            self._heartbeat.cancel()
+        await asyncio.gather(self._heartbeat, return_exceptions=True)
+        self._heartbeat = None
+
+    async def _beat(self) -> None:
+        while True:
+            await asyncio.sleep(HEARTBEAT_INTERVAL - (time.monotonic() - self._flushed))
+            if time.monotonic() - self._flushed < HEARTBEAT_INTERVAL:
+                continue
+            try:
+                await self.flush()
+            except Exception as exc:
+                log.warning("Discovery job %s heartbeat failed: %s", self.job_id, exc)
+                await self.db.rollback()
+                self._flushed = time.monotonic()
+
+    def _progress(self, phase: str) -> float:
+        v = self.values
+        if phase == "parsing":
+            to_parse = v.get("files_total", 0) - v.get("files_skipped", 0)
+            done = v.get("files_parsed", 0) / to_parse if to_parse else 1.0
+            return PHASE_START["parsing"] + (PHASE_START["upserting"] - PHASE_START["parsing"]) * done
+        if phase == "upserting":
+            total = v.get("hosts_total", 0)
+            done = min(1.0, v.get("hosts_done", 0) / total) if total else 1.0
+            return PHASE_START["upserting"] + (PHASE_START["linking"] - PHASE_START["upserting"]) * done
+        return PHASE_START[phase]
+
+
+async def _fail(db: AsyncSession, progress: _ProgressWriter, job_id: str, error: str) -> None:
+    await progress.stop_heartbeat()
+    await db.rollback()
+    await progress.db.rollback()
+    await _finish(progress.db, job_id, FAILED, error)
+
+
+async def _run(job_id: str) -> None:
+    from app.services import nmap_service
+
+    try:
+        async with session_factory() as progress_db, session_factory() as db:
+            progress = _ProgressWriter(progress_db, job_id)
+            try:
+                await progress.flush(state=RUNNING, phase="planning", started_at=_utcnow())
+                progress.start_heartbeat()
+                counts = await nmap_service.import_from_files(db, progress=progress)
+                await progress.flush(**counts)
+                await progress.stop_heartbeat()
+                await _finish(progress_db, job_id, SUCCEEDED)
+                log.info("Discovery job %s finished: %s", job_id, counts)
+            except asyncio.CancelledError:
+                await _fail(db, progress, job_id, "cancelled")
+                raise
+            except Exception as exc:
+                log.exception("Discovery job %s failed", job_id)
+                await _fail(db, progress, job_id, str(exc) or type(exc).__name__)
+    finally:
+        _tasks.pop(job_id, None)
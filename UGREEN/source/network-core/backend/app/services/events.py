@@ -0,0 +1,143 @@
+"""
+Topology change events (Postgres LISTEN/NOTIFY fan-out).
+
+Writers — the API services and the ping worker — call pg_notify on the
+"topology" channel inside their transaction, so an event is delivered only
+if the change commits. Each API process holds one dedicated asyncpg
+connection that LISTENs on the channel and fans events out to in-process
+subscribers (SSE clients, caches).
+
+Event shape (JSON):
+  {"kind": "device", "op": "create" | "update", "id": ..., "node": {...}}
+  {"kind": "device", "op": "status", "id": ..., "status": "alive"}
+  {"kind": "device" | "link", "op": "delete", "id": ...}
+  {"kind": "link", "op": "create" | "update", "id": ..., "edge": {...}}
+  {"kind": "topology", "op": "reload"}   — bulk change or missed events, refetch the snapshot
+
+On databases without LISTEN/NOTIFY (SQLite in the tests) publish()
+dispatches straight to the local broker.
+"""
+import asyncio
+import json
+import logging
+from collections.abc import Callable
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.dialect import dialect_name
+
+log = logging.getLogger(__name__)
+
+CHANNEL = "topology"
+RELOAD = {"kind": "topology", "op": "reload"}
+QUEUE_SIZE = 1000
+RECONNECT_DELAY = 5.0
+
+
+class EventBroker:
+    """Fans topology events out to subscriber queues and listener callbacks."""
+
+    def __init__(self) -> None:
+        self._queues: set[asyncio.Queue] = set()
+        self._listeners: list[Callable[[dict], None]] = []
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._queues.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._queues.discard(queue)
+
+    def add_listener(self, callback: Callable[[dict], None]) -> None:
+        """Register a synchronous callback invoked for every event."""
+        self._listeners.append(callback)
+
+    def dispatch(self, event: dict) -> None:
+        for callback in self._listeners:
+            try:
+                callback(event)
+            except Exception:
+                log.exception("Event listener failed")
+        for queue in self._queues:
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # Slow consumer: drop its backlog and tell it to resync from a snapshot.
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(RELOAD)
+
+    async def start(self, database_url: str) -> None:
+        """Start LISTENing on PostgreSQL; a no-op for other databases."""
+        url = make_url(database_url)
+        if url.get_backend_name() != "postgresql" or self._task:
+            return
+        dsn = url.set(drivername="postgresql").render_as_string(hide_password=False)
+        self._task = asyncio.create_task(self._listen_forever(dsn))
+
+    async def stop(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _listen_forever(self, dsn: str) -> None:
+        import asyncpg
+
+        first = True
+        while True:
+            try:
+                conn = await asyncpg.connect(dsn)
+            except Exception as exc:
+                log.warning("Event listener connect failed: %s", exc)
+                await asyncio.sleep(RECONNECT_DELAY)
+                continue
+            closed = asyncio.Event()
+            conn.add_termination_listener(lambda _conn: closed.set())
+            try:
+                await conn.add_listener(CHANNEL, self._on_notify)
+                if not first:
+                    # Events may have been missed while disconnected.
+                    self.dispatch(RELOAD)
+                first = False
+                await closed.wait()
+                log.warning("Event listener connection lost, reconnecting")
+            finally:
+                if not conn.is_closed():
+                    await conn.close()
+            await asyncio.sleep(RECONNECT_DELAY)
+
+    def _on_notify(self, _conn, _pid, _channel, payload: str) -> None:
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            log.warning("Ignoring malformed event payload: %r", payload[:200])
+            return
+        self.dispatch(event)
+
+
+broker = EventBroker()
+
+
+async def publish(db: AsyncSession, *events: dict) -> None:
+    """
+    Emit events as part of the caller's transaction.
+
+    Call before commit(): PostgreSQL delivers the notifications only when
+    the transaction commits, and drops them on rollback.
+    """
+    if not events:
+        return
+    if dialect_name(db) == "postgresql":
+        await db.execute(
+            text("SELECT pg_notify(:channel, payload) FROM unnest(CAST(:payloads AS text[])) AS payload"),
+            {"channel": CHANNEL, "payloads": [json.dumps(e, default=str) for e in events]},
+        )
+        return
+    for event in events:
+        broker.dispatch(event)
@@ -0,0 +1,229 @@
+"""
+Graph questions about the topology, answered from an in-memory index.
+
+TopologyGraph is an immutable adjacency index (devices as ints, links as
+undirected edges) built from one SELECT of each table. At build time it also
+computes connected components and one DFS over the whole graph with
+low-link values, rooted at a virtual node joined to every router. Then:
+
+- shortest_path(a, b)   bidirectional BFS, stops early across components
+- components()          precomputed labels
+- blast_radius(x)       devices left without a path to any other router
+                        when x goes down; the DFS subtrees of x's children
+                        whose low-link does not climb above x. Each subtree
+                        is a contiguous slice of the DFS preorder, so the
+                        answer costs O(result size).
+  Components without any router are rooted at their first device (by id);
+  "downstream" there is relative to that device.
+
+GraphIndex keeps the current TopologyGraph for the process. It is dropped
+on every link event and on device create/update/delete (type changes move
+roots), via the event broker. Under PostgreSQL that includes writes made
+by other API processes. The next request rebuilds it.
+
+Functions:
+- graph_index.get(db) -> TopologyGraph
+"""
+import asyncio
+import logging
+from collections.abc import Iterable
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.device import Device
+from app.models.link import Link
+from app.services import events
+
+log = logging.getLogger(__name__)
+
+ROUTER = "router"
+_UNSEEN = -2
+
+
+class TopologyGraph:
+    """Immutable adjacency index with precomputed components and low-link DFS."""
+
+    def __init__(self, devices: Iterable[tuple[str, str | None]], links: Iterable[tuple[str, str]]) -> None:
+        devices = sorted(devices)
+        self.ids = [device_id for device_id, _ in devices]
+        self.index = {device_id: i for i, device_id in enumerate(self.ids)}
+        is_router = [device_type == ROUTER for _, device_type in devices]
+
+        neighbours: list[set[int]] = [set() for _ in self.ids]
+        edges = 0
+        for source, target in links:
+            a, b = self.index.get(source), self.index.get(target)
+            if a is None or b is None or a == b or b in neighbours[a]:
+                continue
+            neighbours[a].add(b)
+            neighbours[b].add(a)
+            edges += 1
+        self.adj = [sorted(n) for n in neighbours]
+        self.edge_count = edges
+        self._label_components()
+        self._lowlink_dfs(is_router)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _label_components(self) -> None:
+        component = [-1] * len(self.ids)
+        sizes = []
+        for start in range(len(self.ids)):
+            if component[start] != -1:
+                continue
+            label = len(sizes)
+            component[start] = label
+            frontier = [start]
+            size = 0
+            while frontier:
+                v = frontier.pop()
+                size += 1
+                for w in self.adj[v]:
+                    if component[w] == -1:
+                        component[w] = label
+                        frontier.append(w)
+            sizes.append(size)
+        self.component = component
+        members: list[list[str]] = [[] for _ in sizes]
+        for i, label in enumerate(component):
+            members[label].append(self.ids[i])
+        self._components = sorted(members, key=lambda m: (-len(m), m[0]))
+
+    def _lowlink_dfs(self, is_router: list[bool]) -> None:
+        n = len(self.ids)
+        root = n  # virtual node adjacent to every router
+        disc = [_UNSEEN] * (n + 1)
+        low = [0] * (n + 1)
+        parent = [-1] * (n + 1)
+        size = [1] * (n + 1)
+        order: list[int] = []
+        disc[root] = -1
+
+        def neighbours(v: int) -> list[int]:
+            return self.adj[v] + [root] if is_router[v] else self.adj[v]
+
+        def visit(start: int, start_neighbours: list[int]) -> None:
+            stack = [(start, iter(start_neighbours))]
+            while stack:
+                v, it = stack[-1]
+                for w in it:
+                    if disc[w] == _UNSEEN:
+                        parent[w] = v
+                        disc[w] = low[w] = len(order)
+                        order.append(w)
+                        stack.append((w, iter(neighbours(w))))
+                        break
+                    if w != parent[v] and disc[w] < low[v]:
+                        low[v] = disc[w]
+                else:
+                    stack.pop()
+                    if stack:
+                        p = stack[-1][0]
+                        if low[v] < low[p]:
+                            low[p] = low[v]
+                        size[p] += size[v]
+
+        visit(root, [v for v in range(n) if is_router[v]])
+        for v in range(n):
+            if disc[v] == _UNSEEN:
+                disc[v] = low[v] = len(order)
+                order.append(v)
+                visit(v, neighbours(v))
+
+        self._disc, self._low, self._parent, self._size, self._order = disc, low, parent, size, order
+
+    def shortest_path(self, source: str, target: str) -> list[str] | None:
+        """Device ids from source to target inclusive, fewest hops; None if not connected."""
+        a, b = self.index[source], self.index[target]
+        if a == b:
+            return [source]
+        if self.component[a] != self.component[b]:
+            return None
+        # Bidirectional BFS: always grow the smaller frontier.
+        prev = {a: -1}
+        succ = {b: -1}
+        front, back = [a], [b]
+        while front and back:
+            if len(front) > len(back):
+                front, back, prev, succ = back, front, succ, prev
+            nxt = []
+            for v in front:
+                for w in self.adj[v]:
+                    if w in prev:
+                        continue
+                    prev[w] = v
+                    if w in succ:
+                        return self._join(w, prev, succ, a)
+                    nxt.append(w)
+            front = nxt
+        return None
+
+    def _join(self, meet: int, prev: dict[int, int], succ: dict[int, int], source: int) -> list[str]:
+        left, v = [], meet
+        while v != -1:
+            left.append(v)
+            v = prev[v]
+        right, v = [], succ[meet]
+        while v != -1:
+            right.append(v)
+            v = succ[v]
+        path = left[::-1] + right
+        if path[0] != source:
+            path.reverse()
+        return [self.ids[v] for v in path]
+
+    def blast_radius(self, device_id: str) -> list[str]:
+        """Devices cut off from every other router (or their component root) if device_id goes down."""
+        x = self.index[device_id]
+        disc, low, parent, size, order = self._disc, self._low, self._parent, self._size, self._order
+        downstream = []
+        for child in self.adj[x]:
+            if parent[child] == x and low[child] >= disc[x]:
+                start = disc[child]
+                downstream.extend(order[start:start + size[child]])
+        return [self.ids[v] for v in downstream]
+
+    def components(self) -> list[list[str]]:
+        """Connected components, largest first; devices within one in id order."""
+        return self._components
+
+
+class GraphIndex:
+    """The process-wide TopologyGraph, rebuilt lazily after invalidation."""
+
+    def __init__(self) -> None:
+        self._graph: TopologyGraph | None = None
+        self._generation = 0
+        self._lock = asyncio.Lock()
+
+    def invalidate(self) -> None:
+        self._graph = None
+        self._generation += 1
+
+    def on_event(self, event: dict) -> None:
+        if event.get("kind") in ("link", "topology") or (
+            event.get("kind") == "device" and event.get("op") != "status"
+        ):
+            self.invalidate()
+
+    async def get(self, db: AsyncSession) -> TopologyGraph:
+        graph = self._graph
+        if graph is not None:
+            return graph
+        async with self._lock:
+            if self._graph is not None:
+                return self._graph
+            generation = self._generation
+            devices = (await db.execute(select(Device.id, Device.device_type))).all()
+            links = (await db.execute(select(Link.source_id, Link.target_id))).all()
+            graph = await asyncio.to_thread(TopologyGraph, devices, links)
+            # An event during the build means the rows may be stale: serve them
+            # to this caller, but don't cache them.
+            if generation == self._generation:
+                self._graph = graph
+            log.info("Graph index built: %d devices, %d edges", len(graph), graph.edge_count)
+            return graph
+
+
+graph_index = GraphIndex()
+events.broker.add_listener(graph_index.on_event)
@@ -0,0 +1,143 @@
+"""
+Incremental nmap ingest: a persisted manifest of scan files and their hosts.
+
+ingest_files remembers (size, mtime, sha256, scan start) per file name and
+ingest_hosts what each file last reported per IP. A run then:
+  1. plan_scans()   — stat every file; same size+mtime is skipped without
+                      reading it, otherwise the content hash decides;
+  2. apply_scans()  — for re-parsed and vanished files, diff the hosts against
+                      ingest_hosts and keep only added / removed / changed IPs;
+  3. merged_hosts() — re-merge just those IPs from every file that reports
+                      them (last scan wins, see nmap_service.merge_scans).
+Only the re-merged hosts reach the devices upsert.
+"""
+import asyncio
+import hashlib
+from dataclasses import dataclass, field
+from itertools import islice
+from pathlib import Path
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.dialect import upsert_insert
+from app.models.ingest import IngestFile, IngestHost
+
+HOST_FIELDS = ("mac_address", "vendor", "hostname", "open_ports")
+WRITE_BATCH_SIZE = 500
+_HASH_CHUNK = 1 << 20
+
+
+@dataclass
+class ScanPlan:
+    parse: list[Path] = field(default_factory=list)       # new or changed content
+    touched: dict[str, tuple[int, int]] = field(default_factory=dict)  # same content, new mtime
+    removed: list[str] = field(default_factory=list)      # in the manifest, gone from disk
+    skipped: int = 0
+
+
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as fh:
+        while chunk := fh.read(_HASH_CHUNK):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _chunks(items, size: int = WRITE_BATCH_SIZE):
+    it = iter(items)
+    while batch := list(islice(it, size)):
+        yield batch
+
+
+async def plan_scans(db: AsyncSession, paths: list[Path]) -> ScanPlan:
+    """Decide which scan files need parsing; reads only files whose size or mtime moved."""
+    result = await db.execute(select(IngestFile.path, IngestFile.size, IngestFile.mtime_ns, IngestFile.sha256))
+    manifest = {row.path: row for row in result}
+    plan = ScanPlan(removed=sorted(manifest.keys() - {p.name for p in paths}))
+    for path in paths:
+        stat = path.stat()
+        known = manifest.get(path.name)
+        if known and (known.size, known.mtime_ns) == (stat.st_size, stat.st_mtime_ns):
+            plan.skipped += 1
+        elif known and known.size == stat.st_size and \
+                await asyncio.to_thread(_file_sha256, path) == known.sha256:
+            plan.touched[path.name] = (stat.st_size, stat.st_mtime_ns)
+            plan.skipped += 1
+        else:
+            plan.parse.append(path)
+    return plan
+
+
+async def apply_scans(
+    db: AsyncSession, plan: ScanPlan, results: list[tuple[tuple[int, str], list[dict]]]
+) -> set[str]:
+    """
+    Record parsed scans and vanished files in the manifest (without committing)
+    and return the IPs whose per-file data was added, removed or changed.
+    """
+    affected: set[str] = set()
+    for name, (size, mtime_ns) in plan.touched.items():
+        await db.execute(
+            IngestFile.__table__.update()
+            .where(IngestFile.path == name)
+            .values(size=size, mtime_ns=mtime_ns)
+        )
+    for name in plan.removed:
+        rows = await db.execute(select(IngestHost.ip_address).where(IngestHost.path == name))
+        affected.update(rows.scalars())
+        await db.execute(delete(IngestHost).where(IngestHost.path == name))
+        await db.execute(delete(IngestFile).where(IngestFile.path == name))
+
+    for (scan_start, path_str), hosts in results:
+        path = Path(path_str)
+        stored = await db.execute(
+            select(IngestHost.ip_address, *(getattr(IngestHost, f) for f in HOST_FIELDS))
+            .where(IngestHost.path == path.name)
+        )
+        old = {row[0]: dict(zip(HOST_FIELDS, row[1:])) for row in stored}
+        new = {h["ip_address"]: {f: h.get(f) for f in HOST_FIELDS} for h in hosts}
+        removed = old.keys() - new.keys()
+        changed = [ip for ip, data in new.items() if old.get(ip) != data]
+        affected.update(removed, changed)
+
+        stat = path.stat()
+        file_stmt = upsert_insert(db, IngestFile).values(
+            path=path.name, size=stat.st_size, mtime_ns=stat.st_mtime_ns,
+            sha256=await asyncio.to_thread(_file_sha256, path), scan_start=scan_start,
+        )
+        await db.execute(file_stmt.on_conflict_do_update(
+            index_elements=[IngestFile.path],
+            set_={c: file_stmt.excluded[c] for c in ("size", "mtime_ns", "sha256", "scan_start")}
+            | {"processed_at": func.now()},
+        ))
+        for batch in _chunks(removed):
+            await db.execute(delete(IngestHost).where(IngestHost.path == path.name, IngestHost.ip_address.in_(batch)))
+        for batch in _chunks(changed):
+            stmt = upsert_insert(db, IngestHost).values(
+                [{"path": path.name, "ip_address": ip, **new[ip]} for ip in batch]
+            )
+            await db.execute(stmt.on_conflict_do_update(
+                index_elements=[IngestHost.path, IngestHost.ip_address],
+                set_={f: stmt.excluded[f] for f in HOST_FIELDS},
+            ))
+    return affected
+
+
+async def merged_hosts(db: AsyncSession, ips: set[str]) -> dict[str, dict]:
+    """Re-merge the given IPs from every file in the manifest that reports them."""
+    from app.services.nmap_service import merge_scans
+
+    scans: dict[tuple[int, str], list[dict]] = {}
+    for batch in _chunks(sorted(ips)):
+        rows = await db.execute(
+            select(IngestFile.scan_start, IngestHost.path, IngestHost.ip_address,
+                   *(getattr(IngestHost, f) for f in HOST_FIELDS))
+            .join(IngestFile, IngestFile.path == IngestHost.path)
+            .where(IngestHost.ip_address.in_(batch))
+        )
+        for scan_start, path, ip, *values in rows:
+            scans.setdefault((scan_start, path), []).append({"ip_address": ip, **dict(zip(HOST_FIELDS, values))})
+    return merge_scans(scans.items())
+
+
+async def known_host_count(db: AsyncSession) -> int:
+    return await db.scalar(select(func.count(func.distinct(IngestHost.ip_address)))) or 0
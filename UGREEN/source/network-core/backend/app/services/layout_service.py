@@ -0,0 +1,177 @@
+"""
+Server-side map layout, cached per node group.
+
+Nodes are grouped by device_type, the same groups the map draws as
+compound nodes. Inside a group, devices are clustered under their uplink
+router (the lowest-IP router they are linked to), and each cluster is a
+compact grid, with clusters in router order. The router group is a band at
+the top; the other groups sit side by side below it.
+
+Each group's coordinates are stored in layout_groups relative to the group
+origin, together with a signature of its members and their uplinks. A
+snapshot only re-lays-out the groups whose signature changed. Group
+origins come from the stored extents and are recomputed on every call,
+which is O(groups).
+
+Functions:
+- apply_layout(db, snapshot) -> int   — adds "x"/"y" to every snapshot node,
+                                        returns the number of groups re-laid-out
+- layout_group(clusters) -> (positions, width, height)
+"""
+import hashlib
+import ipaddress
+import logging
+import math
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.dialect import upsert_insert
+from app.models.layout import LayoutGroup
+
+log = logging.getLogger(__name__)
+
+SPACING = 90.0       # grid cell per node
+CLUSTER_GAP = 60.0   # between router clusters inside a group
+GROUP_GAP = 200.0    # between groups (compound node padding and labels live here)
+ROUTER = "router"
+UNKNOWN = "unknown"
+# Left-to-right order of the groups below the router band; other types follow alphabetically.
+GROUP_ORDER = ("server", "nas", "network", "iot", UNKNOWN)
+
+
+def _ip_key(ip: str | None) -> tuple:
+    try:
+        address = ipaddress.ip_address(ip)
+        return (address.version, int(address), "")
+    except ValueError:
+        return (9, 0, ip or "")
+
+
+def _group_clusters(nodes: list[dict], edges: list[dict]) -> dict[str, list[tuple[str | None, list[str]]]]:
+    """group key -> [(uplink router id or None, member ids)] in layout order."""
+    routers = sorted((n for n in nodes if n["type"] == ROUTER), key=lambda n: _ip_key(n["ip"]))
+    rank = {n["id"]: i for i, n in enumerate(routers)}
+
+    uplink: dict[str, str] = {}
+    for edge in edges:
+        for device_id, router_id in ((edge["source"], edge["target"]), (edge["target"], edge["source"])):
+            if router_id in rank and device_id not in rank:
+                current = uplink.get(device_id)
+                if current is None or rank[router_id] < rank[current]:
+                    uplink[device_id] = router_id
+
+    groups: dict[str, dict[str | None, list[str]]] = {}
+    for node in sorted(nodes, key=lambda n: _ip_key(n["ip"])):
+        key = node["type"] or UNKNOWN
+        # Routers get one cluster each, so the band wraps like any other group.
+        cluster = node["id"] if key == ROUTER else uplink.get(node["id"])
+        groups.setdefault(key, {}).setdefault(cluster, []).append(node["id"])
+
+    def cluster_order(item: tuple[str | None, list[str]]) -> int:
+        return rank.get(item[0], len(rank))
+
+    return {key: sorted(clusters.items(), key=cluster_order) for key, clusters in groups.items()}
+
+
+def _signature(clusters: list[tuple[str | None, list[str]]]) -> str:
+    raw = "\n".join(f"{uplink}:{','.join(members)}" for uplink, members in clusters)
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def layout_group(clusters: list[list[str]]) -> tuple[dict[str, list[float]], float, float]:
+    """
+    Place each cluster as a near-square grid and flow clusters into rows.
+
+    Rows wrap at sqrt(1.5 x total cluster area), so a group stays roughly
+    3:2 whatever its size. Returns positions relative to the group's
+    top-left corner and the group's width and height.
+    """
+    grids = []
+    for members in clusters:
+        cols = math.ceil(math.sqrt(len(members)))
+        grids.append((members, cols, cols * SPACING, math.ceil(len(members) / cols) * SPACING))
+    area = sum((w + CLUSTER_GAP) * (h + CLUSTER_GAP) for _, _, w, h in grids)
+    max_width = math.sqrt(area * 1.5)
+
+    positions: dict[str, list[float]] = {}
+    x = y = row_height = width = 0.0
+    for members, cols, w, h in grids:
+        if x > 0 and x + w > max_width:
+            x, y, row_height = 0.0, y + row_height + CLUSTER_GAP, 0.0
+        for i, device_id in enumerate(members):
+            positions[device_id] = [x + (i % cols + 0.5) * SPACING, y + (i // cols + 0.5) * SPACING]
+        width = max(width, x + w)
+        row_height = max(row_height, h)
+        x += w + CLUSTER_GAP
+    return positions, width, y + row_height
+
+
+def _group_origins(extents: dict[str, tuple[float, float]]) -> dict[str, tuple[float, float]]:
+    below = sorted(
+        (key for key in extents if key != ROUTER),
+        key=lambda key: (GROUP_ORDER.index(key) if key in GROUP_ORDER else len(GROUP_ORDER), key),
+    )
+    origins = {}
+    x = 0.0
+    top = extents[ROUTER][1] + GROUP_GAP if ROUTER in extents else 0.0
+    for key in below:
+        origins[key] = (x, top)
+        x += extents[key][0] + GROUP_GAP
+    if ROUTER in extents:
+        # Centre the router band over the groups below it.
+        origins[ROUTER] = (max(0.0, (x - GROUP_GAP - extents[ROUTER][0]) / 2), 0.0)
+    return origins
+
+
+async def apply_layout(db: AsyncSession, snapshot: dict) -> int:
+    """
+    Add "x"/"y" to every node of a topology snapshot, in place.
+
+    Groups whose members or uplinks changed are laid out again and stored;
+    groups that no longer exist are dropped. Returns how many groups were
+    re-laid-out.
+    """
+    groups = _group_clusters(snapshot["nodes"], snapshot["edges"])
+    result = await db.execute(select(LayoutGroup).execution_options(populate_existing=True))
+    stored = {row.group_key: row for row in result.scalars()}
+
+    layouts: dict[str, tuple[dict, float, float]] = {}
+    changed = []
+    for key, clusters in groups.items():
+        signature = _signature(clusters)
+        row = stored.get(key)
+        if row is not None and row.signature == signature:
+            layouts[key] = (row.positions, row.width, row.height)
+            continue
+        positions, width, height = layout_group([members for _, members in clusters])
+        layouts[key] = (positions, width, height)
+        changed.append({
+            "group_key": key, "signature": signature, "width": width, "height": height, "positions": positions,
+        })
+
+    removed = stored.keys() - groups.keys()
+    if changed:
+        stmt = upsert_insert(db, LayoutGroup).values(changed)
+        await db.execute(stmt.on_conflict_do_update(
+            index_elements=[LayoutGroup.group_key],
+            set_={
+                "signature": stmt.excluded.signature,
+                "width": stmt.excluded.width,
+                "height": stmt.excluded.height,
+                "positions": stmt.excluded.positions,
+                "updated_at": func.now(),
+            },
+        ))
+    if removed:
+        await db.execute(delete(LayoutGroup).where(LayoutGroup.group_key.in_(removed)))
+    if changed or removed:
+        await db.commit()
+        log.info("Layout: %d group(s) re-laid-out, %d dropped", len(changed), len(removed))
+
+    origins = _group_origins({key: (width, height) for key, (_, width, height) in layouts.items()})
+    for node in snapshot["nodes"]:
+        key = node["type"] or UNKNOWN
+        positions, _, _ = layouts[key]
+        ox, oy = origins[key]
+        x, y = positions[node["id"]]
+        node["x"], node["y"] = round(ox + x, 1), round(oy + y, 1)
+    return len(changed)
@@ -1,42 +1,201 @@
+from collections.abc import Sequence
+from sqlalchemy.engine import Row
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import delete, insert, select, or_, tuple_, update
+from app.db.bulk import chunks, existing_ids, update_by_id
+from app.db.dialect import upsert_insert
+from app.models.device import Device
 from app.models.link import Link
-from app.schemas.link import LinkCreate, LinkPatch
+from app.schemas.link import LinkCreate, LinkPatch, LinkRead
+from app.services import events, read_cache
+from app.services.topology_service import edge_payload
 import uuid
 
+# Columns returned by list_links(), in LinkRead field order.
+READ_COLUMNS = tuple(LinkRead.model_fields)
 
-async def list_links(db: AsyncSession) -> list[Link]:
-    result = await db.execute(select(Link))
-    return list(result.scalars().all())
 
+def filter_links(stmt, *, device_id: str | None = None, link_type: str | None = None):
+    """Apply the link list filters to `stmt`; `device_id` matches either endpoint."""
+    if device_id:
+        stmt = stmt.where(or_(Link.source_id == device_id, Link.target_id == device_id))
+    if link_type:
+        stmt = stmt.where(Link.link_type == link_type)
+    return stmt
 
-async def get_link(db: AsyncSession, link_id: str) -> Link | None:
-    return await db.get(Link, link_id)
+
+async def list_links(
+    db: AsyncSession,
+    *,
+    limit: int | None = None,
+    cursor: str | None = None,
+    **filters,
+) -> tuple[list[Row], str | None]:
+    """
+    Return one keyset page of links ordered by id, plus the cursor of the
+    next page (None on the last page). See filter_links() for `filters`.
+    Rows are plain tuples of the READ_COLUMNS, like device_service.list_devices().
+    """
+    stmt = filter_links(select(*(getattr(Link, c) for c in READ_COLUMNS)), **filters).order_by(Link.id)
+    if cursor:
+        stmt = stmt.where(Link.id > cursor)
+    if limit is not None:
+        stmt = stmt.limit(limit + 1)
+    result = await db.execute(stmt)
+    links = result.all()
+    if limit is not None and len(links) > limit:
+        links = links[:limit]
+        return links, links[-1].id
+    return links, None
+
+
+async def get_link(db: AsyncSession, link_id: str) -> LinkRead | None:
+    """Served from read_cache.links when possible; cached as an immutable LinkRead."""
+    generation = read_cache.links.generation
+    cached = read_cache.links.get(link_id)
+    if cached is not None:
+        return cached
+    link = await db.get(Link, link_id)
+    if link is None:
+        return None
+    link = LinkRead.model_validate(link)
+    read_cache.links.put(link_id, link, generation)
+    return link
+
+
+async def find_link(db: AsyncSession, source_id: str, target_id: str) -> Link | None:
+    result = await db.execute(
+        select(Link).where(Link.source_id == source_id, Link.target_id == target_id)
+    )
+    return result.scalars().first()
 
 
 async def create_link(db: AsyncSession, data: LinkCreate) -> Link:
-    link = Link(id=str(uuid.uuid4()), **data.model_dump())
-    db.add(link)
+    """INSERT ... RETURNING; IntegrityError (duplicate or unknown device) surfaces here."""
+    stmt = insert(Link).values(id=str(uuid.uuid4()), **data.model_dump()).returning(Link)
+    link = (await db.scalars(stmt)).one()
+    event = {"kind": "link", "op": "create", "id": link.id, "edge": edge_payload(link)}
+    await events.publish(db, event)
     await db.commit()
-    await db.refresh(link)
+    read_cache.on_event(event)
     return link
 
 
 async def update_link(db: AsyncSession, link_id: str, data: LinkPatch) -> Link | None:
-    link = await db.get(Link, link_id)
+    """
+    UPDATE ... RETURNING in one round-trip; None if the link does not exist.
+
+    An empty patch writes nothing and returns the stored row (the ORM entity,
+    not the cached LinkRead of get_link).
+    """
+    fields = data.model_dump(exclude_unset=True)
+    if not fields:
+        return await db.get(Link, link_id)
+    stmt = (
+        update(Link).where(Link.id == link_id).values(**fields)
+        .returning(Link).execution_options(populate_existing=True)
+    )
+    link = (await db.scalars(stmt)).one_or_none()
     if not link:
         return None
-    for field, value in data.model_dump(exclude_unset=True).items():
-        setattr(link, field, value)
+    event = {"kind": "link", "op": "update", "id": link.id, "edge": edge_payload(link)}
+    await events.publish(db, event)
     await db.commit()
-    await db.refresh(link)
+    read_cache.on_event(event)
     return link
 
 
 async def delete_link(db: AsyncSession, link_id: str) -> bool:
-    link = await db.get(Link, link_id)
-    if not link:
+    result = await db.execute(delete(Link).where(Link.id == link_id).returning(Link.id))
+    if result.scalar_one_or_none() is None:
         return False
-    await db.delete(link)
+    event = {"kind": "link", "op": "delete", "id": link_id}
+    await events.publish(db, event)
     await db.commit()
+    read_cache.on_event(event)
     return True
+
+
+async def bulk_create_links(db: AsyncSession, items: Sequence[LinkCreate]) -> list[tuple[str, str | None]]:
+    """
+    Create links with one INSERT ... ON CONFLICT (source_id, target_id)
+    DO NOTHING RETURNING per batch, all in a single transaction.
+
+    Returns (status, id) per item, in order: "created", "exists" with the id
+    of the stored link, or "unknown_device" (id None) when an endpoint does
+    not exist.
+    """
+    # Compiled once; executemany with RETURNING is sent as multi-row INSERTs.
+    table = Link.__table__
+    stmt = (
+        upsert_insert(db, table)
+        .on_conflict_do_nothing(index_elements=[table.c.source_id, table.c.target_id])
+        .returning(table.c.source_id, table.c.target_id)
+    )
+    results = []
+    for batch in chunks(items):
+        endpoints = {data.source_id for data in batch} | {data.target_id for data in batch}
+        known = await existing_ids(db, Device, list(endpoints))
+        new: dict[tuple[str, str], dict] = {}
+        for data in batch:
+            if data.source_id in known and data.target_id in known:
+                new.setdefault((data.source_id, data.target_id), {"id": str(uuid.uuid4()), **data.model_dump()})
+        created, stored = set(), {}
+        if new:
+            created = {tuple(row) for row in (await db.execute(stmt, list(new.values()))).all()}
+        if len(created) < len(new):
+            result = await db.execute(
+                select(Link.source_id, Link.target_id, Link.id)
+                .where(tuple_(Link.source_id, Link.target_id).in_(list(new.keys() - created)))
+            )
+            stored = {(source, target): link_id for source, target, link_id in result.all()}
+        for data in batch:
+            pair = (data.source_id, data.target_id)
+            if pair not in new:
+                results.append(("unknown_device", None))
+            elif pair in created:
+                created.discard(pair)
+                results.append(("created", new[pair]["id"]))
+            else:
+                results.append(("exists", stored.get(pair) or new[pair]["id"]))
+    changed = any(status == "created" for status, _ in results)
+    if changed:
+        await events.publish(db, events.RELOAD)
+    await db.commit()
+    if changed:
+        read_cache.on_event(events.RELOAD)
+    return results
+
+
+async def bulk_update_links(db: AsyncSession, patches: Sequence[tuple[str, LinkPatch]]) -> set[str]:
+    """Patch many links in a single transaction; returns the ids that exist."""
+    found = await update_by_id(
+        db, Link, [(link_id, data.model_dump(exclude_unset=True, exclude={"id"})) for link_id, data in patches]
+    )
+    if found:
+        await events.publish(db, events.RELOAD)
+    await db.commit()
+    if found:
+        read_cache.on_event(events.RELOAD)
+    return found
+
+
+async def bulk_delete_links(db: AsyncSession, ids: Sequence[str] | None = None, **filters) -> set[str]:
+    """
+    Delete the links listed in `ids`, or else those matching `filters`
+    (see filter_links()), one DELETE per batch in a single transaction.
+    Returns the deleted ids.
+    """
+    if ids is not None:
+        targets = await existing_ids(db, Link, ids)
+    else:
+        result = await db.execute(filter_links(select(Link.id), **filters))
+        targets = set(result.scalars())
+    for batch in chunks(sorted(targets)):
+        await db.execute(delete(Link).where(Link.id.in_(batch)))
+    if targets:
+        await events.publish(db, events.RELOAD)
+    await db.commit()
+    if targets:
+        read_cache.on_event(events.RELOAD)
+    return targets
@@ -4,13 +4,27 @@ Nmap XML parser and device import service (Task 9).
 Functions:
 - parse_host_discovery(xml_path) -> list[dict]   — parses nmap-host-discovery.xml
 - parse_top200(xml_path) -> list[dict]            — parses nmap-top200.xml (top 200 ports)
-- import_from_files(db) -> int                   — seeds Device table from XML files
-- _guess_device_type(vendor, ports) -> str       — heuristic device classification
+- iter_host_discovery / iter_top200              — streaming (iterparse) variants of the above
+- parse_scan_file(path) -> (scan_key, hosts)     — any nmap XML: addresses, names and ports
+- merge_scans(results) -> dict[str, dict]        — per-IP merge, last scan wins
+- import_from_files(db) -> dict[str, int]        — incremental import of every XML in NMAP_DIR
+                                                   (changed files only, parsed in parallel)
+
+Hosts without a vendor get one from the offline OUI index (oui_db), then
+device types come from device_classifier (rule table in device_rules.json).
 """
+import asyncio
+import logging
+import multiprocessing
 import os
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import xml.etree.ElementTree as ET
 from sqlalchemy.ext.asyncio import AsyncSession
+from app.services import device_classifier, ingest_service, oui_db
+
+log = logging.getLogger(__name__)
 
 # Docker: /nmap-data (volume mount), dev: fallback via parents[5]
 _docker_path = Path("/nmap-data")
@@ -23,6 +37,78 @@ else:
         NMAP_DIR = _docker_path  # fallback — will fail gracefully at import time
 
 
+def _host_discovery_entry(host: ET.Element) -> dict | None:
+    """Build a host-discovery dict from a <host> element, or None if it is not usable."""
+    status = host.find("status")
+    if status is None or status.get("state") != "up":
+        return None
+    entry: dict = {
+        "ip_address": None,
+        "mac_address": None,
+        "vendor": None,
+        "hostname": None,
+    }
+    for addr in host.findall("address"):
+        if addr.get("addrtype") == "ipv4":
+            entry["ip_address"] = addr.get("addr")
+        elif addr.get("addrtype") == "mac":
+            entry["mac_address"] = addr.get("addr")
+            entry["vendor"] = addr.get("vendor")  # may be None if unknown OUI
+    hostnames_el = host.find("hostnames")
+    if hostnames_el is not None:
+        for hn in hostnames_el.findall("hostname"):
+            entry["hostname"] = hn.get("name")
+            break  # take only the first hostname
+    if not entry["ip_address"]:
+        return None
+    return entry
+
+
+def _top200_entry(host: ET.Element) -> dict | None:
+    """Build an open-ports dict from a <host> element, or None if it has no IPv4 address."""
+    ip_entry = next(
+        (
+            a.get("addr")
+            for a in host.findall("address")
+            if a.get("addrtype") == "ipv4"
+        ),
+        None,
+    )
+    if not ip_entry:
+        return None
+    open_ports: list[int] = []
+    ports_el = host.find("ports")
+    if ports_el is not None:
+        for port in ports_el.findall("port"):
+            state_el = port.find("state")
+            if state_el is not None and state_el.get("state") == "open":
+                open_ports.append(int(port.get("portid")))
+    return {"ip_address": ip_entry, "open_ports": open_ports}
+
+
+def _iter_host_elements(xml_path: Path) -> Iterator[ET.Element]:
+    """
+    Stream the top-level <host> elements of an nmap XML file.
+
+    Every direct child of <nmaprun> (<host>, <hosthint>, <taskprogress>, ...)
+    is dropped from the tree as soon as it has been handled, so memory use
+    stays flat regardless of how many hosts the scan contains.
+    """
+    context = ET.iterparse(xml_path, events=("start", "end"))
+    _, root = next(context)
+    depth = 1
+    for event, elem in context:
+        if event == "start":
+            depth += 1
+            continue
+        depth -= 1
+        if depth != 1:
+            continue
+        if elem.tag == "host":
+            yield elem
+        root.clear()
+
+
 def parse_host_discovery(xml_path: Path) -> list[dict]:
     """
     Parse nmap host-discovery XML and return a list of host dicts.
@@ -32,36 +118,27 @@ def parse_host_discovery(xml_path: Path) -> list[dict]:
       - mac_address (str | None)
       - vendor      (str | None)
       - hostname    (str | None)  — first PTR hostname if present
+
+    Builds the whole tree in memory; use iter_host_discovery() for large scans.
     """
     tree = ET.parse(xml_path)
     root = tree.getroot()
     hosts = []
     for host in root.findall("host"):
-        status = host.find("status")
-        if status is None or status.get("state") != "up":
-            continue
-        entry: dict = {
-            "ip_address": None,
-            "mac_address": None,
-            "vendor": None,
-            "hostname": None,
-        }
-        for addr in host.findall("address"):
-            if addr.get("addrtype") == "ipv4":
-                entry["ip_address"] = addr.get("addr")
-            elif addr.get("addrtype") == "mac":
-                entry["mac_address"] = addr.get("addr")
-                entry["vendor"] = addr.get("vendor")  # may be None if unknown OUI
-        hostnames_el = host.find("hostnames")
-        if hostnames_el is not None:
-            for hn in hostnames_el.findall("hostname"):
-                entry["hostname"] = hn.get("name")
-                break  # take only the first hostname
-        if entry["ip_address"]:
+        entry = _host_discovery_entry(host)
+        if entry:
             hosts.append(entry)
     return hosts
 
 
+def iter_host_discovery(xml_path: Path) -> Iterator[dict]:
+    """Streaming variant of parse_host_discovery() — yields the same dicts one by one."""
+    for host in _iter_host_elements(xml_path):
+        entry = _host_discovery_entry(host)
+        if entry:
+            yield entry
+
+
 def parse_top200(xml_path: Path) -> list[dict]:
     """
     Parse nmap top-200-ports XML and return a list of host dicts.
@@ -73,134 +150,248 @@ def parse_top200(xml_path: Path) -> list[dict]:
     Note: the top200 file uses both <hosthint> (pre-scan hints, no port data)
     and <host> (actual scan results with <ports>). Only <host> elements are
     processed here; <hosthint> elements are ignored.
+
+    Builds the whole tree in memory; use iter_top200() for large scans.
     """
     tree = ET.parse(xml_path)
     root = tree.getroot()
     hosts = []
     for host in root.findall("host"):
-        ip_entry = next(
-            (
-                a.get("addr")
-                for a in host.findall("address")
-                if a.get("addrtype") == "ipv4"
-            ),
-            None,
-        )
-        if not ip_entry:
-            continue
-        open_ports: list[int] = []
-        ports_el = host.find("ports")
-        if ports_el is not None:
-            for port in ports_el.findall("port"):
-                state_el = port.find("state")
-                if state_el is not None and state_el.get("state") == "open":
-                    open_ports.append(int(port.get("portid")))
-        hosts.append({"ip_address": ip_entry, "open_ports": open_ports})
+        entry = _top200_entry(host)
+        if entry:
+            hosts.append(entry)
     return hosts
 
 
-def _guess_device_type(vendor: str, ports: list[int]) -> str:
+def iter_top200(xml_path: Path) -> Iterator[dict]:
+    """Streaming variant of parse_top200() — yields the same dicts one by one."""
+    for host in _iter_host_elements(xml_path):
+        entry = _top200_entry(host)
+        if entry:
+            yield entry
+
+
+def _scan_host_entry(host: ET.Element) -> dict | None:
     """
-    Heuristic device type classification based on vendor string and open ports.
+    Build a host dict from a <host> element of any scan type.
 
-    Returns one of: "server", "nas", "router", "network", "iot", "unknown".
+    open_ports is None when the scan did not probe ports (host discovery),
+    so a merge can tell "no open ports" from "ports not scanned".
     """
-    vendor_lower = (vendor or "").lower()
-    if "proxmox" in vendor_lower:
-        return "server"
-    if "ugreen" in vendor_lower:
-        return "nas"
-    if "hewlett" in vendor_lower or "hp" in vendor_lower:
-        return "server"
-    if "routerboard" in vendor_lower or "mikrotik" in vendor_lower:
-        return "router"
-    if "asus" in vendor_lower or "tp-link" in vendor_lower:
-        return "router"
-    if "espressif" in vendor_lower or "tuya" in vendor_lower or "broadlink" in vendor_lower:
-        return "iot"
-    if 80 in ports or 443 in ports or 8080 in ports or 8443 in ports:
-        return "network"
-    return "unknown"
+    entry = _host_discovery_entry(host)
+    if entry is None:
+        return None
+    scanned = host.find("ports") is not None
+    entry["open_ports"] = _top200_entry(host)["open_ports"] if scanned else None
+    return entry
+
+
+def _scan_start(xml_path: Path) -> int:
+    """Scan start time (nmaprun start=, epoch seconds); file mtime when missing."""
+    for _, elem in ET.iterparse(xml_path, events=("start",)):
+        if elem.tag == "nmaprun" and elem.get("start", "").isdigit():
+            return int(elem.get("start"))
+        break
+    return int(xml_path.stat().st_mtime)
+
+
+def parse_scan_file(xml_path: str) -> tuple[tuple[int, str], list[dict]]:
+    """
+    Parse one nmap XML file of any scan type.
+
+    Runs in a worker process, so it takes and returns plain picklable values:
+    ((scan start, path), [host dict, ...]). A truncated or malformed file
+    keeps the hosts read before the error.
+    """
+    path = Path(xml_path)
+    key = (int(path.stat().st_mtime), xml_path)
+    hosts: list[dict] = []
+    try:
+        key = (_scan_start(path), xml_path)
+        for host in _iter_host_elements(path):
+            entry = _scan_host_entry(host)
+            if entry:
+                hosts.append(entry)
+    except ET.ParseError as exc:
+        log.warning("Nmap scan %s is malformed, kept %d host(s) read before: %s", xml_path, len(hosts), exc)
+    return key, hosts
+
+
+def merge_scans(results: Iterable[tuple[tuple[int, str], list[dict]]]) -> dict[str, dict]:
+    """
+    Merge parsed scans by IP, oldest first: a later scan overrides every
+    field it actually observed (non-None), fields it did not see keep the
+    older value.
+    """
+    merged: dict[str, dict] = {}
+    for _key, hosts in sorted(results, key=lambda result: result[0]):
+        for host in hosts:
+            current = merged.get(host["ip_address"])
+            if current is None:
+                merged[host["ip_address"]] = dict(host)
+                continue
+            for field, value in host.items():
+                if value is not None:
+                    current[field] = value
+    return merged
+
+
+def discover_scan_files(nmap_dir: Path) -> list[Path]:
+    return sorted(p for p in nmap_dir.glob("*.xml") if p.is_file())
+
+
+async def parse_scan_files(
+    paths: list[Path],
+    workers: int | None = None,
+    on_parsed: Callable[[int], Awaitable[None]] | None = None,
+) -> list[tuple[tuple[int, str], list[dict]]]:
+    """
+    Parse scan files in a process pool (workers=None: one per CPU).
+
+    A single file, or workers=1, is parsed in a thread instead — not worth
+    the cost of starting processes. on_parsed(n) is awaited after each file
+    with the number of files done so far. Results come in completion order.
+    """
+    loop = asyncio.get_running_loop()
+    workers = min(workers or os.cpu_count() or 1, len(paths))
+    results = []
+
+    async def collect(futures) -> None:
+        for future in asyncio.as_completed(futures):
+            results.append(await future)
+            if on_parsed:
+                await on_parsed(len(results))
+
+    if workers <= 1:
+        for p in paths:
+            await collect([loop.run_in_executor(None, parse_scan_file, str(p))])
+        return results
+    # spawn: never fork the server process with its event loop and connections
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        await collect([loop.run_in_executor(pool, parse_scan_file, str(p)) for p in paths])
+    return results
 
 
 async def _auto_link_routers(db: AsyncSession) -> int:
     """
     Create ethernet links from every router to every non-router device.
 
-    Skips pairs that already have a link in either direction.
+    Runs as a single INSERT ... SELECT: the router x device pairs are
+    anti-joined against existing links in either direction inside the
+    database, and ON CONFLICT on the (source_id, target_id) unique index
+    keeps re-runs idempotent. Router-to-router pairs are linked once, from
+    the router with the lower id.
+
     Returns the count of newly created links.
     """
-    from sqlalchemy import select
+    from sqlalchemy import and_, exists, literal, not_, select
+    from sqlalchemy.orm import aliased
+    from app.db.dialect import upsert_insert, uuid_sql
     from app.models.device import Device
     from app.models.link import Link
-    from app.schemas.link import LinkCreate
-    from app.services import link_service
-
-    result = await db.execute(select(Device))
-    all_devices = list(result.scalars().all())
-
-    routers = [d for d in all_devices if d.device_type == "router"]
-    if not routers:
-        return 0
 
-    link_result = await db.execute(select(Link.source_id, Link.target_id))
-    existing = {(r[0], r[1]) for r in link_result.all()}
+    router = aliased(Device)
+    device = aliased(Device)
+    forward = aliased(Link)
+    reverse = aliased(Link)
 
-    count = 0
-    for router in routers:
-        for device in all_devices:
-            if device.id == router.id:
-                continue
-            if (router.id, device.id) in existing or (device.id, router.id) in existing:
-                continue
-            await link_service.create_link(db, LinkCreate(source_id=router.id, target_id=device.id))
-            existing.add((router.id, device.id))
-            count += 1
-    return count
+    pairs = (
+        select(
+            uuid_sql(db),
+            router.id,
+            device.id,
+            literal("ethernet"),
+        )
+        .join(device, device.id != router.id)
+        .where(
+            router.device_type == "router",
+            not_(and_(device.device_type == "router", device.id < router.id)),
+            ~exists().where(forward.source_id == router.id, forward.target_id == device.id),
+            ~exists().where(reverse.source_id == device.id, reverse.target_id == router.id),
+        )
+    )
+    stmt = (
+        upsert_insert(db, Link)
+        .from_select(["id", "source_id", "target_id", "link_type"], pairs)
+        .on_conflict_do_nothing(index_elements=["source_id", "target_id"])
+    )
+    result = await db.execute(stmt)
+    await db.commit()
+    return result.rowcount
 
 
-async def import_from_files(db: AsyncSession) -> int:
+async def import_from_files(
+    db: AsyncSession,
+    workers: int | None = None,
+    progress: Callable[..., Awaitable[None]] | None = None,
+) -> dict[str, int]:
     """
-    Import hosts from Nmap XML files into the Device table.
+    Import hosts from the Nmap XML files in NMAP_DIR into the Device table.
+
+    Incremental (see ingest_service): unchanged files are skipped, changed
+    ones are parsed in parallel (parse_scan_files) and diffed per host, and
+    only added/removed/changed IPs are re-merged with last-scan-wins
+    semantics (merge_scans) and streamed into bulk-upsert batches (new IPs
+    are inserted, known IPs get mac/vendor/hostname/device_type refreshed).
+    The manifest and the devices commit together. Then routers are
+    auto-linked to all devices.
 
-    Reads nmap-host-discovery.xml and nmap-top200.xml from NMAP_DIR,
-    merges data by IP address, skips existing IPs to avoid duplicates,
-    bulk-creates Device records, then auto-links routers to all devices.
+    progress(phase, **counters), if given, is awaited as the import moves
+    through the "parsing", "upserting" and "linking" phases.
 
-    Returns the count of newly inserted devices.
+    Returns {"inserted": n, "updated": n, "unchanged": n}; "unchanged"
+    covers every known host that was not inserted or updated, including
+    those in skipped files.
     """
-    from sqlalchemy import select
-    from app.models.device import Device
-    from app.schemas.device import DeviceCreate
+    from app.config import settings
     from app.services import device_service
 
-    discovery_path = NMAP_DIR / "nmap-host-discovery.xml"
-    top200_path = NMAP_DIR / "nmap-top200.xml"
+    async def report(phase: str, **counters) -> None:
+        if progress:
+            await progress(phase, **counters)
 
-    hosts = parse_host_discovery(discovery_path)
-    ports_map: dict[str, list[int]] = {
-        h["ip_address"]: h["open_ports"] for h in parse_top200(top200_path)
-    }
+    paths = discover_scan_files(NMAP_DIR)
+    plan = await ingest_service.plan_scans(db, paths)
+    await report("parsing", files_total=len(paths), files_skipped=plan.skipped)
+    results = await parse_scan_files(
+        plan.parse,
+        workers or settings.NMAP_INGEST_WORKERS or None,
+        on_parsed=lambda n: report("parsing", files_parsed=n),
+    )
+    affected = await ingest_service.apply_scans(db, plan, results)
+    merged = await ingest_service.merged_hosts(db, affected)
+    log.info(
+        "Nmap import: %d file(s) parsed, %d skipped, %d removed; %d host(s) to merge",
+        len(plan.parse), plan.skipped, len(plan.removed), len(merged),
+    )
+    await report("upserting", hosts_total=len(merged))
 
-    result = await db.execute(select(Device.ip_address))
-    existing_ips = {row[0] for row in result.all()}
+    hosts = list(merged.values())
+    enriched = oui_db.enrich_vendors(hosts)
+    if enriched:
+        log.info("Nmap import: vendor for %d host(s) taken from the OUI index", enriched)
+    device_types = device_classifier.classify_many(hosts)
 
-    count = 0
-    for host in hosts:
-        ip = host["ip_address"]
-        if ip in existing_ips:
-            continue
-        open_ports = ports_map.get(ip, [])
-        device_type = _guess_device_type(host.get("vendor") or "", open_ports)
-        data = DeviceCreate(
-            ip_address=ip,
-            mac_address=host.get("mac_address"),
-            hostname=host.get("hostname"),
-            vendor=host.get("vendor"),
-            device_type=device_type,
-        )
-        await device_service.create_device(db, data)
-        count += 1
+    def rows():
+        for host, device_type in zip(hosts, device_types):
+            host.pop("open_ports")
+            yield {**host, "device_type": device_type}
+
+    counts = await device_service.bulk_upsert_devices(
+        db, rows(), on_batch=lambda c: report("upserting", hosts_done=sum(c.values())),
+    )
+    counts["unchanged"] = max(
+        0, await ingest_service.known_host_count(db) - counts["inserted"] - counts["updated"]
+    )
+    log.info("Nmap import: %(inserted)d inserted, %(updated)d updated, %(unchanged)d unchanged", counts)
 
-    await _auto_link_routers(db)
-    return count
+    await report("linking", **counts)
+    links = await _auto_link_routers(db)
+    await report("linking", links_created=links)
+    if counts["inserted"] or counts["updated"] or links:
+        # Too many changes for per-row events — clients refetch the snapshot.
+        from app.services import events, read_cache
+        await events.publish(db, events.RELOAD)
+        await db.commit()
+        read_cache.on_event(events.RELOAD)
+    return counts
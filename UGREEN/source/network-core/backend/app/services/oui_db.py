@@ -0,0 +1,174 @@
+"""
+Offline MAC vendor lookup from the IEEE registry.
+
+The IEEE CSV files (MA-L oui.csv, MA-M mam.csv, MA-S oui36.csv) are
+compiled once into a binary index:
+
+  header   magic, then the record count of the 36-, 28- and 24-bit tables
+  tables   three sorted arrays of (prefix, name offset, name length) records
+  names    UTF-8 organisation names, each stored once
+
+OuiDatabase memory-maps the file and binary-searches the tables straight
+from the mapping — most specific prefix first — so a lookup is O(log n)
+and the registry is never loaded into Python objects.
+
+Compile (the backend image does this at build time, see Dockerfile):
+  python -m app.services.oui_db oui.csv mam.csv oui36.csv -o oui.bin
+
+Functions:
+- compile_registry(csv_paths, out_path) -> int   — number of assignments
+- get_database() -> OuiDatabase | None           — index at OUI_DB_PATH, opened once
+- enrich_vendors(hosts) -> int                   — fill missing vendors from the MAC
+"""
+import argparse
+import csv
+import logging
+import mmap
+import re
+import struct
+from collections.abc import Iterable
+from pathlib import Path
+from app.config import settings
+
+log = logging.getLogger(__name__)
+
+MAGIC = b"OUIDB\x00\x00\x01"
+HEADER = struct.Struct("<8s3I")
+RECORD = struct.Struct("<QIH")  # prefix, name offset, name length
+PREFIX_BITS = (36, 28, 24)  # lookup order: most specific first
+
+_NON_HEX = re.compile(r"[^0-9A-Fa-f]")
+
+
+def mac_to_int(mac: str) -> int | None:
+    """48-bit integer for a MAC in any common notation, or None if it is not one."""
+    digits = _NON_HEX.sub("", mac or "")
+    return int(digits, 16) if len(digits) == 12 else None
+
+
+def compile_registry(csv_paths: Iterable[str | Path], out_path: str | Path) -> int:
+    """Build the binary index from IEEE registry CSVs and return the number of assignments."""
+    tables: dict[int, dict[int, str]] = {bits: {} for bits in PREFIX_BITS}
+    for path in csv_paths:
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                assignment = (row.get("Assignment") or "").strip()
+                name = (row.get("Organization Name") or "").strip()
+                bits = len(assignment) * 4
+                if bits not in tables or not name:
+                    continue
+                try:
+                    tables[bits][int(assignment, 16)] = name
+                except ValueError:
+                    continue
+
+    names = bytearray()
+    offsets: dict[str, tuple[int, int]] = {}
+    records = []
+    for bits in PREFIX_BITS:
+        for prefix in sorted(tables[bits]):
+            name = tables[bits][prefix]
+            if name not in offsets:
+                encoded = name.encode("utf-8")
+                offsets[name] = (len(names), len(encoded))
+                names += encoded
+            records.append(RECORD.pack(prefix, *offsets[name]))
+
+    out_path = Path(out_path)
+    tmp = out_path.with_suffix(out_path.suffix + ".tmp")
+    with open(tmp, "wb") as fh:
+        fh.write(HEADER.pack(MAGIC, *(len(tables[bits]) for bits in PREFIX_BITS)))
+        fh.writelines(records)
+        fh.write(names)
+    tmp.replace(out_path)
+    return len(records)
+
+
+class OuiDatabase:
+    """Read-only view of a compiled index; lookups read the mapping directly."""
+
+    def __init__(self, path: str | Path) -> None:
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, *counts = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a compiled OUI index")
+        self._tables = []  # (bits, first record offset, record count)
+        offset = HEADER.size
+        for bits, count in zip(PREFIX_BITS, counts):
+            self._tables.append((bits, offset, count))
+            offset += count * RECORD.size
+        self._names = offset
+
+    def __len__(self) -> int:
+        return sum(count for _, _, count in self._tables)
+
+    def lookup(self, mac: str) -> str | None:
+        """Organisation name for the longest registered prefix of mac."""
+        value = mac_to_int(mac)
+        if value is None:
+            return None
+        for bits, start, count in self._tables:
+            key = value >> (48 - bits)
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                prefix, name_at, name_len = RECORD.unpack_from(self._map, start + mid * RECORD.size)
+                if prefix < key:
+                    lo = mid + 1
+                elif prefix > key:
+                    hi = mid
+                else:
+                    at = self._names + name_at
+                    return self._map[at:at + name_len].decode("utf-8")
+        return None
+
+    def close(self) -> None:
+        self._map.close()
+
+
+_database: OuiDatabase | None = None
+_opened = False
+
+
+def get_database() -> OuiDatabase | None:
+    """The index at OUI_DB_PATH, opened on first use; None when not configured or unreadable."""
+    global _database, _opened
+    if not _opened:
+        _opened = True
+        if settings.OUI_DB_PATH:
+            try:
+                _database = OuiDatabase(settings.OUI_DB_PATH)
+                log.info("OUI index %s: %d assignments", settings.OUI_DB_PATH, len(_database))
+            except (OSError, ValueError) as exc:
+                log.warning("OUI index unavailable, vendors come from nmap only: %s", exc)
+    return _database
+
+
+def enrich_vendors(hosts: Iterable[dict], database: OuiDatabase | None = None) -> int:
+    """Fill "vendor" from the MAC for hosts nmap left without one; returns how many were filled."""
+    database = database or get_database()
+    if database is None:
+        return 0
+    filled = 0
+    for host in hosts:
+        if host.get("vendor") or not host.get("mac_address"):
+            continue
+        vendor = database.lookup(host["mac_address"])
+        if vendor:
+            host["vendor"] = vendor
+            filled += 1
+    return filled
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile IEEE OUI registry CSVs into a binary index.")
+    parser.add_argument("csv", nargs="+", help="oui.csv, mam.csv, oui36.csv")
+    parser.add_argument("-o", "--output", required=True)
+    args = parser.parse_args()
+    print(f"{compile_registry(args.csv, args.output)} assignments written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
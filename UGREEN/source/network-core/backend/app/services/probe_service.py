@@ -0,0 +1,79 @@
+"""
+Ping history read side.
+
+The ping worker writes raw results to device_probes and folds them into
+device_probe_rollups as it goes (worker/probes.py). The API only ever
+reads rollups, so a dashboard query costs one index range scan over at
+most a few thousand pre-aggregated rows, regardless of probe volume.
+
+Functions:
+- get_rollups(db, device_id, resolution, since, until) -> list[dict]
+"""
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.probe import DeviceProbeRollup
+
+# resolution -> bucket width; must match ROLLUPS in worker/probes.py
+RESOLUTIONS = {"1m": timedelta(minutes=1), "1h": timedelta(hours=1)}
+DEFAULT_BUCKETS = 60
+MAX_BUCKETS = 10_000
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def rollup_payload(row) -> dict:
+    answered = row.samples - row.lost
+    return {
+        "bucket": row.bucket,
+        "samples": row.samples,
+        "loss_pct": round(100.0 * row.lost / row.samples, 2) if row.samples else None,
+        "rtt_min_ms": row.rtt_min,
+        "rtt_avg_ms": round(row.rtt_sum / answered, 3) if answered else None,
+        "rtt_max_ms": row.rtt_max,
+    }
+
+
+async def get_rollups(
+    db: AsyncSession,
+    device_id: str,
+    resolution: str = "1m",
+    since: datetime | None = None,
+    until: datetime | None = None,
+) -> list[dict]:
+    """
+    Return the buckets of one device in [since, until), oldest first.
+
+    Timestamps are naive UTC. Defaults to the last DEFAULT_BUCKETS buckets. Raises ValueError for an
+    unknown resolution or a window wider than MAX_BUCKETS buckets.
+    """
+    if resolution not in RESOLUTIONS:
+        raise ValueError(f"resolution must be one of {', '.join(RESOLUTIONS)}")
+    width = RESOLUTIONS[resolution]
+    since, until = _naive_utc(since), _naive_utc(until)
+    until = until or datetime.now(timezone.utc).replace(tzinfo=None)
+    since = since or until - width * DEFAULT_BUCKETS
+    if (until - since) / width > MAX_BUCKETS:
+        raise ValueError(f"window too wide for resolution {resolution} (max {MAX_BUCKETS} buckets)")
+    rows = await db.execute(
+        select(
+            DeviceProbeRollup.bucket,
+            DeviceProbeRollup.samples,
+            DeviceProbeRollup.lost,
+            DeviceProbeRollup.rtt_min,
+            DeviceProbeRollup.rtt_max,
+            DeviceProbeRollup.rtt_sum,
+        )
+        .where(
+            DeviceProbeRollup.device_id == device_id,
+            DeviceProbeRollup.resolution == resolution,
+            DeviceProbeRollup.bucket >= since,
+            DeviceProbeRollup.bucket < until,
+        )
+        .order_by(DeviceProbeRollup.bucket)
+    )
+    return [rollup_payload(row) for row in rows]
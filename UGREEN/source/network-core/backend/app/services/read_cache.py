@@ -0,0 +1,106 @@
+"""
+In-process read cache for single-device / single-link lookups and the
+topology snapshot.
+
+Each TTLCache is a bounded LRU whose entries also expire READ_CACHE_TTL
+seconds after they were stored. Entries are dropped:
+
+- right after commit by the writing service (read-your-writes within this
+  process — on PostgreSQL the NOTIFY arrives a moment later),
+- on every topology event from the broker, which under PostgreSQL includes
+  writes by other API processes and status flips from the ping worker,
+- wholesale on "topology/reload" (bulk changes, listener reconnect).
+
+The TTL only bounds staleness for writers that publish no events at all
+(manual SQL). A reader that missed the cache takes the generation before
+querying and stores its result only if nothing was invalidated meanwhile,
+so a concurrent write can't be overwritten by the older row.
+
+Functions:
+- on_event(event)   — invalidate what an event touches (also the broker listener)
+- stats() -> dict   — size and hit/miss/eviction counters per cache
+"""
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+from app.config import settings
+from app.services import events
+
+
+class TTLCache:
+    """Bounded LRU with per-entry expiry and hit/miss counters."""
+
+    def __init__(self, maxsize: int, ttl: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self.generation = 0
+        self.hits = self.misses = self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Any | None:
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires, value = entry
+            if expires > self._clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key: Hashable, value: Any, generation: int | None = None) -> None:
+        """Store value; skipped if `generation` (taken before the read) is out of date."""
+        if self.maxsize <= 0 or self.ttl <= 0 or (generation is not None and generation != self.generation):
+            return
+        self._entries[key] = (self._clock() + self.ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        self.generation += 1
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self.generation += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._entries), "maxsize": self.maxsize, "ttl": self.ttl,
+            "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+        }
+
+
+devices = TTLCache(settings.READ_CACHE_SIZE, settings.READ_CACHE_TTL)
+links = TTLCache(settings.READ_CACHE_SIZE, settings.READ_CACHE_TTL)
+# One snapshot entry; READ_CACHE_SIZE=0 turns it off like the others.
+topology = TTLCache(min(1, settings.READ_CACHE_SIZE), settings.READ_CACHE_TTL)  # key "snapshot" -> (version, encoded body)
+CACHES = {"devices": devices, "links": links, "topology": topology}
+
+
+def on_event(event: dict) -> None:
+    kind = event.get("kind")
+    if kind == "device":
+        devices.invalidate(event.get("id"))
+        topology.clear()
+    elif kind == "link":
+        links.invalidate(event.get("id"))
+        topology.clear()
+    else:
+        for cache in CACHES.values():
+            cache.clear()
+
+
+def stats() -> dict:
+    return {name: cache.stats() for name, cache in CACHES.items()}
+
+
+events.broker.add_listener(on_event)
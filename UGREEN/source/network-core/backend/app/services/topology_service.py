@@ -0,0 +1,72 @@
+"""
+Topology snapshot service.
+
+Functions:
+- topology_version(db) -> str   — cheap fingerprint of devices + links, used as ETag
+- get_snapshot(db) -> dict      — all nodes and edges in one compact payload
+- node_payload / edge_payload   — compact node/edge dicts, shared with the event feed
+"""
+import hashlib
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models.device import Device
+from app.models.link import Link
+
+
+def node_payload(device) -> dict:
+    """Compact node dict from a Device or a row with the same column names."""
+    return {
+        "id": device.id,
+        "ip": device.ip_address,
+        "label": device.label,
+        "hostname": device.hostname,
+        "vendor": device.vendor,
+        "type": device.device_type,
+        "status": device.status or "unknown",  # server default not loaded before commit
+    }
+
+
+def edge_payload(link) -> dict:
+    """Compact edge dict from a Link or a row with the same column names."""
+    return {"id": link.id, "source": link.source_id, "target": link.target_id, "type": link.link_type}
+
+
+async def topology_version(db: AsyncSession) -> str:
+    """
+    Fingerprint the topology from row counts and max(updated_at) of both tables.
+
+    Inserts and updates move max(updated_at), deletes change the count. The
+    ping worker bumps updated_at when it flips a status, so status changes
+    are covered too. One round-trip over two aggregates instead of reading
+    every row.
+    """
+    stmt = select(
+        select(func.count()).select_from(Device).scalar_subquery(),
+        select(func.max(Device.updated_at)).scalar_subquery(),
+        select(func.count()).select_from(Link).scalar_subquery(),
+        select(func.max(Link.updated_at)).scalar_subquery(),
+    )
+    row = (await db.execute(stmt)).one()
+    raw = "|".join(str(v) for v in row)
+    return hashlib.sha1(raw.encode()).hexdigest()[:20]
+
+
+async def get_snapshot(db: AsyncSession) -> dict:
+    """
+    Return {"nodes": [...], "edges": [...]} with only the fields the map needs.
+
+    Columns are selected directly — no ORM instances or Pydantic models.
+    """
+    device_rows = await db.execute(
+        select(
+            Device.id, Device.ip_address, Device.label, Device.hostname,
+            Device.vendor, Device.device_type, Device.status,
+        ).order_by(Device.id)
+    )
+    link_rows = await db.execute(
+        select(Link.id, Link.source_id, Link.target_id, Link.link_type).order_by(Link.id)
+    )
+    return {
+        "nodes": [node_payload(r) for r in device_rows],
+        "edges": [edge_payload(r) for r in link_rows],
+    }
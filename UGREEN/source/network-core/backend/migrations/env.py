@@ -8,6 +8,10 @@ from alembic import context
 from app.models.base import Base
 from app.models.device import Device  # noqa: F401
 from app.models.link import Link      # noqa: F401
+from app.models.probe import DeviceProbe, DeviceProbeRollup  # noqa: F401
+from app.models.ingest import IngestFile, IngestHost  # noqa: F401
+from app.models.discovery_job import DiscoveryJob  # noqa: F401
+from app.models.layout import LayoutGroup  # noqa: F401
 
 config = context.config
 if config.config_file_name is not None:
@@ -0,0 +1,49 @@
+"""discovery jobs
+
+Revision ID: a8b9c0d1e2f3
+Revises: f7a8b9c0d1e2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a8b9c0d1e2f3'
+down_revision: Union[str, None] = 'f7a8b9c0d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'discovery_jobs',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('state', sa.String(length=16), nullable=False),
+        sa.Column('active', sa.Boolean(), nullable=True),
+        sa.Column('phase', sa.String(length=32), nullable=True),
+        sa.Column('progress', sa.Float(), nullable=False),
+        sa.Column('files_total', sa.Integer(), nullable=False),
+        sa.Column('files_skipped', sa.Integer(), nullable=False),
+        sa.Column('files_parsed', sa.Integer(), nullable=False),
+        sa.Column('hosts_total', sa.Integer(), nullable=False),
+        sa.Column('hosts_done', sa.Integer(), nullable=False),
+        sa.Column('inserted', sa.Integer(), nullable=False),
+        sa.Column('updated', sa.Integer(), nullable=False),
+        sa.Column('unchanged', sa.Integer(), nullable=False),
+        sa.Column('links_created', sa.Integer(), nullable=False),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.Column('started_at', sa.DateTime(), nullable=True),
+        sa.Column('finished_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('active', name='uq_discovery_jobs_active'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('discovery_jobs')
@@ -0,0 +1,37 @@
+"""unique link endpoints
+
+Revision ID: b7c1e2d3f4a5
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1e2d3f4a5'
+down_revision: Union[str, None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Drop duplicate (source_id, target_id) rows left by earlier imports,
+    # keeping one link per pair, before the unique index can be built.
+    op.execute(
+        """
+        DELETE FROM links a
+        USING links b
+        WHERE a.source_id = b.source_id
+          AND a.target_id = b.target_id
+          AND a.id > b.id
+        """
+    )
+    op.create_index('uq_links_source_target', 'links', ['source_id', 'target_id'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('uq_links_source_target', table_name='links')
@@ -0,0 +1,77 @@
+"""device list filter indexes
+
+Revision ID: c4d5e6f7a8b9
+Revises: b7c1e2d3f4a5
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import ipaddress
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, None] = 'b7c1e2d3f4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalise_ip_addresses() -> None:
+    """
+    Make every devices.ip_address castable to inet before it is indexed.
+
+    Until this revision ip_address was an unchecked string. Addresses that
+    parse but are not in canonical form (surrounding spaces, IPv6 spelling)
+    are rewritten; anything else stops the upgrade with the offending ids,
+    since one bad row would fail the index build and every CIDR query.
+    """
+    bind = op.get_bind()
+    invalid, rewrite, owners = [], [], {}
+    rows = bind.execute(sa.text('SELECT id, ip_address FROM devices')).fetchall()
+    for device_id, value in rows:
+        try:
+            canonical = str(ipaddress.ip_address((value or '').strip()))
+        except ValueError:
+            invalid.append(f'{device_id} ({value!r}: not an IP address)')
+            continue
+        owners.setdefault(canonical, []).append(device_id)
+        if canonical != value:
+            rewrite.append({'id': device_id, 'ip': canonical})
+    # ip_address is unique: two spellings of one address cannot both be rewritten.
+    invalid += [
+        f'{device_id} ({ip!r}: duplicate of {", ".join(i for i in ids if i != device_id)})'
+        for ip, ids in owners.items() if len(ids) > 1 for device_id in ids
+    ]
+    if invalid:
+        shown = ', '.join(invalid[:20]) + (f' and {len(invalid) - 20} more' if len(invalid) > 20 else '')
+        raise RuntimeError(
+            f'{len(invalid)} device(s) have an ip_address that cannot be indexed as inet: {shown}. '
+            'Fix or delete them, then re-run the upgrade.'
+        )
+    if rewrite:
+        bind.execute(sa.text('UPDATE devices SET ip_address = :ip WHERE id = :id'), rewrite)
+
+
+def upgrade() -> None:
+    _normalise_ip_addresses()
+    op.create_index('ix_devices_device_type', 'devices', ['device_type'])
+    op.create_index('ix_devices_status', 'devices', ['status'])
+    # lower(vendor) LIKE 'prefix%' — text_pattern_ops makes the prefix match indexable
+    op.create_index(
+        'ix_devices_vendor_lower', 'devices', [sa.text('lower(vendor) text_pattern_ops')]
+    )
+    # ip_address::inet <<= 'a.b.c.d/n' — btree on inet supports subnet containment
+    op.create_index('ix_devices_ip_inet', 'devices', [sa.text('(ip_address::inet)')])
+    # source_id lookups are served by uq_links_source_target
+    op.create_index('ix_links_target_id', 'links', ['target_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_links_target_id', table_name='links')
+    op.drop_index('ix_devices_ip_inet', table_name='devices')
+    op.drop_index('ix_devices_vendor_lower', table_name='devices')
+    op.drop_index('ix_devices_status', table_name='devices')
+    op.drop_index('ix_devices_device_type', table_name='devices')
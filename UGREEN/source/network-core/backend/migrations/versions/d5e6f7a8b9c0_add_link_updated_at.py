@@ -0,0 +1,29 @@
+"""add link updated_at
+
+Revision ID: d5e6f7a8b9c0
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5e6f7a8b9c0'
+down_revision: Union[str, None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'links',
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False)
+    )
+
+
+def downgrade() -> None:
+    op.drop_column('links', 'updated_at')
@@ -0,0 +1,59 @@
+"""device probe history and rollups
+
+Revision ID: e6f7a8b9c0d1
+Revises: d5e6f7a8b9c0
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e6f7a8b9c0d1'
+down_revision: Union[str, None] = 'd5e6f7a8b9c0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name == 'postgresql':
+        # Daily range partitions (device_probes_YYYYMMDD) are created and
+        # dropped by the ping worker, see worker/probes.py.
+        op.execute(
+            'CREATE TABLE device_probes ('
+            ' device_id varchar NOT NULL,'
+            ' ts timestamp NOT NULL,'
+            ' rtt_ms double precision,'
+            ' lost boolean NOT NULL DEFAULT false,'
+            ' PRIMARY KEY (device_id, ts)'
+            ') PARTITION BY RANGE (ts)'
+        )
+    else:
+        op.create_table(
+            'device_probes',
+            sa.Column('device_id', sa.String(), nullable=False),
+            sa.Column('ts', sa.DateTime(), nullable=False),
+            sa.Column('rtt_ms', sa.Float(), nullable=True),
+            sa.Column('lost', sa.Boolean(), nullable=False, server_default=sa.false()),
+            sa.PrimaryKeyConstraint('device_id', 'ts'),
+        )
+    op.create_table(
+        'device_probe_rollups',
+        sa.Column('device_id', sa.String(), nullable=False),
+        sa.Column('resolution', sa.String(length=4), nullable=False),
+        sa.Column('bucket', sa.DateTime(), nullable=False),
+        sa.Column('samples', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('lost', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rtt_min', sa.Float(), nullable=True),
+        sa.Column('rtt_max', sa.Float(), nullable=True),
+        sa.Column('rtt_sum', sa.Float(), nullable=False, server_default='0'),
+        sa.PrimaryKeyConstraint('device_id', 'resolution', 'bucket'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('device_probe_rollups')
+    op.drop_table('device_probes')
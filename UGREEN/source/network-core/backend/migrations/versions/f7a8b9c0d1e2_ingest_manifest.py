@@ -0,0 +1,49 @@
+"""nmap ingest manifest
+
+Revision ID: f7a8b9c0d1e2
+Revises: e6f7a8b9c0d1
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f7a8b9c0d1e2'
+down_revision: Union[str, None] = 'e6f7a8b9c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'ingest_files',
+        sa.Column('path', sa.String(length=1024), nullable=False),
+        sa.Column('size', sa.BigInteger(), nullable=False),
+        sa.Column('mtime_ns', sa.BigInteger(), nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False),
+        sa.Column('scan_start', sa.BigInteger(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(), server_default=sa.text('now()'), nullable=False),
+        sa.PrimaryKeyConstraint('path'),
+    )
+    op.create_table(
+        'ingest_hosts',
+        sa.Column('path', sa.String(length=1024), nullable=False),
+        sa.Column('ip_address', sa.String(length=45), nullable=False),
+        sa.Column('mac_address', sa.String(length=17), nullable=True),
+        sa.Column('vendor', sa.String(length=255), nullable=True),
+        sa.Column('hostname', sa.String(length=255), nullable=True),
+        sa.Column('open_ports', sa.JSON(), nullable=True),
+        sa.ForeignKeyConstraint(['path'], ['ingest_files.path'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('path', 'ip_address'),
+    )
+    op.create_index('ix_ingest_hosts_ip_address', 'ingest_hosts', ['ip_address'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ingest_hosts_ip_address', table_name='ingest_hosts')
+    op.drop_table('ingest_hosts')
+    op.drop_table('ingest_files')
@@ -1,6 +1,8 @@
-import { useState, useEffect } from 'react';
+import { useState, useEffect, useRef, useCallback } from 'react';
 import TopologyMap from './components/TopologyMap';
-import { fetchDevices, fetchLinks } from './api/devices';
+import { fetchTopology } from './api/devices';
+
+const POLL_MS = 120000;
 
 const LEGEND = [
   { type: 'server',  color: '#27ae60', label: 'Serwer' },
@@ -15,12 +17,25 @@ export default function App() {
   const [devices, setDevices] = useState([]);
   const [links,   setLinks]   = useState([]);
   const [error,   setError]   = useState(null);
+  const versionRef = useRef(null);
+
+  const load = useCallback(() => fetchTopology()
+    .then(({ version, devices: devs, links: lnks }) => {
+      // Same version → same graph; skip the state update so the map is not rebuilt.
+      if (version === versionRef.current) return;
+      versionRef.current = version;
+      setDevices(devs);
+      setLinks(lnks);
+      setError(null);
+    })
+    .catch(err => setError(err.message)), []);
 
+  // Deltas arrive over the topology stream; polling is only a safety net.
   useEffect(() => {
-    Promise.all([fetchDevices(), fetchLinks()])
-      .then(([devs, lnks]) => { setDevices(devs); setLinks(lnks); })
-      .catch(err => setError(err.message));
-  }, []);
+    load();
+    const timer = setInterval(load, POLL_MS);
+    return () => clearInterval(timer);
+  }, [load]);
 
   const byType = LEGEND.map(l => ({
     ...l,
@@ -71,7 +86,7 @@ export default function App() {
 
       {/* ── map fills remaining height ── */}
       <div style={{ flex: 1, minHeight: 0 }}>
-        <TopologyMap devices={devices} links={links} />
+        <TopologyMap devices={devices} links={links} onResync={load} />
       </div>
     </div>
   );
@@ -2,15 +2,67 @@ import axios from 'axios';
 
 const API_BASE = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
-export async function fetchDevices() {
-  const { data } = await axios.get(`${API_BASE}/api/v1/devices`);
-  return data;
+const PAGE_SIZE = 5000;
+
+// List endpoints are cursor-paginated: follow X-Next-Cursor until the last page.
+async function fetchAllPages(path, params = {}) {
+  const items = [];
+  let cursor;
+  do {
+    const { data, headers } = await axios.get(`${API_BASE}${path}`, {
+      params: { ...params, limit: PAGE_SIZE, cursor },
+    });
+    items.push(...data);
+    cursor = headers['x-next-cursor'];
+  } while (cursor);
+  return items;
 }
 
-export async function fetchLinks() {
-  const { data } = await axios.get(`${API_BASE}/api/v1/links`);
-  return data;
+export async function fetchDevices(filters = {}) {
+  return fetchAllPages('/api/v1/devices', filters);
 }
+
+export async function fetchLinks(filters = {}) {
+  return fetchAllPages('/api/v1/links', filters);
+}
+// Compact topology node/edge → the device/link shape used across the UI.
+export const nodeToDevice = n => ({
+  id:          n.id,
+  ip_address:  n.ip,
+  label:       n.label,
+  hostname:    n.hostname,
+  vendor:      n.vendor,
+  device_type: n.type,
+  status:      n.status,
+  x:           n.x,  // server-side layout; absent on live events
+  y:           n.y,
+});
+
+export const edgeToLink = e => ({
+  id:        e.id,
+  source_id: e.source,
+  target_id: e.target,
+  link_type: e.type,
+});
+
+// One request for the whole map. The browser revalidates with If-None-Match,
+// so an unchanged topology costs a 304 with an empty body.
+export async function fetchTopology() {
+  const { data } = await axios.get(`${API_BASE}/api/v1/topology`);
+  return {
+    version: data.version,
+    devices: data.nodes.map(nodeToDevice),
+    links:   data.edges.map(edgeToLink),
+  };
+}
+
+// Server-Sent Events feed of topology deltas. EventSource reconnects on its own.
+export function subscribeTopology(onEvent) {
+  const source = new EventSource(`${API_BASE}/api/v1/topology/stream`);
+  source.onmessage = msg => onEvent(JSON.parse(msg.data));
+  return () => source.close();
+}
+
 export async function createDevice(deviceData) {
   const { data } = await axios.post(`${API_BASE}/api/v1/devices`, deviceData);
   return data;
@@ -1,5 +1,6 @@
 import { useEffect, useRef } from 'react';
 import cytoscape from 'cytoscape';
+import { subscribeTopology, nodeToDevice, edgeToLink } from '../api/devices';
 
 // ── SVG node icons ────────────────────────────────────────────────────────────
 const icon = (svg) =>
@@ -170,7 +171,52 @@ function makeNodeStyle(type) {
   };
 }
 
-export default function TopologyMap({ devices = [], links = [] }) {
+function nodeData(d) {
+  return {
+    id:     d.id,
+    label:  smartLabel(d),
+    type:   d.device_type || 'unknown',
+    ip:     d.ip_address,
+    vendor: d.vendor || '',
+    status: d.status || 'unknown',
+    parent: `grp-${d.device_type || 'unknown'}`,
+  };
+}
+
+function edgeData(l) {
+  return { id: l.id, source: l.source_id, target: l.target_id, type: l.link_type || 'ethernet' };
+}
+
+// Apply one delta from the topology feed in place — no re-layout of the graph.
+function applyEvent(cy, event, onResync) {
+  const el = cy.getElementById(event.id);
+  if (event.kind === 'topology') {
+    onResync?.();
+  } else if (event.op === 'delete') {
+    el.remove();
+  } else if (event.kind === 'device' && event.op === 'status') {
+    el.data('status', event.status);
+  } else if (event.kind === 'device') {
+    const data = nodeData(nodeToDevice(event.node));
+    if (el.empty()) {
+      const group = cy.getElementById(data.parent);
+      const c = group.nonempty() ? group.boundingBox() : cy.extent();
+      cy.add({ group: 'nodes', data, position: { x: (c.x1 + c.x2) / 2, y: (c.y1 + c.y2) / 2 } });
+    } else {
+      const { parent, ...rest } = data;  // parent can only change through move()
+      if (el.data('parent') !== parent) el.move({ parent });
+      el.data(rest);
+    }
+  } else if (event.kind === 'link') {
+    const data = edgeData(edgeToLink(event.edge));
+    if (el.nonempty()) el.data(data);
+    else if (cy.getElementById(data.source).nonempty() && cy.getElementById(data.target).nonempty()) {
+      cy.add({ group: 'edges', data });
+    }
+  }
+}
+
+export default function TopologyMap({ devices = [], links = [], onResync }) {
   const containerRef = useRef(null);
   const cyRef        = useRef(null);
 
@@ -183,20 +229,13 @@ export default function TopologyMap({ devices = [], links = [] }) {
     }));
 
     const nodes = devices.map(d => ({
-      data: {
-        id:     d.id,
-        label:  smartLabel(d),
-        type:   d.device_type || 'unknown',
-        ip:     d.ip_address,
-        vendor: d.vendor || '',
-        status: d.status || 'unknown',
-        parent: `grp-${d.device_type || 'unknown'}`,
-      },
-    }));
-
-    const edges = links.map(l => ({
-      data: { id: l.id, source: l.source_id, target: l.target_id, type: l.link_type || 'ethernet' },
+      data: nodeData(d),
+      ...(d.x != null && { position: { x: d.x, y: d.y } }),
     }));
+    const edges = links.map(l => ({ data: edgeData(l) }));
+    // Positions come from the backend layout (GET /topology); running cose in
+    // the browser froze the page for seconds on large networks.
+    const positioned = devices.every(d => d.x != null);
 
     cyRef.current = cytoscape({
       container: containerRef.current,
@@ -242,7 +281,7 @@ export default function TopologyMap({ devices = [], links = [] }) {
           style: makeNodeStyle(type),
         })),
         {
-          selector: 'node[status="down"]',
+          selector: 'node[status="down"], node[status="unreachable"]',
           style: {
             'border-color':       '#e74c3c',
             'border-width':        3,
@@ -250,6 +289,15 @@ export default function TopologyMap({ devices = [], links = [] }) {
             'background-blacken':  0.35,
           },
         },
+        {
+          selector: 'node[status="flapping"]',
+          style: {
+            'border-color':   '#e67e22',
+            'border-width':    3,
+            'border-style':   'dashed',
+            'border-opacity':  1,
+          },
+        },
         {
           selector: 'node:childless:selected',
           style: { 'border-color': '#f1c40f', 'border-width': 3, 'border-opacity': 1 },
@@ -268,7 +316,7 @@ export default function TopologyMap({ devices = [], links = [] }) {
           style: { 'line-color': '#f1c40f', 'line-opacity': 1, width: 2.5 },
         },
       ],
-      layout: {
+      layout: positioned ? { name: 'preset', fit: true, padding: 30 } : {
         name:            'cose',
         animate:         false,
         nodeRepulsion:   8000,
@@ -293,6 +341,10 @@ export default function TopologyMap({ devices = [], links = [] }) {
     return () => cyRef.current?.destroy();
   }, [devices, links]);
 
+  useEffect(() => subscribeTopology(event => {
+    if (cyRef.current) applyEvent(cyRef.current, event, onResync);
+  }), [onResync]);
+
   return (
     <div
       ref={containerRef}
@@ -0,0 +1,108 @@
+"""
+Benchmark: device type classification over synthetic hosts.
+
+Compares the previous hard-coded substring chain with the compiled rule
+table (device_classifier.classify_many), cold cache and warm cache.
+--extra-rules N appends N vendor rules that never match, to both the table
+and a chain-style loop, to show how each scales as the vendor list grows.
+
+Run:
+  cd source/network-core/backend
+  python ../tests/benchmarks/bench_classifier.py --hosts 100000 --extra-rules 500
+"""
+import json
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "backend"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.device_classifier import RULES_PATH, DeviceClassifier  # noqa: E402
+from synthetic import PORTS, VENDORS, host_mac  # noqa: E402
+
+
+def legacy_guess_device_type(vendor: str, ports: list[int]) -> str:
+    """The substring chain the rule table replaced, kept as the baseline."""
+    vendor_lower = (vendor or "").lower()
+    if "proxmox" in vendor_lower:
+        return "server"
+    if "ugreen" in vendor_lower:
+        return "nas"
+    if "hewlett" in vendor_lower or "hp" in vendor_lower:
+        return "server"
+    if "routerboard" in vendor_lower or "mikrotik" in vendor_lower:
+        return "router"
+    if "asus" in vendor_lower or "tp-link" in vendor_lower:
+        return "router"
+    if "espressif" in vendor_lower or "tuya" in vendor_lower or "broadlink" in vendor_lower:
+        return "iot"
+    if 80 in ports or 443 in ports or 8080 in ports or 8443 in ports:
+        return "network"
+    return "unknown"
+
+
+def chain_classifier(rules: dict):
+    """A chain of substring checks over every vendor rule, like the old code grown to N rules."""
+    chain = [(rule["pattern"].split("|"), rule["type"]) for rule in rules["vendors"]]
+    port_rule = rules["ports"][0]
+
+    def classify(vendor: str | None, ports: list[int]) -> str:
+        vendor_lower = (vendor or "").lower()
+        for needles, device_type in chain:
+            for needle in needles:
+                if needle in vendor_lower:
+                    return device_type
+        if not port_rule_ports.isdisjoint(ports):
+            return port_rule["type"]
+        return "unknown"
+
+    port_rule_ports = frozenset(port_rule["any"])
+    return classify
+
+
+def synthetic_hosts(count: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [
+        {"vendor": rng.choice(VENDORS), "open_ports": rng.sample(PORTS, rng.randint(0, 4)), "mac_address": host_mac(i)}
+        for i in range(count)
+    ]
+
+
+def timed(fn) -> tuple[float, list[str]]:
+    t0 = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - t0, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=100_000)
+    parser.add_argument("--extra-rules", type=int, default=0, help="non-matching vendor rules to append")
+    args = parser.parse_args()
+
+    hosts = synthetic_hosts(args.hosts)
+    rules = json.loads(RULES_PATH.read_text())
+    rules["vendors"] += [{"pattern": f"vendor-{i:05d}", "type": "server"} for i in range(args.extra_rules)]
+    classifier = DeviceClassifier(rules)
+    chain = chain_classifier(rules)
+
+    legacy_s, expected = timed(lambda: [legacy_guess_device_type(h["vendor"], h["open_ports"]) for h in hosts])
+    chain_s, chained = timed(lambda: [chain(h["vendor"], h["open_ports"]) for h in hosts])
+    cold_s, cold = timed(lambda: classifier.classify_many(hosts))
+    warm_s, warm = timed(lambda: classifier.classify_many(hosts))
+    assert cold == warm == chained == expected, "rule table disagrees with the legacy chain"
+
+    print(f"{args.hosts} hosts, {len(rules['vendors'])} vendor rules, "
+          f"{classifier.misses} distinct (vendor, port signature) keys\n")
+    print(f"{'variant':<16} {'seconds':>8} {'hosts/s':>11}")
+    for name, seconds in (
+        ("legacy chain", legacy_s), ("chain, N rules", chain_s), ("rules (cold)", cold_s), ("rules (warm)", warm_s),
+    ):
+        print(f"{name:<16} {seconds:>8.3f} {args.hosts / seconds:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Benchmark: topology graph index — build time and per-query latency.
+
+Synthetic network: --routers core routers in a ring, a switch tree below
+each, hosts on the switches, plus random cross links, --edges in total.
+
+Run:
+  cd source/network-core/backend
+  python ../tests/benchmarks/bench_graph.py --edges 100000
+"""
+import argparse
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "backend"))
+
+from app.services.graph_service import TopologyGraph  # noqa: E402
+
+
+def synthetic_topology(edges: int, routers: int, seed: int = 0):
+    rng = random.Random(seed)
+    devices = [(f"r{i:04d}", "router") for i in range(routers)]
+    links = [(f"r{i:04d}", f"r{(i + 1) % routers:04d}") for i in range(routers)]
+    nodes = [d for d, _ in devices]
+    i = 0
+    while len(links) < edges * 0.9:
+        device_id = f"d{i:07d}"
+        devices.append((device_id, "network" if i % 20 == 0 else "server"))
+        # Attach to a recent node, so the graph is a deep-ish tree with local fan-out.
+        links.append((rng.choice(nodes[-200:] if i % 50 else nodes[:routers]), device_id))
+        nodes.append(device_id)
+        i += 1
+    while len(links) < edges:
+        links.append(tuple(rng.sample(nodes, 2)))
+    return devices, links, rng
+
+
+def timed_ms(fn, samples) -> tuple[float, float]:
+    times = []
+    for sample in samples:
+        t0 = time.perf_counter()
+        fn(*sample)
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return statistics.median(times), times[int(len(times) * 0.95)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--edges", type=int, default=100_000)
+    parser.add_argument("--routers", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    devices, links, rng = synthetic_topology(args.edges, args.routers)
+    t0 = time.perf_counter()
+    graph = TopologyGraph(devices, links)
+    build_s = time.perf_counter() - t0
+    print(f"{len(graph)} devices, {graph.edge_count} edges, index built in {build_s:.2f} s\n")
+
+    ids = graph.ids
+    pairs = [tuple(rng.sample(ids, 2)) for _ in range(args.queries)]
+    singles = [(rng.choice(ids),) for _ in range(args.queries)]
+    print(f"{'query':<16} {'p50 ms':>8} {'p95 ms':>8}")
+    for name, fn, samples in (
+        ("shortest_path", graph.shortest_path, pairs),
+        ("blast_radius", graph.blast_radius, singles),
+        ("components", lambda: graph.components(), [()] * args.queries),
+    ):
+        p50, p95 = timed_ms(fn, samples)
+        print(f"{name:<16} {p50:>8.3f} {p95:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
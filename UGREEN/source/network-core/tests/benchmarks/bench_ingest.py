@@ -0,0 +1,57 @@
+"""
+Benchmark: parsing and merging a directory of per-subnet nmap scans.
+
+Writes --files synthetic scans (disjoint host ranges, plus one overlapping
+re-scan) and times parse_scan_files + merge_scans with 1..--workers
+processes. Database writes are left out — see bench_import.py.
+
+Run:
+  cd source/network-core/backend
+  python ../tests/benchmarks/bench_ingest.py --files 32 --hosts 5000 --workers 8
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "backend"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import nmap_service  # noqa: E402
+from synthetic import write_nmap_xml  # noqa: E402
+
+
+async def run(directory: Path, workers: int) -> tuple[float, int]:
+    t0 = time.perf_counter()
+    results = await nmap_service.parse_scan_files(nmap_service.discover_scan_files(directory), workers)
+    merged = nmap_service.merge_scans(results)
+    return time.perf_counter() - t0, len(merged)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--files", type=int, default=32)
+    parser.add_argument("--hosts", type=int, default=5000, help="hosts per file")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        for i in range(args.files):
+            write_nmap_xml(directory / f"subnet-{i:03d}.xml", args.hosts, seed=i, first=i * args.hosts)
+        # A later re-scan of the first subnet exercises last-scan-wins.
+        write_nmap_xml(directory / "rescan.xml", args.hosts, seed=99, start=1772199999)
+        total = (args.files + 1) * args.hosts
+        print(f"{args.files + 1} files, {total} host entries\n")
+        print(f"{'workers':>7}  {'seconds':>8}  {'hosts/s':>9}  {'merged':>8}")
+        counts = sorted({1, 2, 4, 8, args.workers} & set(range(1, args.workers + 1)))
+        for workers in counts:
+            elapsed, merged = asyncio.run(run(directory, workers))
+            print(f"{workers:>7}  {elapsed:>8.2f}  {total / elapsed:>9.0f}  {merged:>8}")
+
+
+if __name__ == "__main__":
+    main()
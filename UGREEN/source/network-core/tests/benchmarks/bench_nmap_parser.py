@@ -0,0 +1,71 @@
+"""
+Benchmark: tree-based vs streaming (iterparse) nmap XML parsers.
+
+Reports peak Python heap (tracemalloc) and hosts/sec for parse_top200 /
+iter_top200 and parse_host_discovery / iter_host_discovery on a synthetic
+scan file.
+
+Run:
+  cd source/network-core/backend
+  python ../tests/benchmarks/bench_nmap_parser.py --hosts 50000
+"""
+import argparse
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "backend"))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services import nmap_service  # noqa: E402
+from synthetic import write_nmap_xml  # noqa: E402
+
+
+def drain(fn, path: Path) -> int:
+    """Run `fn` over `path` and return the number of hosts it produced."""
+    result = fn(path)
+    if isinstance(result, list):
+        return len(result)
+    # Drain the generator without keeping the dicts alive.
+    count = 0
+    for _ in result:
+        count += 1
+    return count
+
+
+def measure(fn, path: Path) -> tuple[int, float, float]:
+    """
+    Return (hosts, seconds, peak MiB) for `fn` over `path`.
+
+    Timing and memory are taken in separate passes because tracemalloc
+    slows allocation-heavy code down considerably.
+    """
+    t0 = time.perf_counter()
+    count = drain(fn, path)
+    elapsed = time.perf_counter() - t0
+    tracemalloc.start()
+    drain(fn, path)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return count, elapsed, peak / (1024 * 1024)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--hosts", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_nmap_xml(Path(tmp) / "scan.xml", args.hosts)
+        size_mib = path.stat().st_size / (1024 * 1024)
+        print(f"synthetic scan: {args.hosts} hosts, {size_mib:.1f} MiB\n")
+        print(f"{'parser':<22} {'hosts':>8} {'seconds':>9} {'hosts/s':>10} {'peak MiB':>10}")
+        for name in ("parse_top200", "iter_top200", "parse_host_discovery", "iter_host_discovery"):
+            count, elapsed, peak = measure(getattr(nmap_service, name), path)
+            print(f"{name:<22} {count:>8} {elapsed:>9.3f} {count / elapsed:>10.0f} {peak:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark: devices/sec for each ping backend in worker/icmp.py.
+
+Probes the same target list once per backend and reports throughput and
+reply count. The default target is loopback repeated --devices times; pass
+--cidr to sweep a real network (needs permission to ping it).
+
+Run:
+  cd source/network-core/worker
+  python ../tests/benchmarks/bench_ping_backends.py --devices 2000
+  python ../tests/benchmarks/bench_ping_backends.py --cidr 192.168.0.0/24 --timeout 1
+"""
+import argparse
+import asyncio
+import ipaddress
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parents[2] / "worker"))
+
+from icmp import IcmpSocketBackend, SubprocessBackend  # noqa: E402
+
+
+async def run(targets: list[str], args) -> None:
+    options = dict(concurrency=args.concurrency, rate=args.rate, timeout=args.timeout)
+    print(f"{len(targets)} targets, concurrency {args.concurrency}, rate {args.rate:g}/s\n")
+    print(f"{'backend':<12} {'seconds':>9} {'devices/s':>10} {'replies':>8}")
+    for name in args.backends:
+        if name == "icmp":
+            try:
+                backend = IcmpSocketBackend(**options).open()
+            except OSError as exc:
+                print(f"{name:<12} skipped: {exc}")
+                continue
+        else:
+            backend = SubprocessBackend(**options)
+        t0 = time.perf_counter()
+        results = await backend.ping_many(targets)
+        elapsed = time.perf_counter() - t0
+        await backend.close()
+        replies = sum(r is not None for r in results)
+        print(f"{name:<12} {elapsed:>9.2f} {len(targets) / elapsed:>10.0f} {replies:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--devices", type=int, default=1000)
+    parser.add_argument("--cidr", help="probe every host address in this network instead of loopback")
+    parser.add_argument("--concurrency", type=int, default=256)
+    parser.add_argument("--rate", type=float, default=0, help="probes/sec, 0 = unlimited")
+    parser.add_argument("--timeout", type=float, default=2.0)
+    parser.add_argument("--backends", nargs="+", default=["icmp", "subprocess"])
+    args = parser.parse_args()
+    if args.cidr:
+        targets = [str(ip) for ip in ipaddress.ip_network(args.cidr, strict=False).hosts()]
+    else:
+        targets = ["127.0.0.1"] * args.devices
+    asyncio.run(run(targets, args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Synthetic data generators shared by the benchmark scripts.
+
+Everything is deterministic for a given seed so numbers stay comparable
+between runs and commits.
+"""
+import random
+from pathlib import Path
+
+VENDORS = [
+    "Proxmox Server Solutions GmbH",
+    "Hewlett Packard",
+    "Routerboard.com",
+    "TP-LINK TECHNOLOGIES CO.,LTD.",
+    "ASUSTek COMPUTER INC.",
+    "Espressif Inc.",
+    "Tuya Smart Inc.",
+    "UGREEN Group Limited",
+    "Raspberry Pi Trading Ltd",
+    None,
+]
+PORTS = [22, 53, 80, 139, 443, 445, 554, 1883, 3389, 5000, 8006, 8080, 8443, 9000]
+
+
+def host_ip(i: int) -> str:
+    """Map a host index onto a unique address in 10.0.0.0/8."""
+    return f"10.{(i >> 16) & 0xFF}.{(i >> 8) & 0xFF}.{i & 0xFF}"
+
+
+def host_mac(i: int) -> str:
+    return "02:00:" + ":".join(f"{(i >> s) & 0xFF:02X}" for s in (24, 16, 8, 0))
+
+
+def write_nmap_xml(
+    path: Path, hosts: int, *, ports: bool = True, seed: int = 0, start: int = 1772190000, first: int = 0,
+) -> Path:
+    """
+    Write an nmap-style XML file with `hosts` <host> elements (plus one
+    <hosthint> per host, like real top-200 output) and return its path.
+    Hosts are numbered from `first`, so several files can cover disjoint ranges.
+    """
+    rng = random.Random(seed)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(f'<?xml version="1.0"?>\n<nmaprun scanner="nmap" start="{start}">\n')
+        for i in range(first, first + hosts):
+            ip = host_ip(i)
+            vendor = rng.choice(VENDORS)
+            vendor_attr = f' vendor="{vendor}"' if vendor else ""
+            fh.write(f'<hosthint><status state="up"/><address addr="{ip}" addrtype="ipv4"/></hosthint>\n')
+            fh.write('<host><status state="up" reason="arp-response"/>\n')
+            fh.write(f'<address addr="{ip}" addrtype="ipv4"/>\n')
+            fh.write(f'<address addr="{host_mac(i)}" addrtype="mac"{vendor_attr}/>\n')
+            fh.write(f'<hostnames><hostname name="host{i}.lan" type="PTR"/></hostnames>\n')
+            if ports:
+                fh.write("<ports>\n")
+                for port in rng.sample(PORTS, 4):
+                    state = "open" if rng.random() < 0.5 else "closed"
+                    fh.write(
+                        f'<port protocol="tcp" portid="{port}"><state state="{state}" reason="syn-ack"/>'
+                        f'<service name="unknown" method="table" conf="3"/></port>\n'
+                    )
+                fh.write("</ports>\n")
+            fh.write("</host>\n")
+        fh.write(f'<runstats><finished time="{start + 60}"/><hosts up="{hosts}" down="0" total="{hosts}"/></runstats>\n')
+        fh.write("</nmaprun>\n")
+    return path
@@ -4,7 +4,8 @@ from httpx import AsyncClient, ASGITransport
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from app.main import app
 from app.models.base import Base
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
+from app.services import events, read_cache
 
 TEST_DB_URL = "sqlite+aiosqlite:///:memory:"
 
@@ -15,6 +16,7 @@ async def db_session():
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     session_factory = async_sessionmaker(engine, expire_on_commit=False)
+    read_cache.on_event(events.RELOAD)  # new database: nothing cached is valid
     async with session_factory() as session:
         yield session
     await engine.dispose()
@@ -26,6 +28,7 @@ async def client(db_session):
         yield db_session
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
         yield c
     app.dependency_overrides.clear()
@@ -0,0 +1,130 @@
+import json
+import pytest
+
+NDJSON = {"Content-Type": "application/x-ndjson"}
+
+
+async def _create(client, ips):
+    resp = await client.post("/api/v1/devices/bulk", json=[{"ip_address": ip} for ip in ips])
+    assert resp.status_code == 200
+    return [r["id"] for r in resp.json()["results"]]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_reports_each_item(client):
+    existing = await client.post("/api/v1/devices", json={"ip_address": "10.1.0.1"})
+    resp = await client.post("/api/v1/devices/bulk", json=[
+        {"ip_address": "10.1.0.2", "device_type": "router"},
+        {"ip_address": "10.1.0.1"},
+        {"ip_address": "not-an-ip"},
+        {"ip_address": "10.1.0.2"},
+    ])
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["counts"] == {"created": 1, "exists": 2, "invalid": 1}
+    results = body["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert [r["status"] for r in results] == ["created", "exists", "invalid", "exists"]
+    assert results[1]["id"] == existing.json()["id"]
+    assert results[3]["id"] == results[0]["id"]
+    assert results[2]["error"].startswith("ip_address")
+
+    listed = (await client.get("/api/v1/devices")).json()
+    assert sorted(d["ip_address"] for d in listed) == ["10.1.0.1", "10.1.0.2"]
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_accepts_ndjson(client):
+    lines = [json.dumps({"ip_address": f"10.2.0.{i}"}) for i in range(1, 4)]
+    body = "\n".join(lines[:2] + ["{broken", "", lines[2]]) + "\n"
+    resp = await client.post("/api/v1/devices/bulk", content=body, headers=NDJSON)
+    assert resp.status_code == 200
+    assert resp.json()["counts"] == {"created": 3, "invalid": 1}
+    assert resp.json()["results"][2] == {"index": 2, "status": "invalid", "id": None, "error": "Invalid JSON"}
+
+
+@pytest.mark.asyncio
+async def test_bulk_body_must_be_a_list(client):
+    resp = await client.post("/api/v1/devices/bulk", json={"ip_address": "10.3.0.1"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_patch_devices(client):
+    a, b = await _create(client, ["10.4.0.1", "10.4.0.2"])
+    resp = await client.patch("/api/v1/devices/bulk", json=[
+        {"id": a, "label": "core"},
+        {"id": b, "device_type": "nas", "hostname": "store"},
+        {"id": "missing", "label": "x"},
+        {"id": a, "device_type": "router"},
+    ])
+    assert resp.status_code == 200
+    assert [r["status"] for r in resp.json()["results"]] == ["updated", "updated", "not_found", "updated"]
+
+    first = (await client.get(f"/api/v1/devices/{a}")).json()
+    second = (await client.get(f"/api/v1/devices/{b}")).json()
+    assert (first["label"], first["device_type"]) == ("core", "router")
+    assert (second["hostname"], second["device_type"], second["label"]) == ("store", "nas", None)
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_devices_by_ids_removes_their_links(client):
+    a, b, c = await _create(client, ["10.5.0.1", "10.5.0.2", "10.5.0.3"])
+    await client.post("/api/v1/links/bulk", json=[
+        {"source_id": a, "target_id": b}, {"source_id": b, "target_id": c},
+    ])
+    resp = await client.post("/api/v1/devices/bulk/delete", json={"ids": [b, "missing"]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["counts"] == {"deleted": 1, "not_found": 1, "links_deleted": 2}
+    assert (await client.get("/api/v1/links")).json() == []
+    assert len((await client.get("/api/v1/devices")).json()) == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_delete_devices_by_filter(client):
+    await client.post("/api/v1/devices/bulk", json=[
+        {"ip_address": "10.6.0.1", "device_type": "iot"},
+        {"ip_address": "10.6.0.2", "device_type": "iot"},
+        {"ip_address": "10.6.0.3", "device_type": "server"},
+    ])
+    resp = await client.post("/api/v1/devices/bulk/delete", json={"filter": {"device_type": ["iot"]}})
+    assert resp.status_code == 200
+    assert resp.json()["counts"] == {"deleted": 2, "links_deleted": 0}
+    assert all(r["index"] is None for r in resp.json()["results"])
+    remaining = (await client.get("/api/v1/devices")).json()
+    assert [d["device_type"] for d in remaining] == ["server"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [{}, {"filter": {}}, {"ids": ["x"], "filter": {"vendor": "a"}}])
+async def test_bulk_delete_needs_ids_or_filter(client, body):
+    resp = await client.post("/api/v1/devices/bulk/delete", json=body)
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_links_lifecycle(client):
+    a, b, c = await _create(client, ["10.7.0.1", "10.7.0.2", "10.7.0.3"])
+    resp = await client.post("/api/v1/links/bulk", json=[
+        {"source_id": a, "target_id": b},
+        {"source_id": a, "target_id": "ghost"},
+        {"source_id": a, "target_id": b},
+        {"source_id": b, "target_id": c, "link_type": "wifi"},
+        {"source_id": a},
+    ])
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == ["created", "unknown_device", "exists", "created", "invalid"]
+    assert results[2]["id"] == results[0]["id"]
+
+    ab, bc = results[0]["id"], results[3]["id"]
+    resp = await client.patch("/api/v1/links/bulk", json=[{"id": ab, "link_type": "fiber"}, {"id": "nope"}])
+    assert [r["status"] for r in resp.json()["results"]] == ["updated", "not_found"]
+    links = {link["id"]: link for link in (await client.get("/api/v1/links")).json()}
+    assert links[ab]["link_type"] == "fiber"
+
+    resp = await client.post("/api/v1/links/bulk/delete", json={"filter": {"link_type": "wifi"}})
+    assert resp.json()["counts"] == {"deleted": 1}
+    assert resp.json()["results"][0]["id"] == bc
+    assert [link["id"] for link in (await client.get("/api/v1/links")).json()] == [ab]
@@ -59,3 +59,53 @@ async def test_get_device_by_id(client):
 async def test_get_device_by_id_not_found(client):
     resp = await client.get("/api/v1/devices/nonexistent-id")
     assert resp.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_create_device_rejects_invalid_ip(client):
+    resp = await client.post("/api/v1/devices", json={"ip_address": "not-an-ip"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_devices_cursor_pagination(client):
+    for i in range(5):
+        await client.post("/api/v1/devices", json={"ip_address": f"10.20.0.{i}"})
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = await client.get("/api/v1/devices", params=params)
+        assert resp.status_code == 200
+        assert len(resp.json()) <= 2
+        seen += [d["id"] for d in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+    assert len(seen) == 5
+    assert seen == sorted(seen)
+
+
+@pytest.mark.asyncio
+async def test_list_devices_filters(client):
+    await client.post("/api/v1/devices", json={"ip_address": "10.30.1.1", "device_type": "router", "vendor": "MikroTik"})
+    await client.post("/api/v1/devices", json={"ip_address": "10.30.2.1", "device_type": "iot", "vendor": "Espressif Inc."})
+    await client.post("/api/v1/devices", json={"ip_address": "10.31.0.1", "device_type": "iot", "vendor": "Tuya"})
+
+    def ips(resp):
+        return sorted(d["ip_address"] for d in resp.json())
+
+    assert ips(await client.get("/api/v1/devices", params={"device_type": "iot"})) == ["10.30.2.1", "10.31.0.1"]
+    assert ips(await client.get("/api/v1/devices", params={"vendor": "mikro"})) == ["10.30.1.1"]
+    assert ips(await client.get("/api/v1/devices", params={"cidr": "10.30.0.0/16"})) == ["10.30.1.1", "10.30.2.1"]
+    assert ips(await client.get("/api/v1/devices", params={"status": "alive"})) == []
+    resp = await client.get("/api/v1/devices", params={"cidr": "bogus"})
+    assert resp.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_list_devices_matches_read_schema(client):
+    create = await client.post("/api/v1/devices", json={"ip_address": "10.40.0.1", "vendor": "Zażółć GmbH"})
+    patched = await client.patch(f"/api/v1/devices/{create.json()['id']}", json={"label": "rack 1"})
+    listed = (await client.get("/api/v1/devices")).json()
+    assert listed == [patched.json()]
@@ -0,0 +1,145 @@
+import asyncio
+from datetime import timedelta
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from app.models.discovery_job import DiscoveryJob
+from app.services import discovery_service, nmap_service
+
+SCAN_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" start="1772190000">
+<host><status state="up"/>
+<address addr="10.8.0.1" addrtype="ipv4"/>
+<address addr="AA:BB:CC:00:08:01" addrtype="mac" vendor="Routerboard.com"/>
+</host>
+<host><status state="up"/><address addr="10.8.0.2" addrtype="ipv4"/></host>
+<host><status state="up"/><address addr="10.8.0.3" addrtype="ipv4"/></host>
+</nmaprun>
+"""
+
+
+@pytest_asyncio.fixture
+async def jobs(db_session, tmp_path, monkeypatch):
+    """Runs discovery jobs against the test database and a temporary scan dir."""
+    (tmp_path / "subnet-8.xml").write_text(SCAN_XML)
+    monkeypatch.setattr(nmap_service, "NMAP_DIR", tmp_path)
+    monkeypatch.setattr(
+        discovery_service, "session_factory", async_sessionmaker(db_session.bind, expire_on_commit=False)
+    )
+    yield
+    await discovery_service.shutdown()
+
+
+async def wait_for_job(client, job_id: str) -> dict:
+    for _ in range(200):
+        job = (await client.get(f"/api/v1/discovery/jobs/{job_id}")).json()
+        if job["state"] in ("succeeded", "failed"):
+            return job
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"job {job_id} did not finish: {job}")
+
+
+@pytest.mark.asyncio
+async def test_run_returns_job_that_completes_with_counters(client, jobs):
+    resp = await client.post("/api/v1/discovery/run")
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["status"] == "discovery started"
+
+    job = await wait_for_job(client, body["job_id"])
+    assert job["state"] == "succeeded"
+    assert job["progress"] == 1.0
+    assert job["files_total"] == 1
+    assert job["files_parsed"] == 1
+    assert job["hosts_total"] == 3
+    assert (job["inserted"], job["updated"], job["unchanged"]) == (3, 0, 0)
+    assert job["links_created"] == 2
+    assert job["started_at"] and job["finished_at"]
+
+    devices = (await client.get("/api/v1/devices")).json()
+    assert len(devices) == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_triggers_attach_to_running_job(client, jobs, monkeypatch):
+    release = asyncio.Event()
+
+    async def slow_import(db, progress=None):
+        await release.wait()
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    monkeypatch.setattr(nmap_service, "import_from_files", slow_import)
+    first, second = await asyncio.gather(
+        client.post("/api/v1/discovery/run"), client.post("/api/v1/discovery/run")
+    )
+    ids = {first.json()["job_id"], second.json()["job_id"]}
+    assert len(ids) == 1
+    assert sorted(r.json()["status"] for r in (first, second)) == [
+        "discovery already running", "discovery started",
+    ]
+
+    release.set()
+    job = await wait_for_job(client, ids.pop())
+    assert job["state"] == "succeeded"
+
+    # Once finished, the next trigger starts a new job.
+    resp = await client.post("/api/v1/discovery/run")
+    assert resp.json()["status"] == "discovery started"
+    await wait_for_job(client, resp.json()["job_id"])
+
+
+@pytest.mark.asyncio
+async def test_failed_import_marks_job_failed(client, jobs, monkeypatch):
+    async def broken_import(db, progress=None):
+        raise RuntimeError("scan dir unreadable")
+
+    monkeypatch.setattr(nmap_service, "import_from_files", broken_import)
+    resp = await client.post("/api/v1/discovery/run")
+    job = await wait_for_job(client, resp.json()["job_id"])
+    assert job["state"] == "failed"
+    assert job["error"] == "scan dir unreadable"
+
+
+@pytest.mark.asyncio
+async def test_long_step_keeps_heartbeat(client, jobs, monkeypatch):
+    release = asyncio.Event()
+
+    async def silent_import(db, progress=None):
+        await release.wait()
+        return {"inserted": 0, "updated": 0, "unchanged": 0}
+
+    monkeypatch.setattr(nmap_service, "import_from_files", silent_import)
+    monkeypatch.setattr(discovery_service, "HEARTBEAT_INTERVAL", 0.05)
+    job_id = (await client.post("/api/v1/discovery/run")).json()["job_id"]
+    await asyncio.sleep(0.05)
+    first = (await client.get(f"/api/v1/discovery/jobs/{job_id}")).json()["updated_at"]
+    await asyncio.sleep(0.2)
+    later = (await client.get(f"/api/v1/discovery/jobs/{job_id}")).json()
+    assert later["state"] == "running"
+    assert later["updated_at"] > first
+
+    release.set()
+    assert (await wait_for_job(client, job_id))["state"] == "succeeded"
+
+
+@pytest.mark.asyncio
+async def test_stale_active_job_is_replaced(client, db_session, jobs):
+    stale_at = discovery_service._utcnow() - discovery_service.STALE_AFTER - timedelta(seconds=1)
+    db_session.add(DiscoveryJob(id="stale", state="running", created_at=stale_at, updated_at=stale_at))
+    await db_session.commit()
+
+    resp = await client.post("/api/v1/discovery/run")
+    assert resp.json()["status"] == "discovery started"
+    assert resp.json()["job_id"] != "stale"
+    await wait_for_job(client, resp.json()["job_id"])
+
+    stale = (await client.get("/api/v1/discovery/jobs/stale")).json()
+    assert stale["state"] == "failed"
+    listed = (await client.get("/api/v1/discovery/jobs")).json()
+    assert {j["id"] for j in listed} == {"stale", resp.json()["job_id"]}
+
+
+@pytest.mark.asyncio
+async def test_unknown_job_returns_404(client):
+    resp = await client.get("/api/v1/discovery/jobs/nope")
+    assert resp.status_code == 404
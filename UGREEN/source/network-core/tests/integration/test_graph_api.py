@@ -0,0 +1,64 @@
+import pytest
+from app.services.graph_service import graph_index
+
+
+@pytest.fixture(autouse=True)
+def fresh_index():
+    # The index is process-wide; every test has its own database.
+    graph_index.invalidate()
+    yield
+    graph_index.invalidate()
+
+
+async def _device(client, ip, device_type="server"):
+    return (await client.post("/api/v1/devices", json={"ip_address": ip, "device_type": device_type})).json()["id"]
+
+
+async def _link(client, a, b):
+    return (await client.post("/api/v1/links", json={"source_id": a, "target_id": b})).json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_path_blast_radius_and_components(client):
+    router = await _device(client, "10.6.0.1", "router")
+    switch = await _device(client, "10.6.0.2", "network")
+    host = await _device(client, "10.6.0.3")
+    lone = await _device(client, "10.6.0.4")
+    await _link(client, router, switch)
+    await _link(client, switch, host)
+
+    resp = await client.get("/api/v1/topology/path", params={"source": host, "target": router})
+    assert resp.json() == {"source": host, "target": router, "hops": 2, "path": [host, switch, router]}
+
+    resp = await client.get("/api/v1/topology/path", params={"source": host, "target": lone})
+    assert resp.json()["path"] == [] and resp.json()["hops"] is None
+
+    resp = await client.get(f"/api/v1/topology/blast-radius/{switch}")
+    assert resp.json() == {"device_id": switch, "count": 1, "devices": [host]}
+
+    resp = await client.get("/api/v1/topology/components")
+    assert [c["size"] for c in resp.json()["components"]] == [3, 1]
+    resp = await client.get("/api/v1/topology/components", params={"min_size": 2})
+    assert resp.json()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_index_follows_link_changes(client):
+    router = await _device(client, "10.6.1.1", "router")
+    host = await _device(client, "10.6.1.2")
+    params = {"source": router, "target": host}
+    assert (await client.get("/api/v1/topology/path", params=params)).json()["path"] == []
+
+    link = await _link(client, router, host)
+    assert (await client.get("/api/v1/topology/path", params=params)).json()["hops"] == 1
+
+    await client.delete(f"/api/v1/links/{link}")
+    assert (await client.get("/api/v1/topology/path", params=params)).json()["path"] == []
+
+
+@pytest.mark.asyncio
+async def test_unknown_device_returns_404(client):
+    device = await _device(client, "10.6.2.1")
+    resp = await client.get("/api/v1/topology/path", params={"source": device, "target": "nope"})
+    assert resp.status_code == 404
+    assert (await client.get("/api/v1/topology/blast-radius/nope")).status_code == 404
@@ -0,0 +1,97 @@
+import os
+import pytest
+from sqlalchemy import select
+from app.models.device import Device
+from app.models.ingest import IngestFile, IngestHost
+from app.services import device_service, nmap_service
+
+SCAN_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" start="{start}">
+<host><status state="up"/>
+<address addr="10.9.0.1" addrtype="ipv4"/>
+<address addr="AA:BB:CC:00:09:01" addrtype="mac" vendor="{vendor}"/>
+</host>
+<host><status state="up"/><address addr="10.9.0.2" addrtype="ipv4"/></host>
+<host><status state="up"/><address addr="10.9.0.3" addrtype="ipv4"/></host>
+</nmaprun>
+"""
+
+
+@pytest.fixture
+def scan_dir(tmp_path, monkeypatch):
+    (tmp_path / "subnet-9.xml").write_text(SCAN_XML.format(start=1772190000, vendor="Espressif Inc."))
+    monkeypatch.setattr(nmap_service, "NMAP_DIR", tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def spy(monkeypatch):
+    """Records the files parsed and the hosts sent to the device upsert."""
+    calls = {"parsed": [], "upserted": []}
+    parse = nmap_service.parse_scan_file
+    upsert = device_service.bulk_upsert_devices
+
+    def parse_spy(path):
+        calls["parsed"].append(os.path.basename(path))
+        return parse(path)
+
+    async def upsert_spy(db, rows, *args, **kwargs):
+        rows = list(rows)
+        calls["upserted"].append(sorted(r["ip_address"] for r in rows))
+        return await upsert(db, rows, *args, **kwargs)
+
+    monkeypatch.setattr(nmap_service, "parse_scan_file", parse_spy)
+    monkeypatch.setattr(device_service, "bulk_upsert_devices", upsert_spy)
+    return calls
+
+
+@pytest.mark.asyncio
+async def test_unchanged_files_are_skipped(db_session, scan_dir, spy):
+    await nmap_service.import_from_files(db_session)
+    counts = await nmap_service.import_from_files(db_session)
+    assert spy["parsed"] == ["subnet-9.xml"]
+    assert spy["upserted"] == [["10.9.0.1", "10.9.0.2", "10.9.0.3"], []]
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 3}
+
+
+@pytest.mark.asyncio
+async def test_touched_file_with_same_content_is_not_parsed(db_session, scan_dir, spy):
+    await nmap_service.import_from_files(db_session)
+    path = scan_dir / "subnet-9.xml"
+    os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+    await nmap_service.import_from_files(db_session)
+    assert spy["parsed"] == ["subnet-9.xml"]
+    stored = await db_session.scalar(select(IngestFile.mtime_ns))
+    assert stored == path.stat().st_mtime_ns
+
+
+@pytest.mark.asyncio
+async def test_changed_file_sends_only_changed_hosts(db_session, scan_dir, spy):
+    await nmap_service.import_from_files(db_session)
+    (scan_dir / "subnet-9.xml").write_text(
+        SCAN_XML.format(start=1772190500, vendor="Tuya Smart Inc.").replace("10.9.0.3", "10.9.0.4")
+    )
+    counts = await nmap_service.import_from_files(db_session)
+    # 10.9.0.1 changed, 10.9.0.3 vanished from the file (re-merged, stays in devices), 10.9.0.4 is new.
+    assert spy["upserted"][-1] == ["10.9.0.1", "10.9.0.4"]
+    assert counts == {"inserted": 1, "updated": 1, "unchanged": 1}
+    hosts = await db_session.execute(select(IngestHost.ip_address))
+    assert sorted(hosts.scalars()) == ["10.9.0.1", "10.9.0.2", "10.9.0.4"]
+    devices = await db_session.execute(select(Device.ip_address))
+    assert "10.9.0.3" in devices.scalars().all()
+
+
+@pytest.mark.asyncio
+async def test_removed_file_remerges_from_remaining_scans(db_session, scan_dir, spy):
+    (scan_dir / "rescan.xml").write_text(SCAN_XML.format(start=1772199999, vendor="Tuya Smart Inc."))
+    await nmap_service.import_from_files(db_session)
+    device = await db_session.scalar(select(Device).where(Device.ip_address == "10.9.0.1"))
+    assert device.vendor == "Tuya Smart Inc."
+
+    (scan_dir / "rescan.xml").unlink()
+    await nmap_service.import_from_files(db_session)
+    assert spy["upserted"][-1] == ["10.9.0.1", "10.9.0.2", "10.9.0.3"]
+    await db_session.refresh(device)
+    assert device.vendor == "Espressif Inc."
+    files = await db_session.execute(select(IngestFile.path))
+    assert files.scalars().all() == ["subnet-9.xml"]
@@ -30,3 +30,29 @@ async def test_delete_link(client):
     })).json()
     resp = await client.delete(f"/api/v1/links/{link['id']}")
     assert resp.status_code == 204
+
+
+@pytest.mark.asyncio
+async def test_create_duplicate_link_conflict(client):
+    dev1 = (await client.post("/api/v1/devices", json={"ip_address": "10.3.0.1"})).json()
+    dev2 = (await client.post("/api/v1/devices", json={"ip_address": "10.3.0.2"})).json()
+    body = {"source_id": dev1["id"], "target_id": dev2["id"]}
+    assert (await client.post("/api/v1/links", json=body)).status_code == 201
+    resp = await client.post("/api/v1/links", json=body)
+    assert resp.status_code == 409
+    # the session is still usable after the failed insert
+    assert len((await client.get("/api/v1/links")).json()) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_links_filter_by_device(client):
+    dev1 = (await client.post("/api/v1/devices", json={"ip_address": "10.4.0.1"})).json()
+    dev2 = (await client.post("/api/v1/devices", json={"ip_address": "10.4.0.2"})).json()
+    dev3 = (await client.post("/api/v1/devices", json={"ip_address": "10.4.0.3"})).json()
+    await client.post("/api/v1/links", json={"source_id": dev1["id"], "target_id": dev2["id"]})
+    await client.post("/api/v1/links", json={"source_id": dev2["id"], "target_id": dev3["id"], "link_type": "wifi"})
+    resp = await client.get("/api/v1/links", params={"device_id": dev3["id"]})
+    assert [l["link_type"] for l in resp.json()] == ["wifi"]
+    resp = await client.get("/api/v1/links", params={"device_id": dev2["id"], "limit": 1})
+    assert len(resp.json()) == 1
+    assert "X-Next-Cursor" in resp.headers
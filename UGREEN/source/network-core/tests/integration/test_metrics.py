@@ -0,0 +1,33 @@
+import pytest
+from app import metrics
+
+
+def _sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix):
+            return float(line.rsplit(" ", 1)[1])
+    raise AssertionError(f"{prefix} not in metrics")
+
+
+@pytest.mark.asyncio
+async def test_routes_and_db_queries_are_recorded(client, db_session):
+    metrics.instrument_engine(db_session.bind, "test")
+    device_id = (await client.post("/api/v1/devices", json={"ip_address": "10.60.0.1"})).json()["id"]
+    resp = await client.get(f"/api/v1/devices/{device_id}")
+    assert resp.headers["server-timing"].startswith("db;dur=")
+
+    text = (await client.get("/metrics")).text
+    route = 'method="GET",route="/api/v1/devices/{device_id}"'
+    assert _sample(text, f"http_requests_total{{{route},status=\"200\"}}") >= 1
+    assert _sample(text, f"http_request_duration_seconds_count{{{route}}}") >= 1
+    assert _sample(text, f"http_request_db_queries_count{{{route}}}") >= 1
+    assert _sample(text, 'db_query_duration_seconds_count{engine="test"}') >= 2
+    assert _sample(text, "http_requests_in_flight") == 1  # the scrape itself
+
+
+@pytest.mark.asyncio
+async def test_unmatched_paths_share_one_label(client):
+    await client.get("/no/such/path/123")
+    text = (await client.get("/metrics")).text
+    assert 'route="unmatched",status="404"' in text
+    assert "/no/such/path/123" not in text
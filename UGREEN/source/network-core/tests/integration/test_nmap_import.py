@@ -0,0 +1,200 @@
+import pytest
+from sqlalchemy import select
+from app.models.device import Device
+from app.services import nmap_service
+
+DISCOVERY_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" start="1772190000">
+<host><status state="up"/>
+<address addr="10.5.0.1" addrtype="ipv4"/>
+<address addr="AA:BB:CC:00:00:01" addrtype="mac" vendor="Routerboard.com"/>
+</host>
+<host><status state="up"/>
+<address addr="10.5.0.2" addrtype="ipv4"/>
+<address addr="AA:BB:CC:00:00:02" addrtype="mac" vendor="Espressif Inc."/>
+<hostnames><hostname name="plug.lan" type="PTR"/></hostnames>
+</host>
+<host><status state="up"/><address addr="10.5.0.3" addrtype="ipv4"/></host>
+</nmaprun>
+"""
+
+TOP200_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" start="1772190100">
+<host><status state="up"/><address addr="10.5.0.3" addrtype="ipv4"/>
+<ports><port protocol="tcp" portid="443"><state state="open"/></port></ports>
+</host>
+</nmaprun>
+"""
+
+
+@pytest.fixture
+def nmap_dir(tmp_path, monkeypatch):
+    (tmp_path / "nmap-host-discovery.xml").write_text(DISCOVERY_XML)
+    (tmp_path / "nmap-top200.xml").write_text(TOP200_XML)
+    monkeypatch.setattr(nmap_service, "NMAP_DIR", tmp_path)
+    return tmp_path
+
+
+async def _devices_by_ip(db):
+    result = await db.execute(select(Device))
+    return {d.ip_address: d for d in result.scalars().all()}
+
+
+@pytest.mark.asyncio
+async def test_import_inserts_new_hosts(db_session, nmap_dir):
+    counts = await nmap_service.import_from_files(db_session)
+    assert counts == {"inserted": 3, "updated": 0, "unchanged": 0}
+    devices = await _devices_by_ip(db_session)
+    assert devices["10.5.0.1"].device_type == "router"
+    assert devices["10.5.0.2"].hostname == "plug.lan"
+    assert devices["10.5.0.3"].device_type == "network"
+
+
+@pytest.mark.asyncio
+async def test_reimport_reports_unchanged(db_session, nmap_dir):
+    await nmap_service.import_from_files(db_session)
+    counts = await nmap_service.import_from_files(db_session)
+    assert counts == {"inserted": 0, "updated": 0, "unchanged": 3}
+
+
+@pytest.mark.asyncio
+async def test_reimport_refreshes_changed_hosts(db_session, nmap_dir):
+    await nmap_service.import_from_files(db_session)
+    (nmap_dir / "nmap-host-discovery.xml").write_text(
+        DISCOVERY_XML.replace("Espressif Inc.", "Tuya Smart Inc.").replace(
+            '<host><status state="up"/><address addr="10.5.0.3" addrtype="ipv4"/></host>', ""
+        )
+    )
+    # Every scan file is a host source now, so drop 10.5.0.3 from the port scan too.
+    (nmap_dir / "nmap-top200.xml").write_text(TOP200_XML.replace("10.5.0.3", "10.5.0.2"))
+    counts = await nmap_service.import_from_files(db_session)
+    assert counts == {"inserted": 0, "updated": 1, "unchanged": 1}
+    db_session.expire_all()
+    devices = await _devices_by_ip(db_session)
+    assert devices["10.5.0.2"].vendor == "Tuya Smart Inc."
+    # Fields missing from the new scan keep their stored values.
+    assert devices["10.5.0.2"].hostname == "plug.lan"
+    assert "10.5.0.3" in devices
+
+
+@pytest.mark.asyncio
+async def test_auto_link_routers_is_idempotent(db_session, nmap_dir):
+    from app.models.link import Link
+
+    await nmap_service.import_from_files(db_session)
+    devices = await _devices_by_ip(db_session)
+    router_id = devices["10.5.0.1"].id
+    result = await db_session.execute(select(Link.source_id, Link.target_id))
+    links = set(result.all())
+    assert links == {(router_id, devices["10.5.0.2"].id), (router_id, devices["10.5.0.3"].id)}
+
+    assert await nmap_service._auto_link_routers(db_session) == 0
+
+
+@pytest.mark.asyncio
+async def test_auto_link_routers_respects_reverse_links(db_session, nmap_dir):
+    from app.models.link import Link
+
+    await nmap_service.import_from_files(db_session)
+    devices = await _devices_by_ip(db_session)
+    await db_session.execute(Link.__table__.delete())
+    db_session.add(Link(id="manual", source_id=devices["10.5.0.2"].id, target_id=devices["10.5.0.1"].id))
+    await db_session.commit()
+    assert await nmap_service._auto_link_routers(db_session) == 1
+
+
+@pytest.mark.asyncio
+async def test_auto_link_links_router_pairs_once(db_session):
+    from app.models.link import Link
+
+    db_session.add_all([
+        Device(id="r1", ip_address="10.6.0.1", device_type="router"),
+        Device(id="r2", ip_address="10.6.0.2", device_type="router"),
+    ])
+    await db_session.commit()
+    assert await nmap_service._auto_link_routers(db_session) == 1
+    result = await db_session.execute(select(Link.source_id, Link.target_id))
+    assert result.all() == [("r1", "r2")]
+
+
+SUBNET_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" start="{start}">
+<host><status state="up"/>
+<address addr="10.5.0.2" addrtype="ipv4"/>
+<address addr="AA:BB:CC:00:00:02" addrtype="mac" vendor="{vendor}"/>
+</host>
+<host><status state="up"/><address addr="10.7.0.1" addrtype="ipv4"/></host>
+<host><status state="down"/><address addr="10.7.0.2" addrtype="ipv4"/></host>
+</nmaprun>
+"""
+
+
+@pytest.mark.asyncio
+async def test_import_reads_every_scan_file(db_session, nmap_dir):
+    (nmap_dir / "subnet-7.xml").write_text(SUBNET_XML.format(start=1772190200, vendor="Espressif Inc."))
+    (nmap_dir / "notes.txt").write_text("not a scan")
+    counts = await nmap_service.import_from_files(db_session)
+    assert counts == {"inserted": 4, "updated": 0, "unchanged": 0}
+    devices = await _devices_by_ip(db_session)
+    assert "10.7.0.1" in devices
+    assert "10.7.0.2" not in devices
+
+
+@pytest.mark.asyncio
+async def test_import_last_scan_wins(db_session, nmap_dir):
+    # Newer scan (by nmaprun start, not file name) overrides the vendor;
+    # the hostname it did not observe is kept from the older scan.
+    (nmap_dir / "a-newer.xml").write_text(SUBNET_XML.format(start=1772199999, vendor="Tuya Smart Inc."))
+    (nmap_dir / "z-older.xml").write_text(SUBNET_XML.format(start=1772100000, vendor="Broadlink"))
+    await nmap_service.import_from_files(db_session)
+    devices = await _devices_by_ip(db_session)
+    assert devices["10.5.0.2"].vendor == "Tuya Smart Inc."
+    assert devices["10.5.0.2"].hostname == "plug.lan"
+
+
+@pytest.mark.asyncio
+async def test_import_keeps_hosts_before_truncation(db_session, nmap_dir):
+    (nmap_dir / "partial.xml").write_text(
+        SUBNET_XML.format(start=1772190200, vendor="Espressif Inc.").split("<host><status state=\"down\"")[0]
+    )
+    await nmap_service.import_from_files(db_session)
+    devices = await _devices_by_ip(db_session)
+    assert "10.7.0.1" in devices
+
+
+@pytest.mark.asyncio
+async def test_import_in_process_pool(db_session, nmap_dir):
+    for i in range(3):
+        (nmap_dir / f"subnet-{i}.xml").write_text(
+            SUBNET_XML.format(start=1772190200 + i, vendor="Espressif Inc.").replace("10.7.0.", f"10.{8 + i}.0.")
+        )
+    counts = await nmap_service.import_from_files(db_session, workers=2)
+    assert counts["inserted"] == 6
+
+
+@pytest.mark.asyncio
+async def test_import_fills_missing_vendor_from_oui_index(db_session, nmap_dir, tmp_path_factory, monkeypatch):
+    from app.services import oui_db
+
+    registry = tmp_path_factory.mktemp("oui") / "oui.csv"
+    registry.write_text(
+        "Registry,Assignment,Organization Name,Organization Address\n"
+        "MA-L,020000,UGREEN Group Limited,Shenzhen CN\n"
+    )
+    compile_path = registry.with_name("oui.bin")
+    oui_db.compile_registry([registry], compile_path)
+    database = oui_db.OuiDatabase(compile_path)
+    monkeypatch.setattr(oui_db, "get_database", lambda: database)
+
+    (nmap_dir / "nas.xml").write_text(
+        '<?xml version="1.0"?><nmaprun scanner="nmap" start="1772190300">'
+        '<host><status state="up"/><address addr="10.5.0.9" addrtype="ipv4"/>'
+        '<address addr="02:00:00:00:00:09" addrtype="mac"/></host></nmaprun>'
+    )
+    await nmap_service.import_from_files(db_session)
+    database.close()
+
+    devices = await _devices_by_ip(db_session)
+    assert devices["10.5.0.9"].vendor == "UGREEN Group Limited"
+    assert devices["10.5.0.9"].device_type == "nas"
+    assert devices["10.5.0.1"].vendor == "Routerboard.com"
@@ -0,0 +1,64 @@
+import pytest
+from datetime import datetime
+from app.models.probe import DeviceProbeRollup
+
+
+async def _device(client):
+    r = await client.post("/api/v1/devices", json={"ip_address": "192.168.1.10"})
+    return r.json()["id"]
+
+
+@pytest.mark.asyncio
+async def test_probe_rollups(client, db_session):
+    device_id = await _device(client)
+    db_session.add_all([
+        DeviceProbeRollup(device_id=device_id, resolution="1m", bucket=datetime(2026, 10, 18, 12, 0),
+                          samples=4, lost=1, rtt_min=1.0, rtt_max=3.0, rtt_sum=6.0),
+        DeviceProbeRollup(device_id=device_id, resolution="1m", bucket=datetime(2026, 10, 18, 12, 1),
+                          samples=2, lost=2, rtt_min=None, rtt_max=None, rtt_sum=0.0),
+        DeviceProbeRollup(device_id=device_id, resolution="1h", bucket=datetime(2026, 10, 18, 12),
+                          samples=6, lost=3, rtt_min=1.0, rtt_max=3.0, rtt_sum=6.0),
+    ])
+    await db_session.commit()
+
+    r = await client.get(f"/api/v1/devices/{device_id}/probes", params={
+        "since": "2026-10-18T12:00:00", "until": "2026-10-18T13:00:00",
+    })
+    assert r.status_code == 200
+    first, second = r.json()
+    assert first["samples"] == 4
+    assert first["loss_pct"] == 25.0
+    assert (first["rtt_min_ms"], first["rtt_avg_ms"], first["rtt_max_ms"]) == (1.0, 2.0, 3.0)
+    assert second["loss_pct"] == 100.0
+    assert second["rtt_avg_ms"] is None
+
+    r = await client.get(f"/api/v1/devices/{device_id}/probes", params={
+        "resolution": "1h", "since": "2026-10-18T12:00:00Z", "until": "2026-10-18T13:00:00Z",
+    })
+    assert [b["samples"] for b in r.json()] == [6]
+
+
+@pytest.mark.asyncio
+async def test_probe_rollups_window_is_half_open(client, db_session):
+    device_id = await _device(client)
+    db_session.add(DeviceProbeRollup(device_id=device_id, resolution="1m",
+                                     bucket=datetime(2026, 10, 18, 12, 0), samples=1, lost=0,
+                                     rtt_min=1.0, rtt_max=1.0, rtt_sum=1.0))
+    await db_session.commit()
+    r = await client.get(f"/api/v1/devices/{device_id}/probes", params={
+        "since": "2026-10-18T11:00:00", "until": "2026-10-18T12:00:00",
+    })
+    assert r.json() == []
+
+
+@pytest.mark.asyncio
+async def test_probe_rollups_validation(client):
+    device_id = await _device(client)
+    r = await client.get(f"/api/v1/devices/{device_id}/probes", params={"resolution": "5m"})
+    assert r.status_code == 422
+    r = await client.get(f"/api/v1/devices/{device_id}/probes", params={
+        "since": "2020-01-01T00:00:00", "until": "2026-01-01T00:00:00",
+    })
+    assert r.status_code == 422
+    r = await client.get("/api/v1/devices/nope/probes")
+    assert r.status_code == 404
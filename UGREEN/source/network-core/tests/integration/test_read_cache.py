@@ -0,0 +1,82 @@
+import pytest
+from app.models.device import Device
+from app.models.link import Link
+from app.schemas.device import DevicePatch
+from app.schemas.link import LinkPatch
+from app.services import device_service, events, link_service, read_cache
+
+
+async def _stats(client, name):
+    return (await client.get("/api/v1/cache/stats")).json()[name]
+
+
+@pytest.mark.asyncio
+async def test_device_reads_are_cached_and_writes_invalidate(client):
+    device_id = (await client.post("/api/v1/devices", json={"ip_address": "10.50.0.1"})).json()["id"]
+    before = await _stats(client, "devices")
+    for _ in range(3):
+        assert (await client.get(f"/api/v1/devices/{device_id}")).status_code == 200
+    after = await _stats(client, "devices")
+    assert (after["misses"] - before["misses"], after["hits"] - before["hits"]) == (1, 2)
+
+    await client.patch(f"/api/v1/devices/{device_id}", json={"label": "edge"})
+    assert (await client.get(f"/api/v1/devices/{device_id}")).json()["label"] == "edge"
+
+    await client.delete(f"/api/v1/devices/{device_id}")
+    assert (await client.get(f"/api/v1/devices/{device_id}")).status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_status_event_from_another_process_invalidates(client, db_session):
+    device_id = (await client.post("/api/v1/devices", json={"ip_address": "10.50.0.2"})).json()["id"]
+    assert (await client.get(f"/api/v1/devices/{device_id}")).json()["status"] == "unknown"
+
+    # The ping worker writes directly and announces the flip over NOTIFY.
+    from sqlalchemy import update
+    from app.models.device import Device
+    await db_session.execute(update(Device).where(Device.id == device_id).values(status="alive"))
+    await db_session.commit()
+    assert (await client.get(f"/api/v1/devices/{device_id}")).json()["status"] == "unknown"
+    events.broker.dispatch({"kind": "device", "op": "status", "id": device_id, "status": "alive"})
+    db_session.expire_all()
+    assert (await client.get(f"/api/v1/devices/{device_id}")).json()["status"] == "alive"
+
+
+@pytest.mark.asyncio
+async def test_topology_snapshot_is_cached_until_a_link_changes(client):
+    a = (await client.post("/api/v1/devices", json={"ip_address": "10.50.1.1"})).json()["id"]
+    b = (await client.post("/api/v1/devices", json={"ip_address": "10.50.1.2"})).json()["id"]
+    first = await client.get("/api/v1/topology")
+    hits = (await _stats(client, "topology"))["hits"]
+    second = await client.get("/api/v1/topology")
+    assert second.content == first.content
+    assert (await _stats(client, "topology"))["hits"] == hits + 1
+
+    await client.post("/api/v1/links", json={"source_id": a, "target_id": b})
+    third = await client.get("/api/v1/topology", headers={"If-None-Match": first.headers["ETag"]})
+    assert third.status_code == 200
+    assert len(third.json()["edges"]) == 1
+
+
+@pytest.mark.asyncio
+async def test_reload_clears_every_cache(client):
+    device_id = (await client.post("/api/v1/devices", json={"ip_address": "10.50.2.1"})).json()["id"]
+    await client.get(f"/api/v1/devices/{device_id}")
+    await client.get("/api/v1/topology")
+    assert len(read_cache.devices) == 1 and len(read_cache.topology) == 1
+    events.broker.dispatch(events.RELOAD)
+    assert len(read_cache.devices) == 0 and len(read_cache.topology) == 0
+
+
+@pytest.mark.asyncio
+async def test_empty_patch_returns_orm_rows(client, db_session):
+    a = (await client.post("/api/v1/devices", json={"ip_address": "10.80.0.1"})).json()["id"]
+    b = (await client.post("/api/v1/devices", json={"ip_address": "10.80.0.2"})).json()["id"]
+    link_id = (await client.post("/api/v1/links", json={"source_id": a, "target_id": b})).json()["id"]
+    await client.get(f"/api/v1/devices/{a}")  # cached as DeviceRead
+
+    assert isinstance(await device_service.update_device(db_session, a, DevicePatch()), Device)
+    assert isinstance(await link_service.update_link(db_session, link_id, LinkPatch()), Link)
+    assert await device_service.update_device(db_session, "missing", DevicePatch()) is None
+    resp = await client.patch(f"/api/v1/devices/{a}", json={})
+    assert resp.status_code == 200 and resp.json()["ip_address"] == "10.80.0.1"
@@ -0,0 +1,81 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime
+from httpx import AsyncClient, ASGITransport
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from app.db.session import get_db, get_read_db
+from app.main import app
+from app.models.base import Base
+from app.models.device import Device
+from app.models.probe import DeviceProbeRollup
+from app.services import events, read_cache
+
+
+@pytest_asyncio.fixture
+async def databases(tmp_path):
+    """Two SQLite files standing in for the primary and its replica."""
+    engines = [create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/{name}.db") for name in ("primary", "replica")]
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+    read_cache.on_event(events.RELOAD)
+    yield [async_sessionmaker(engine, expire_on_commit=False) for engine in engines]
+    for engine in engines:
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def replica_client(databases):
+    primary, replica = databases
+
+    async def primary_db():
+        async with primary() as session:
+            yield session
+
+    async def replica_db():
+        async with replica() as session:
+            yield session
+
+    app.dependency_overrides[get_db] = primary_db
+    app.dependency_overrides[get_read_db] = replica_db
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as c:
+        yield c
+    app.dependency_overrides.clear()
+
+
+async def _replicate(databases) -> None:
+    primary, replica = databases
+    async with primary() as src:
+        rows = [dict(row._mapping) for row in await src.execute(select(Device.__table__))]
+    async with replica() as dst:
+        await dst.execute(insert(Device.__table__), rows)
+        await dst.commit()
+
+
+@pytest.mark.asyncio
+async def test_lists_read_the_replica_writes_go_to_the_primary(replica_client, databases):
+    resp = await replica_client.post("/api/v1/devices", json={"ip_address": "10.70.0.1"})
+    device_id = resp.json()["id"]
+
+    assert (await replica_client.get("/api/v1/devices")).json() == []  # not replicated yet
+    assert (await replica_client.get(f"/api/v1/devices/{device_id}")).status_code == 200  # primary
+
+    await _replicate(databases)
+    assert [d["id"] for d in (await replica_client.get("/api/v1/devices")).json()] == [device_id]
+
+
+@pytest.mark.asyncio
+async def test_probe_history_reads_the_replica(replica_client, databases):
+    device_id = (await replica_client.post("/api/v1/devices", json={"ip_address": "10.70.0.2"})).json()["id"]
+    _, replica = databases
+    async with replica() as db:
+        db.add(DeviceProbeRollup(device_id=device_id, resolution="1m", bucket=datetime(2026, 10, 18, 12, 0),
+                                 samples=2, lost=0, rtt_min=1.0, rtt_max=2.0, rtt_sum=3.0))
+        await db.commit()
+
+    resp = await replica_client.get(f"/api/v1/devices/{device_id}/probes", params={
+        "since": "2026-10-18T12:00:00", "until": "2026-10-18T13:00:00",
+    })
+    assert resp.status_code == 200
+    assert [b["samples"] for b in resp.json()] == [2]
@@ -0,0 +1,75 @@
+import pytest
+
+
+@pytest.mark.asyncio
+async def test_topology_snapshot(client):
+    dev1 = (await client.post("/api/v1/devices", json={"ip_address": "10.7.0.1", "device_type": "router"})).json()
+    dev2 = (await client.post("/api/v1/devices", json={"ip_address": "10.7.0.2"})).json()
+    link = (await client.post("/api/v1/links", json={"source_id": dev1["id"], "target_id": dev2["id"]})).json()
+
+    resp = await client.get("/api/v1/topology")
+    assert resp.status_code == 200
+    data = resp.json()
+    assert {n["ip"] for n in data["nodes"]} == {"10.7.0.1", "10.7.0.2"}
+    assert data["edges"] == [
+        {"id": link["id"], "source": dev1["id"], "target": dev2["id"], "type": "ethernet"}
+    ]
+    assert resp.headers["ETag"] == f'W/"{data["version"]}"'
+
+
+@pytest.mark.asyncio
+async def test_topology_not_modified(client):
+    await client.post("/api/v1/devices", json={"ip_address": "10.7.1.1"})
+    first = await client.get("/api/v1/topology")
+    etag = first.headers["ETag"]
+
+    resp = await client.get("/api/v1/topology", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+
+    await client.post("/api/v1/devices", json={"ip_address": "10.7.1.2"})
+    resp = await client.get("/api/v1/topology", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.headers["ETag"] != etag
+
+
+@pytest.mark.asyncio
+async def test_topology_gzip(client):
+    for i in range(20):
+        await client.post("/api/v1/devices", json={"ip_address": f"10.7.2.{i}"})
+    resp = await client.get("/api/v1/topology", headers={"Accept-Encoding": "gzip"})
+    assert resp.headers["content-encoding"] == "gzip"
+    assert len(resp.json()["nodes"]) == 20
+
+
+@pytest.mark.asyncio
+async def test_topology_nodes_carry_layout_positions(client):
+    router = (await client.post("/api/v1/devices", json={"ip_address": "10.7.3.1", "device_type": "router"})).json()
+    for i in range(2, 6):
+        dev = (await client.post("/api/v1/devices", json={"ip_address": f"10.7.3.{i}", "device_type": "iot"})).json()
+        await client.post("/api/v1/links", json={"source_id": router["id"], "target_id": dev["id"]})
+
+    nodes = (await client.get("/api/v1/topology")).json()["nodes"]
+    positions = {n["ip"]: (n["x"], n["y"]) for n in nodes}
+    assert len(set(positions.values())) == 5
+    # Router band above the device groups.
+    assert all(positions["10.7.3.1"][1] < y for ip, (_, y) in positions.items() if ip != "10.7.3.1")
+
+
+@pytest.mark.asyncio
+async def test_layout_recomputes_only_changed_groups(client, db_session):
+    from app.services import layout_service, topology_service
+
+    for i, device_type in enumerate(["router", "server", "iot", "iot"]):
+        await client.post("/api/v1/devices", json={"ip_address": f"10.7.4.{i + 1}", "device_type": device_type})
+    first = await topology_service.get_snapshot(db_session)
+    assert await layout_service.apply_layout(db_session, first) == 3
+    again = await topology_service.get_snapshot(db_session)
+    assert await layout_service.apply_layout(db_session, again) == 0
+    assert [(n["x"], n["y"]) for n in again["nodes"]] == [(n["x"], n["y"]) for n in first["nodes"]]
+
+    await client.post("/api/v1/devices", json={"ip_address": "10.7.4.9", "device_type": "iot"})
+    snapshot = await topology_service.get_snapshot(db_session)
+    assert await layout_service.apply_layout(db_session, snapshot) == 1
+    server = next(n for n in snapshot["nodes"] if n["type"] == "server")
+    assert (server["x"], server["y"]) == next((n["x"], n["y"]) for n in first["nodes"] if n["type"] == "server")
@@ -0,0 +1,63 @@
+import asyncio
+import json
+import pytest
+from app.api.v1.topology import sse_events
+from app.services import events
+
+
+@pytest.fixture
+def subscription():
+    queue = events.broker.subscribe()
+    yield queue
+    events.broker.unsubscribe(queue)
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+@pytest.mark.asyncio
+async def test_device_crud_emits_deltas(client, subscription):
+    device = (await client.post("/api/v1/devices", json={"ip_address": "10.8.0.1"})).json()
+    await client.patch(f"/api/v1/devices/{device['id']}", json={"label": "core"})
+    await client.delete(f"/api/v1/devices/{device['id']}")
+
+    got = drain(subscription)
+    assert [(e["kind"], e["op"]) for e in got] == [("device", "create"), ("device", "update"), ("device", "delete")]
+    assert got[0]["node"]["ip"] == "10.8.0.1"
+    assert got[1]["node"]["label"] == "core"
+    assert got[2]["id"] == device["id"]
+
+
+@pytest.mark.asyncio
+async def test_link_create_emits_edge(client, subscription):
+    dev1 = (await client.post("/api/v1/devices", json={"ip_address": "10.8.1.1"})).json()
+    dev2 = (await client.post("/api/v1/devices", json={"ip_address": "10.8.1.2"})).json()
+    drain(subscription)
+    link = (await client.post("/api/v1/links", json={"source_id": dev1["id"], "target_id": dev2["id"]})).json()
+    (event,) = drain(subscription)
+    assert event == {
+        "kind": "link", "op": "create", "id": link["id"],
+        "edge": {"id": link["id"], "source": dev1["id"], "target": dev2["id"], "type": "ethernet"},
+    }
+
+
+def test_slow_subscriber_gets_reload(subscription):
+    for i in range(events.QUEUE_SIZE + 1):
+        events.broker.dispatch({"kind": "device", "op": "status", "id": str(i), "status": "alive"})
+    assert drain(subscription) == [events.RELOAD]
+
+
+@pytest.mark.asyncio
+async def test_sse_events_format():
+    queue = asyncio.Queue()
+    queue.put_nowait({"kind": "device", "op": "status", "id": "a", "status": "unreachable"})
+    stream = sse_events(queue)
+    assert await anext(stream) == "retry: 5000\n\n"
+    chunk = await anext(stream)
+    assert chunk.startswith("data: ") and chunk.endswith("\n\n")
+    assert json.loads(chunk[len("data: "):])["status"] == "unreachable"
+    await stream.aclose()
@@ -0,0 +1,27 @@
+import pytest
+from app.config import settings
+from app.db.session import engine_options
+
+
+def test_sqlite_keeps_default_pool():
+    assert engine_options("sqlite+aiosqlite:///:memory:", pool_size=2) == {"echo": settings.DEBUG}
+
+
+def test_postgres_pool_and_statement_cache_from_settings(monkeypatch):
+    monkeypatch.setattr(settings, "DB_POOL_SIZE", 20)
+    monkeypatch.setattr(settings, "DB_POOL_RECYCLE", 1800)
+    monkeypatch.setattr(settings, "DB_STATEMENT_CACHE_SIZE", 0)
+    options = engine_options("postgresql+asyncpg://x:x@localhost/x")
+    assert options["pool_size"] == 20
+    assert options["pool_recycle"] == 1800
+    assert options["connect_args"] == {"prepared_statement_cache_size": 0, "statement_cache_size": 0}
+    assert engine_options("postgresql+asyncpg://x:x@localhost/x", pool_size=2, max_overflow=0)["pool_size"] == 2
+    assert "connect_args" not in engine_options("postgresql+psycopg://x:x@localhost/x")
+
+
+@pytest.mark.asyncio
+async def test_read_db_reuses_primary_session_without_replica():
+    from app.db import session as db_session
+    primary = object()
+    assert db_session.read_engine is db_session.engine
+    assert await anext(db_session.get_read_db(primary)) is primary
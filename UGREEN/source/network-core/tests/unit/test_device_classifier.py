@@ -0,0 +1,75 @@
+import pytest
+from app.services.device_classifier import DeviceClassifier, classify, classify_many
+
+
+@pytest.mark.parametrize("vendor, ports, expected", [
+    ("Proxmox Server Solutions GmbH", [], "server"),
+    ("UGREEN Group Limited", [80], "nas"),
+    ("Hewlett Packard", [], "server"),
+    ("Routerboard.com", [], "router"),
+    ("MikroTik", [], "router"),
+    ("ASUSTek COMPUTER INC.", [], "router"),
+    ("TP-LINK TECHNOLOGIES CO.,LTD.", [], "router"),
+    ("Espressif Inc.", [80], "iot"),
+    ("Tuya Smart Inc.", [], "iot"),
+    ("BroadLink", [], "iot"),
+    ("Raspberry Pi Trading Ltd", [8443], "network"),
+    ("Raspberry Pi Trading Ltd", [22], "unknown"),
+    (None, [443], "network"),
+    ("", [], "unknown"),
+])
+def test_default_rules(vendor, ports, expected):
+    assert classify(vendor, ports) == expected
+
+
+def test_earlier_rule_wins_wherever_it_matches():
+    # "hp" (server) sits after "tuya" in the string but before it in the rule table.
+    assert classify("Tuya for hp") == "server"
+
+
+def test_oui_prefix_takes_precedence():
+    assert classify("Unknown", [], "bc:24:11:00:00:01") == "server"
+    assert classify("Espressif Inc.", [], "02:00:00:00:00:01") == "iot"
+
+
+RULES = {
+    "oui": {"aa:bb:cc": "camera"},
+    "vendors": [{"pattern": r"acme\b", "type": "printer"}, {"pattern": "acme", "type": "other"}],
+    "ports": [{"all": [554, 80], "type": "camera"}, {"any": [22], "type": "server"}],
+}
+
+
+def test_custom_rules_port_signatures():
+    c = DeviceClassifier(RULES)
+    assert c.classify("x", [80, 554, 9999]) == "camera"
+    assert c.classify("x", [80, 22]) == "server"
+    assert c.classify("x", [80]) == "unknown"
+    assert c.classify("ACME Corp", []) == "printer"
+    assert c.classify("Acmetech", []) == "other"
+    assert c.classify(None, [], "AA:BB:CC:01:02:03") == "camera"
+
+
+def test_results_are_cached_per_vendor_and_signature():
+    c = DeviceClassifier(RULES)
+    for port in range(1000, 1100):  # ports outside every rule share one signature
+        c.classify("Acme", [port, 22])
+    assert (c.misses, c.hits) == (1, 99)
+
+
+def test_classify_many_matches_classify():
+    hosts = [
+        {"vendor": "Espressif Inc.", "open_ports": None, "mac_address": None},
+        {"vendor": None, "open_ports": [80], "mac_address": "02:00:00:00:00:02"},
+        {"vendor": "Unknown", "open_ports": [], "mac_address": "4C:5E:0C:11:22:33"},
+    ]
+    assert classify_many(hosts) == ["iot", "network", "router"]
+
+
+@pytest.mark.parametrize("rules", [
+    {"vendors": [{"pattern": "(acme)", "type": "x"}]},
+    {"vendors": [{"pattern": "acme", "type": ""}]},
+    {"ports": [{"any": [1], "all": [2], "type": "x"}]},
+])
+def test_invalid_rules_are_rejected(rules):
+    with pytest.raises(ValueError):
+        DeviceClassifier(rules)
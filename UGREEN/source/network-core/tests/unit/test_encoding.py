@@ -0,0 +1,28 @@
+import json
+from datetime import datetime
+import pytest
+from pydantic import TypeAdapter
+from app.api.v1 import encoding
+from app.schemas.device import DeviceRead
+from app.services.device_service import READ_COLUMNS
+
+ROWS = [
+    ("a", "10.0.0.1", None, "nas", "Zażółć", None, "nas", "alive",
+     datetime(2026, 2, 27, 14, 30), datetime(2026, 2, 27, 14, 30, 0, 120)),
+    ("b", "10.0.0.2", "02:00:00:00:00:02", None, None, "x", "unknown", "unknown", None, None),
+]
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_rows_encode_like_the_read_schema(monkeypatch, fast):
+    if not fast:
+        monkeypatch.setattr(encoding, "orjson", None)
+    elif encoding.orjson is None:
+        pytest.skip("orjson not installed")
+    expected = TypeAdapter(list[DeviceRead]).dump_json(
+        [DeviceRead(**dict(zip(READ_COLUMNS, row))) for row in ROWS]
+    )
+    resp = encoding.rows_response(READ_COLUMNS, ROWS)
+    assert resp.media_type == "application/json"
+    assert json.loads(resp.body) == json.loads(expected)
+    assert resp.body.decode().count("2026-02-27T14:30:00.000120") == 1
@@ -0,0 +1,75 @@
+import random
+from app.services.graph_service import TopologyGraph
+
+
+def _graph(routers, others, links):
+    devices = [(d, "router") for d in routers] + [(d, "server") for d in others]
+    return TopologyGraph(devices, links)
+
+
+# r1 - sw - a - b      r2 - sw       c (isolated)
+#       \- d - e - d2 (cycle d-e-d2-d)
+LINKS = [
+    ("r1", "sw"), ("sw", "a"), ("a", "b"), ("sw", "d"), ("d", "e"), ("e", "d2"), ("d2", "d"), ("r2", "sw"),
+]
+
+
+def test_shortest_path():
+    g = _graph(["r1", "r2"], ["sw", "a", "b", "c", "d", "e", "d2"], LINKS)
+    assert g.shortest_path("r1", "b") == ["r1", "sw", "a", "b"]
+    assert g.shortest_path("b", "r1") == ["b", "a", "sw", "r1"]
+    assert g.shortest_path("e", "e") == ["e"]
+    assert g.shortest_path("a", "c") is None
+    assert len(g.shortest_path("r1", "e")) == 4
+
+
+def test_blast_radius():
+    g = _graph(["r1", "r2"], ["sw", "a", "b", "c", "d", "e", "d2"], LINKS)
+    assert set(g.blast_radius("sw")) == {"a", "b", "d", "e", "d2"}
+    assert set(g.blast_radius("a")) == {"b"}
+    assert set(g.blast_radius("d")) == {"e", "d2"}
+    assert g.blast_radius("e") == []
+    # sw still reaches r2, so losing r1 cuts nothing off.
+    assert g.blast_radius("r1") == []
+
+
+def test_blast_radius_of_single_router():
+    g = _graph(["r1"], ["sw", "a"], [("r1", "sw"), ("sw", "a")])
+    assert set(g.blast_radius("r1")) == {"sw", "a"}
+
+
+def test_components_largest_first():
+    g = _graph(["r1", "r2"], ["sw", "a", "b", "c", "d", "e", "d2"], LINKS + [("x", "y")])
+    assert [len(c) for c in g.components()] == [8, 1]
+    assert g.components()[1] == ["c"]
+    assert g.edge_count == len(LINKS)
+
+
+def _reachable(adj, roots, removed):
+    seen = {r for r in roots if r != removed}
+    stack = list(seen)
+    while stack:
+        v = stack.pop()
+        for w in adj.get(v, ()):
+            if w != removed and w not in seen:
+                seen.add(w)
+                stack.append(w)
+    return seen
+
+
+def test_blast_radius_matches_brute_force():
+    rng = random.Random(7)
+    nodes = [f"n{i:02d}" for i in range(40)]
+    routers = nodes[:3]
+    links = {tuple(rng.sample(nodes, 2)) for _ in range(50)}
+    links |= {(nodes[i], nodes[i + 1]) for i in range(2, 39, 3)}
+    g = _graph(routers, nodes[3:], links)
+    adj = {}
+    for a, b in links:
+        adj.setdefault(a, set()).add(b)
+        adj.setdefault(b, set()).add(a)
+    rooted = _reachable(adj, routers, None)
+    for x in rooted:
+        before = _reachable(adj, routers, None) - {x}
+        after = _reachable(adj, routers, x)
+        assert set(g.blast_radius(x)) == before - after, x
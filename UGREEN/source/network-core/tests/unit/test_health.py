@@ -0,0 +1,122 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../worker'))
+
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _feed(tracker, clock, results, device_id="a", step=30.0):
+    statuses = []
+    for alive in results:
+        clock.now += step
+        statuses.append(tracker.observe(device_id, alive))
+    return statuses
+
+
+def test_parse_threshold():
+    from health import parse_threshold
+    assert parse_threshold("3/5") == (3, 5)
+    assert parse_threshold("2") == (2, 2)
+    for bad in ("0/3", "4/3", "x/3"):
+        with pytest.raises(ValueError):
+            parse_threshold(bad)
+
+
+def test_single_lost_probe_does_not_flip():
+    from health import HealthTracker
+    clock = _Clock()
+    tracker = HealthTracker(down=(3, 5), up=(2, 3), clock=clock)
+    statuses = _feed(tracker, clock, [True, False, True, True, False, True])
+    assert set(statuses) == {"alive"}
+
+
+def test_down_after_n_of_m_and_back_up():
+    from health import HealthTracker
+    clock = _Clock()
+    tracker = HealthTracker(down=(3, 5), up=(2, 3), clock=clock)
+    statuses = _feed(tracker, clock, [True, False, True, False, False, True, True])
+    assert statuses == ["alive", "alive", "alive", "alive", "unreachable", "unreachable", "alive"]
+
+
+def test_first_probe_sets_state():
+    from health import HealthTracker
+    clock = _Clock()
+    tracker = HealthTracker(clock=clock)
+    assert _feed(tracker, clock, [False]) == ["unreachable"]
+    assert tracker.status("unknown-device") is None
+
+
+def test_flapping_and_settling():
+    from health import HealthTracker
+    clock = _Clock()
+    tracker = HealthTracker(down=(1, 1), up=(1, 1), flap_threshold=4, flap_window=600, clock=clock)
+    statuses = _feed(tracker, clock, [True, False, True, False, True])
+    assert statuses[-1] == "flapping"
+    # Stable for longer than the flap window -> back to the debounced state.
+    statuses = _feed(tracker, clock, [True] * 25)
+    assert statuses[-1] == "alive"
+
+
+def test_backoff_grows_while_down_and_resets():
+    from health import HealthTracker
+    clock = _Clock()
+    tracker = HealthTracker(down=(2, 2), up=(1, 1), backoff_max=8, clock=clock)
+    _feed(tracker, clock, [True, False, False])
+    assert tracker.backoff("a") == 1.0
+    factors = []
+    for _ in range(5):
+        _feed(tracker, clock, [False])
+        factors.append(tracker.backoff("a"))
+    assert factors == [2.0, 4.0, 8.0, 8.0, 8.0]
+    _feed(tracker, clock, [True])
+    assert tracker.backoff("a") == 1.0
+
+
+def test_forget():
+    from health import HealthTracker
+    tracker = HealthTracker()
+    tracker.observe("a", True)
+    tracker.observe("b", True)
+    tracker.forget({"a"})
+    assert tracker.status("b") is None
+    assert tracker.status("a") == "alive"
+
+
+def test_scheduler_applies_backoff():
+    from scheduler import ProbeScheduler
+    clock = _Clock()
+    factors = {"a": 4.0}
+    scheduler = ProbeScheduler(60, {}, clock=clock, backoff=lambda device_id: factors.get(device_id, 1.0))
+    scheduler.sync([("a", "10.0.0.1", None)])
+    assert len(scheduler.pop_due(clock.now + 60)) == 1
+    assert scheduler.pop_due(clock.now + 239) == []
+    assert len(scheduler.pop_due(clock.now + 300)) == 1
+
+
+def test_recovered_device_is_probed_again_after_one_interval():
+    from health import HealthTracker
+    from scheduler import ProbeScheduler
+    clock = _Clock()
+    tracker = HealthTracker(down=(1, 1), up=(1, 1), backoff_max=8, clock=clock)
+    scheduler = ProbeScheduler(60, {}, clock=clock, backoff=tracker.backoff)
+    scheduler.sync([("a", "10.0.0.1", None)])
+
+    def probe(alive):
+        clock.now = scheduler.next_due()
+        assert scheduler.pop_due() == [("a", "10.0.0.1")]
+        tracker.observe("a", alive)
+        scheduler.reschedule(["a"])
+
+    for _ in range(5):
+        probe(False)
+    assert tracker.backoff("a") == 8.0
+    probe(True)
+    assert scheduler.next_due() == clock.now + 60
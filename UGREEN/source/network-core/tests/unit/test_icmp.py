@@ -0,0 +1,97 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../worker'))
+
+import asyncio
+import struct
+import time
+import pytest
+from unittest.mock import patch, AsyncMock
+
+
+def test_checksum_of_packet_with_checksum_is_zero():
+    from icmp import build_echo_request, checksum
+    packet = build_echo_request(0x1234, 7, b"payload")
+    assert checksum(packet) == 0
+
+
+def test_parse_echo_reply_datagram():
+    from icmp import parse_echo_reply
+    reply = struct.pack("!BBHHH", 0, 0, 0, 0x1234, 7)
+    assert parse_echo_reply(reply, has_ip_header=False) == (0x1234, 7)
+
+
+def test_parse_echo_reply_raw_strips_ip_header():
+    from icmp import parse_echo_reply
+    ip_header = bytes([0x45]) + bytes(19)
+    reply = ip_header + struct.pack("!BBHHH", 0, 0, 0, 0x1234, 9)
+    assert parse_echo_reply(reply, has_ip_header=True) == (0x1234, 9)
+
+
+def test_parse_echo_reply_ignores_requests():
+    from icmp import build_echo_request, parse_echo_reply
+    assert parse_echo_reply(build_echo_request(1, 1), has_ip_header=False) is None
+
+
+class FakeBackend:
+    """PingBackend with a canned ping() that records peak concurrency."""
+
+    def __new__(cls, **options):
+        from icmp import PingBackend
+
+        class _Fake(PingBackend):
+            name = "fake"
+            active = peak = 0
+
+            async def ping(self, ip):
+                self.active += 1
+                self.peak = max(self.peak, self.active)
+                await asyncio.sleep(0.01)
+                self.active -= 1
+                return None if ip.endswith(".99") else 0.001
+
+        return _Fake(**options)
+
+
+@pytest.mark.asyncio
+async def test_ping_many_respects_concurrency_and_order():
+    backend = FakeBackend(concurrency=3, rate=0)
+    ips = [f"10.0.0.{i}" for i in range(10)] + ["10.0.0.99"]
+    results = await backend.ping_many(ips)
+    assert results[:10] == [0.001] * 10
+    assert results[10] is None
+    assert backend.peak == 3
+
+
+@pytest.mark.asyncio
+async def test_ping_many_respects_send_rate():
+    backend = FakeBackend(concurrency=100, rate=200)
+    t0 = time.monotonic()
+    await backend.ping_many([f"10.0.0.{i}" for i in range(20)])
+    assert time.monotonic() - t0 >= 19 / 200
+
+
+@pytest.mark.asyncio
+async def test_subprocess_backend_parses_rtt():
+    from icmp import SubprocessBackend
+    with patch("icmp.asyncio.create_subprocess_exec", new_callable=AsyncMock) as mock_proc:
+        proc = AsyncMock()
+        proc.returncode = 0
+        proc.communicate = AsyncMock(return_value=(b"64 bytes from 10.0.0.1: icmp_seq=1 ttl=64 time=1.25 ms\n", b""))
+        mock_proc.return_value = proc
+        rtt = await SubprocessBackend().ping("10.0.0.1")
+    assert rtt == pytest.approx(0.00125)
+
+
+@pytest.mark.asyncio
+async def test_icmp_backend_pings_loopback():
+    from icmp import IcmpSocketBackend
+    try:
+        backend = IcmpSocketBackend(timeout=1).open()
+    except OSError:
+        pytest.skip("ICMP sockets not permitted here")
+    try:
+        (rtt,) = await backend.ping_many(["127.0.0.1"])
+    finally:
+        await backend.close()
+    assert rtt is not None and rtt < 1
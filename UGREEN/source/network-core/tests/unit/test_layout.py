@@ -0,0 +1,32 @@
+from app.services.layout_service import _group_clusters, layout_group
+
+
+def _node(id, ip, type):
+    return {"id": id, "ip": ip, "type": type}
+
+
+def test_devices_cluster_under_lowest_ip_router():
+    nodes = [
+        _node("r2", "10.0.0.2", "router"), _node("r1", "10.0.0.1", "router"),
+        _node("a", "10.0.0.20", "iot"), _node("b", "10.0.0.10", "iot"), _node("c", "10.0.0.30", "iot"),
+    ]
+    edges = [
+        {"source": "r2", "target": "a"}, {"source": "a", "target": "r1"},
+        {"source": "r2", "target": "b"},
+    ]
+    groups = _group_clusters(nodes, edges)
+    assert groups["router"] == [("r1", ["r1"]), ("r2", ["r2"])]
+    assert groups["iot"] == [("r1", ["a"]), ("r2", ["b"]), (None, ["c"])]
+
+
+def test_layout_group_places_every_node_once_without_overlap():
+    clusters = [[f"a{i}" for i in range(10)], [f"b{i}" for i in range(3)], ["c0"]]
+    positions, width, height = layout_group(clusters)
+    assert len(positions) == 14
+    assert len({tuple(p) for p in positions.values()}) == 14
+    assert all(0 < x < width and 0 < y < height for x, y in positions.values())
+
+
+def test_layout_group_stays_roughly_proportional():
+    positions, width, height = layout_group([[str(i)] for i in range(400)])
+    assert 1 <= width / height <= 2
@@ -0,0 +1,54 @@
+from app import metrics
+from app.metrics import Counter, Gauge, Histogram
+
+
+def _isolated(monkeypatch):
+    monkeypatch.setattr(metrics, "REGISTRY", [])
+
+
+def test_histogram_renders_cumulative_buckets(monkeypatch):
+    _isolated(monkeypatch)
+    h = Histogram("t_seconds", "Test.", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        h.observe(value, "/a")
+    assert metrics.render().splitlines() == [
+        "# HELP t_seconds Test.",
+        "# TYPE t_seconds histogram",
+        't_seconds_bucket{route="/a",le="0.1"} 2',
+        't_seconds_bucket{route="/a",le="1.0"} 3',
+        't_seconds_bucket{route="/a",le="+Inf"} 4',
+        't_seconds_sum{route="/a"} 3.65',
+        't_seconds_count{route="/a"} 4',
+    ]
+
+
+def test_counter_and_gauges(monkeypatch):
+    _isolated(monkeypatch)
+    c = Counter("t_total", "Test.", ("status",))
+    c.inc("200")
+    c.inc("200")
+    c.inc('5"00')
+    g = Gauge("t_in_flight", "Test.")
+    g.inc()
+    Gauge("t_pool", "Test.", ("engine",), collect=lambda: {("api",): 3})
+    lines = metrics.render().splitlines()
+    assert 't_total{status="200"} 2' in lines
+    assert 't_total{status="5\\"00"} 1' in lines
+    assert "t_in_flight 1" in lines
+    assert 't_pool{engine="api"} 3' in lines
+
+
+class _Route:
+    def __init__(self, path):
+        self.path = path
+
+
+def test_route_template_restores_router_prefix():
+    def template(path, route_path):
+        return metrics.route_template({"path": path, "route": _Route(route_path)})
+
+    assert template("/api/v1/devices/abc", "/devices/{device_id}") == "/api/v1/devices/{device_id}"
+    assert template("/api/v1/devices/abc", "/api/v1/devices/{device_id}") == "/api/v1/devices/{device_id}"
+    assert template("/api/v1/devices", "") == "/api/v1/devices"
+    assert template("/metrics", "/metrics") == "/metrics"
+    assert metrics.route_template({"path": "/x"}) == "unmatched"
@@ -52,3 +52,76 @@ def test_parse_top200_returns_ports():
         assert "ip_address" in h
         assert "open_ports" in h
         assert isinstance(h["open_ports"], list)
+
+
+# ── Streaming (iterparse) parsers ───────────────────────────────────────────
+# Synthetic XML keeps these tests independent of the real scan output.
+
+SAMPLE_XML = """<?xml version="1.0"?>
+<nmaprun scanner="nmap" start="1772190000">
+<hosthint><status state="up"/><address addr="10.0.0.1" addrtype="ipv4"/></hosthint>
+<host><status state="up"/>
+<address addr="10.0.0.1" addrtype="ipv4"/>
+<address addr="AA:BB:CC:00:00:01" addrtype="mac" vendor="Routerboard.com"/>
+<hostnames><hostname name="gw.lan" type="PTR"/><hostname name="alt.lan" type="PTR"/></hostnames>
+<ports>
+<port protocol="tcp" portid="80"><state state="open"/></port>
+<port protocol="tcp" portid="22"><state state="closed"/></port>
+</ports>
+</host>
+<host><status state="down"/><address addr="10.0.0.2" addrtype="ipv4"/></host>
+<host><status state="up"/><address addr="10.0.0.3" addrtype="ipv4"/></host>
+<runstats><finished time="1772190100"/></runstats>
+</nmaprun>
+"""
+
+
+@pytest.fixture
+def sample_xml(tmp_path):
+    path = tmp_path / "scan.xml"
+    path.write_text(SAMPLE_XML)
+    return path
+
+
+def test_iter_host_discovery_matches_tree_parser(sample_xml):
+    from app.services.nmap_service import iter_host_discovery
+    assert list(iter_host_discovery(sample_xml)) == parse_host_discovery(sample_xml)
+
+
+def test_iter_host_discovery_skips_down_hosts(sample_xml):
+    from app.services.nmap_service import iter_host_discovery
+    hosts = list(iter_host_discovery(sample_xml))
+    assert [h["ip_address"] for h in hosts] == ["10.0.0.1", "10.0.0.3"]
+    assert hosts[0]["hostname"] == "gw.lan"
+    assert hosts[0]["vendor"] == "Routerboard.com"
+
+
+def test_iter_top200_matches_tree_parser(sample_xml):
+    from app.services.nmap_service import iter_top200
+    hosts = list(iter_top200(sample_xml))
+    assert hosts == parse_top200(sample_xml)
+    assert hosts[0] == {"ip_address": "10.0.0.1", "open_ports": [80]}
+
+
+def test_iter_top200_is_lazy(sample_xml):
+    from app.services.nmap_service import iter_top200
+    it = iter_top200(sample_xml)
+    assert next(it)["ip_address"] == "10.0.0.1"
+
+
+def test_merge_scans_last_scan_wins_per_field():
+    from app.services.nmap_service import merge_scans
+    old = ((100, "a.xml"), [{"ip_address": "10.0.0.1", "mac_address": "AA", "vendor": "Old",
+                              "hostname": "h.lan", "open_ports": [22]}])
+    new = ((200, "b.xml"), [{"ip_address": "10.0.0.1", "mac_address": None, "vendor": "New",
+                              "hostname": None, "open_ports": None}])
+    merged = merge_scans([new, old])
+    assert merged["10.0.0.1"] == {"ip_address": "10.0.0.1", "mac_address": "AA", "vendor": "New",
+                                  "hostname": "h.lan", "open_ports": [22]}
+
+
+def test_parse_scan_file_reports_scan_start_and_ports(sample_xml):
+    from app.services.nmap_service import parse_scan_file
+    key, hosts = parse_scan_file(str(sample_xml))
+    assert key == (1772190000, str(sample_xml))
+    assert [(h["ip_address"], h["open_ports"]) for h in hosts] == [("10.0.0.1", [80]), ("10.0.0.3", None)]
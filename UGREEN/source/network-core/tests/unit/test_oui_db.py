@@ -0,0 +1,76 @@
+import pytest
+from app.services import oui_db
+from app.services.oui_db import OuiDatabase, compile_registry, enrich_vendors, mac_to_int
+
+HEADER = "Registry,Assignment,Organization Name,Organization Address\n"
+MA_L = HEADER + (
+    'MA-L,001132,Synology Incorporated,"Taipei, TW"\n'
+    "MA-L,4C5E0C,Routerboard.com,Riga LV\n"
+    "MA-L,70B3D5,IEEE Registration Authority,Piscataway US\n"
+    "MA-L,240AC4,Espressif Inc.,Shanghai CN\n"
+)
+MA_M = HEADER + "MA-M,70B3D51,Small Vendor A,Somewhere\n"
+MA_S = HEADER + "MA-S,70B3D5123,Tiny Vendor B,Elsewhere\nMA-S,70B3D5FFF,Espressif Inc.,Shanghai CN\n"
+
+
+@pytest.fixture
+def database(tmp_path):
+    paths = []
+    for name, content in (("oui.csv", MA_L), ("mam.csv", MA_M), ("oui36.csv", MA_S)):
+        path = tmp_path / name
+        path.write_text(content)
+        paths.append(path)
+    assert compile_registry(paths, tmp_path / "oui.bin") == 7
+    db = OuiDatabase(tmp_path / "oui.bin")
+    yield db
+    db.close()
+
+
+def test_lookup_by_24_bit_prefix(database):
+    assert database.lookup("00:11:32:aa:bb:cc") == "Synology Incorporated"
+    assert database.lookup("4c-5e-0c-00-00-01") == "Routerboard.com"
+    assert database.lookup("240a.c400.0001") == "Espressif Inc."
+
+
+def test_longest_prefix_wins(database):
+    assert database.lookup("70:B3:D5:12:34:56") == "Tiny Vendor B"
+    assert database.lookup("70:B3:D5:1F:00:00") == "Small Vendor A"
+    assert database.lookup("70:B3:D5:FF:F0:00") == "Espressif Inc."
+    assert database.lookup("70:B3:D5:80:00:00") == "IEEE Registration Authority"
+
+
+def test_unknown_and_invalid_macs(database):
+    assert database.lookup("02:00:00:00:00:01") is None
+    assert database.lookup("not a mac") is None
+    assert database.lookup("") is None
+    assert len(database) == 7
+
+
+def test_mac_to_int():
+    assert mac_to_int("00:00:00:00:01:00") == 256
+    assert mac_to_int("00:00:00:00:01") is None
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "junk.bin"
+    path.write_bytes(b"\x00" * 64)
+    with pytest.raises(ValueError):
+        OuiDatabase(path)
+
+
+def test_enrich_fills_only_missing_vendors(database):
+    hosts = [
+        {"mac_address": "00:11:32:00:00:01", "vendor": None},
+        {"mac_address": "24:0A:C4:00:00:01", "vendor": "Already Known"},
+        {"mac_address": None, "vendor": None},
+        {"mac_address": "02:00:00:00:00:01", "vendor": None},
+    ]
+    assert enrich_vendors(hosts, database) == 1
+    assert [h["vendor"] for h in hosts] == ["Synology Incorporated", "Already Known", None, None]
+
+
+def test_enrich_without_database_is_a_no_op(monkeypatch):
+    monkeypatch.setattr(oui_db, "get_database", lambda: None)
+    hosts = [{"mac_address": "00:11:32:00:00:01", "vendor": None}]
+    assert enrich_vendors(hosts) == 0
+    assert hosts[0]["vendor"] is None
@@ -36,3 +36,81 @@ async def test_ping_host_failure():
         mock_proc.return_value = proc
         result = await ping_host("192.0.2.1")
     assert result is False
+
+
+def test_pending_transitions_only_changed_or_unknown():
+    from ping_worker import pending_transitions
+    last = {"a": "alive", "b": "alive", "c": "unreachable"}
+    devices = [("a", "10.0.0.1"), ("b", "10.0.0.2"), ("c", "10.0.0.3"), ("d", "10.0.0.4")]
+    rtts = [0.001, None, None, 0.002]
+    assert pending_transitions(last, devices, rtts) == [("b", "unreachable"), ("d", "alive")]
+
+
+class _Result:
+    def __init__(self, rows):
+        self._rows = rows
+
+    def fetchall(self):
+        return self._rows
+
+    def __iter__(self):
+        return iter(self._rows)
+
+
+class _FakeSession:
+    """Records statements; the UPDATE reports every requested transition as changed."""
+
+    def __init__(self, devices):
+        self.devices = devices
+        self.statements = []
+        self.commit = AsyncMock()
+
+    async def execute(self, stmt, params=None):
+        sql = str(stmt)
+        self.statements.append((sql, params))
+        if sql.startswith("SELECT id"):
+            return _Result(self.devices)
+        if sql.startswith("UPDATE"):
+            return _Result(list(zip(params["ids"], params["statuses"])))
+        return _Result([])
+
+
+class _FakeBackend:
+    def __init__(self, alive):
+        self.alive = alive
+
+    async def ping_many(self, ips):
+        return [0.001 if ip in self.alive else None for ip in ips]
+
+
+@pytest.mark.asyncio
+async def test_run_round_writes_only_transitions_in_one_batch():
+    from ping_worker import run_round
+    devices = [("a", "10.0.0.1"), ("b", "10.0.0.2")]
+    last_status = {}
+
+    session = _FakeSession(devices)
+    assert await run_round(session, _FakeBackend({"10.0.0.1"}), last_status) == 2
+    updates = [s for s, _ in session.statements if s.startswith("UPDATE")]
+    assert len(updates) == 1
+    assert last_status == {"a": "alive", "b": "unreachable"}
+
+    session = _FakeSession(devices)
+    assert await run_round(session, _FakeBackend({"10.0.0.1"}), last_status) == 0
+    assert not [s for s, _ in session.statements if s.startswith("UPDATE")]
+
+    session = _FakeSession(devices[:1])
+    assert await run_round(session, _FakeBackend(set()), last_status) == 1
+    assert last_status == {"a": "unreachable"}
+
+
+def test_pending_transitions_with_tracker_debounces():
+    from ping_worker import pending_transitions
+    from health import HealthTracker
+    tracker = HealthTracker(down=(2, 2), up=(1, 1))
+    last = {}
+    devices = [("a", "10.0.0.1")]
+    for rtt, expected in ((0.001, [("a", "alive")]), (None, []), (None, [("a", "unreachable")])):
+        transitions = pending_transitions(last, devices, [rtt], tracker)
+        assert transitions == expected
+        last.update(transitions)
@@ -0,0 +1,44 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../worker'))
+
+from datetime import datetime, date
+
+
+def test_probe_records_convert_rtt_to_ms_and_flag_loss():
+    from probes import probe_records
+    ts = datetime(2026, 10, 18, 12, 0, 5)
+    records = probe_records([("a", "10.0.0.1"), ("b", "10.0.0.2")], [0.0012345, None], ts)
+    assert records == [("a", ts, 1.234, False), ("b", ts, None, True)]
+
+
+def test_aggregate_rollups_per_bucket():
+    from probes import aggregate_rollups
+    records = [
+        ("a", datetime(2026, 10, 18, 12, 0, 5), 2.0, False),
+        ("a", datetime(2026, 10, 18, 12, 0, 35), 4.0, False),
+        ("a", datetime(2026, 10, 18, 12, 0, 50), None, True),
+        ("a", datetime(2026, 10, 18, 12, 1, 5), 6.0, False),
+    ]
+    rows = {(r["resolution"], r["bucket"]): r for r in aggregate_rollups(records)}
+
+    minute = rows[("1m", datetime(2026, 10, 18, 12, 0))]
+    assert (minute["samples"], minute["lost"]) == (3, 1)
+    assert (minute["rtt_min"], minute["rtt_max"], minute["rtt_sum"]) == (2.0, 4.0, 6.0)
+    assert rows[("1m", datetime(2026, 10, 18, 12, 1))]["samples"] == 1
+
+    hour = rows[("1h", datetime(2026, 10, 18, 12))]
+    assert (hour["samples"], hour["lost"], hour["rtt_sum"]) == (4, 1, 12.0)
+    assert (hour["rtt_min"], hour["rtt_max"]) == (2.0, 6.0)
+    assert len(rows) == 3
+
+
+def test_aggregate_rollups_all_lost_has_no_rtt():
+    from probes import aggregate_rollups
+    rows = aggregate_rollups([("a", datetime(2026, 10, 18, 12, 0, 5), None, True)])
+    assert all(r["rtt_min"] is None and r["rtt_max"] is None and r["lost"] == 1 for r in rows)
+
+
+def test_partition_name():
+    from probes import partition_name
+    assert partition_name(date(2026, 1, 2)) == "device_probes_20260102"
@@ -0,0 +1,47 @@
+from app.services.read_cache import TTLCache
+
+
+class Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_lru_eviction_and_counters():
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+    assert cache.stats() == {"size": 2, "maxsize": 2, "ttl": 60, "hits": 3, "misses": 1, "evictions": 1}
+
+
+def test_entries_expire_after_ttl():
+    clock = Clock()
+    cache = TTLCache(maxsize=10, ttl=5, clock=clock)
+    cache.put("a", 1)
+    clock.now = 4.9
+    assert cache.get("a") == 1
+    clock.now = 5.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_put_is_skipped_after_a_concurrent_invalidation():
+    cache = TTLCache(maxsize=10, ttl=60)
+    generation = cache.generation
+    cache.invalidate("a")  # a write committed while the reader was querying
+    cache.put("a", "stale row", generation)
+    assert cache.get("a") is None
+    cache.put("a", "fresh row", cache.generation)
+    assert cache.get("a") == "fresh row"
+
+
+def test_zero_size_disables_caching():
+    cache = TTLCache(maxsize=0, ttl=60)
+    cache.put("a", 1)
+    assert cache.get("a") is None
@@ -0,0 +1,101 @@
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../worker'))
+
+import pytest
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def _devices(n, device_type="server"):
+    return [(f"dev-{i}", f"10.0.{i // 256}.{i % 256}", device_type) for i in range(n)]
+
+
+def test_parse_intervals():
+    from scheduler import parse_intervals
+    assert parse_intervals("router=15, iot=300,") == {"router": 15.0, "iot": 300.0}
+    assert parse_intervals("") == {}
+    with pytest.raises(ValueError):
+        parse_intervals("router")
+    with pytest.raises(ValueError):
+        parse_intervals("router=0")
+
+
+def test_first_probes_are_spread_across_the_interval():
+    from scheduler import ProbeScheduler
+    clock = _Clock()
+    scheduler = ProbeScheduler(60, {}, clock=clock)
+    scheduler.sync(_devices(600))
+
+    per_window = [len(scheduler.pop_due(clock.now + t)) for t in range(10, 70, 10)]
+    assert sum(per_window) == 600
+    # ~100 per 10 s window; a burst would put everything in the first one.
+    assert all(60 <= n <= 140 for n in per_window)
+
+
+def test_each_device_is_due_once_per_interval():
+    from scheduler import ProbeScheduler
+    clock = _Clock()
+    scheduler = ProbeScheduler(60, {"router": 15}, clock=clock)
+    scheduler.sync([("r", "10.0.0.1", "router"), ("s", "10.0.0.2", "server")])
+
+    counts = {"r": 0, "s": 0}
+    for t in range(1, 241):
+        for device_id, _ip in scheduler.pop_due(clock.now + t):
+            counts[device_id] += 1
+    assert counts == {"r": 16, "s": 4}
+
+
+def test_sync_drops_removed_devices_and_updates_ip():
+    from scheduler import ProbeScheduler
+    clock = _Clock()
+    scheduler = ProbeScheduler(60, {}, clock=clock)
+    scheduler.sync([("a", "10.0.0.1", None), ("b", "10.0.0.2", None)])
+    scheduler.sync([("a", "10.0.0.9", None)])
+
+    assert len(scheduler) == 1
+    assert scheduler.pop_due(clock.now + 60) == [("a", "10.0.0.9")]
+
+
+def test_shorter_type_interval_applies_without_waiting_out_the_old_one():
+    from scheduler import ProbeScheduler
+    clock = _Clock()
+    scheduler = ProbeScheduler(300, {"router": 10}, clock=clock)
+    scheduler.sync([("a", "10.0.0.1", "iot")])
+    scheduler.pop_due(clock.now + 300)  # next probe now ~300 s away
+    clock.now += 300
+    scheduler.sync([("a", "10.0.0.1", "router")])
+    assert scheduler.pop_due(clock.now + 10) == [("a", "10.0.0.1")]
+
+
+def test_shards_partition_devices():
+    from scheduler import ProbeScheduler
+    devices = _devices(3000)
+    owned = []
+    for index in range(3):
+        scheduler = ProbeScheduler(60, {}, shard_index=index, shard_count=3)
+        scheduler.sync(devices)
+        owned.append(scheduler.device_ids())
+    assert sum(len(ids) for ids in owned) == 3000
+    assert set().union(*owned) == {d[0] for d in devices}
+    assert all(800 <= len(ids) <= 1200 for ids in owned)
+
+
+def test_adding_a_shard_moves_few_devices():
+    from scheduler import shard_owner
+    ids = [f"dev-{i}" for i in range(4000)]
+    moved = sum(shard_owner(i, 3) != shard_owner(i, 4) for i in ids)
+    # Ideal is 1/4; modulo hashing would move ~3/4.
+    assert moved < len(ids) * 0.35
+
+
+def test_invalid_shard_index():
+    from scheduler import ProbeScheduler
+    with pytest.raises(ValueError):
+        ProbeScheduler(60, shard_index=2, shard_count=2)
@@ -0,0 +1,117 @@
+"""
+Debounced per-device up/down state machine for the ping worker.
+
+A single lost packet no longer flips a device:
+  alive -> unreachable   when at least N of the last M probes failed (DOWN_THRESHOLD)
+  unreachable -> alive   when at least N of the last M probes answered (UP_THRESHOLD)
+The very first probe of a device sets its state directly.
+
+A device whose debounced state changed FLAP_THRESHOLD or more times within
+FLAP_WINDOW seconds is reported as "flapping" until it settles again.
+
+Devices that stay unreachable are probed less often: after the transition
+each further failed probe doubles the interval multiplier returned by
+backoff(), up to DOWN_BACKOFF_MAX. The first answer resets it.
+"""
+import time
+from collections import deque
+from collections.abc import Callable
+
+ALIVE = "alive"
+UNREACHABLE = "unreachable"
+FLAPPING = "flapping"
+
+
+def parse_threshold(spec: str) -> tuple[int, int]:
+    """Parse "N/M" (N of the last M probes) into (N, M)."""
+    count, sep, window = spec.partition("/")
+    try:
+        n, m = int(count), int(window) if sep else int(count)
+    except ValueError:
+        raise ValueError(f"invalid threshold {spec!r}, expected N/M") from None
+    if not 1 <= n <= m:
+        raise ValueError(f"invalid threshold {spec!r}, need 1 <= N <= M")
+    return n, m
+
+
+class DeviceHealth:
+    __slots__ = ("results", "state", "changes", "down_probes")
+
+    def __init__(self, window: int) -> None:
+        self.results: deque[bool] = deque(maxlen=window)
+        self.state: str | None = None
+        self.changes: deque[float] = deque()
+        self.down_probes = 0
+
+
+class HealthTracker:
+    """Debounced status, flap detection and down-backoff for every device."""
+
+    def __init__(
+        self,
+        down: tuple[int, int] = (3, 5),
+        up: tuple[int, int] = (2, 3),
+        flap_threshold: int = 4,
+        flap_window: float = 600.0,
+        backoff_max: float = 8.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.down = down
+        self.up = up
+        self.flap_threshold = flap_threshold
+        self.flap_window = flap_window
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._window = max(down[1], up[1])
+        self._devices: dict[str, DeviceHealth] = {}
+
+    def observe(self, device_id: str, alive: bool) -> str:
+        """Record one probe result and return the status to report."""
+        now = self._clock()
+        health = self._devices.get(device_id)
+        if health is None:
+            health = self._devices[device_id] = DeviceHealth(self._window)
+        health.results.append(alive)
+
+        if health.state is None:
+            health.state = ALIVE if alive else UNREACHABLE
+        elif health.state == ALIVE and self._count(health, False, self.down[1]) >= self.down[0]:
+            self._change(health, UNREACHABLE, now)
+        elif health.state == UNREACHABLE and self._count(health, True, self.up[1]) >= self.up[0]:
+            self._change(health, ALIVE, now)
+
+        if health.state == UNREACHABLE and not alive:
+            health.down_probes += 1
+        elif alive:
+            health.down_probes = 0
+        return self.status(device_id, now)
+
+    def status(self, device_id: str, now: float | None = None) -> str | None:
+        health = self._devices.get(device_id)
+        if health is None:
+            return None
+        now = self._clock() if now is None else now
+        while health.changes and health.changes[0] <= now - self.flap_window:
+            health.changes.popleft()
+        return FLAPPING if len(health.changes) >= self.flap_threshold else health.state
+
+    def backoff(self, device_id: str) -> float:
+        """Interval multiplier for the device's next probe (1 unless it stays down)."""
+        health = self._devices.get(device_id)
+        if health is None or health.down_probes <= 1:
+            return 1.0
+        return min(self.backoff_max, 2.0 ** (health.down_probes - 1))
+
+    def forget(self, keep: set[str]) -> None:
+        """Drop every device not in keep."""
+        for device_id in self._devices.keys() - keep:
+            del self._devices[device_id]
+
+    def _change(self, health: DeviceHealth, state: str, now: float) -> None:
+        health.state = state
+        health.changes.append(now)
+
+    @staticmethod
+    def _count(health: DeviceHealth, value: bool, last: int) -> int:
+        results = health.results
+        return sum(1 for i in range(max(0, len(results) - last), len(results)) if results[i] is value)
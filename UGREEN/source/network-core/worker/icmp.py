@@ -0,0 +1,218 @@
+"""
+Async ICMP echo engine for the ping worker.
+
+Backends (all expose ping() / ping_many() returning RTT in seconds or None):
+  IcmpSocketBackend  - one non-blocking ICMP socket for every probe. Tries an
+                       unprivileged datagram socket (net.ipv4.ping_group_range)
+                       first, then a raw socket (root / CAP_NET_RAW). Replies
+                       are matched by (source address, sequence number).
+  SubprocessBackend  - one `ping -c 1` process per probe; the fallback when no
+                       ICMP socket can be opened.
+
+make_backend("auto" | "icmp" | "subprocess", ...) picks one.
+"""
+import asyncio
+import itertools
+import logging
+import os
+import re
+import socket
+import struct
+import time
+
+log = logging.getLogger("ping_worker.icmp")
+
+ICMP_ECHO_REPLY = 0
+ICMP_ECHO_REQUEST = 8
+_HEADER = struct.Struct("!BBHHH")  # type, code, checksum, identifier, sequence
+RECV_BUFFER = 4 * 1024 * 1024
+_RTT_RE = re.compile(rb"time[=<]([\d.]+) ?ms")
+
+
+def checksum(data: bytes) -> int:
+    """RFC 1071 internet checksum."""
+    if len(data) % 2:
+        data += b"\0"
+    total = sum(struct.unpack(f"!{len(data) // 2}H", data))
+    total = (total >> 16) + (total & 0xFFFF)
+    total += total >> 16
+    return ~total & 0xFFFF
+
+
+def build_echo_request(ident: int, seq: int, payload: bytes = b"") -> bytes:
+    header = _HEADER.pack(ICMP_ECHO_REQUEST, 0, 0, ident, seq)
+    csum = checksum(header + payload)
+    return _HEADER.pack(ICMP_ECHO_REQUEST, 0, csum, ident, seq) + payload
+
+
+def parse_echo_reply(packet: bytes, has_ip_header: bool) -> tuple[int, int] | None:
+    """Return (identifier, sequence) of an echo reply, or None for anything else."""
+    if has_ip_header:
+        if not packet:
+            return None
+        packet = packet[(packet[0] & 0x0F) * 4:]
+    if len(packet) < _HEADER.size:
+        return None
+    icmp_type, _code, _csum, ident, seq = _HEADER.unpack_from(packet)
+    if icmp_type != ICMP_ECHO_REPLY:
+        return None
+    return ident, seq
+
+
+class RateLimiter:
+    """Spaces calls to wait() at least 1/rate seconds apart (rate <= 0 disables it)."""
+
+    def __init__(self, rate: float) -> None:
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        now = time.monotonic()
+        slot = max(now, self._next)
+        self._next = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+class PingBackend:
+    """
+    Base class: bounded concurrency and send rate around a single-probe ping().
+
+    Both limits are per backend instance, so they also hold across
+    concurrent ping_many() calls.
+    """
+
+    name = "base"
+
+    def __init__(self, concurrency: int = 256, rate: float = 1000.0, timeout: float = 2.0) -> None:
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._limiter = RateLimiter(rate)
+        self._semaphore = asyncio.Semaphore(concurrency)
+
+    async def ping(self, ip: str) -> float | None:
+        raise NotImplementedError
+
+    async def ping_many(self, ips: list[str]) -> list[float | None]:
+        """Probe every address; results are RTTs in seconds (None = no reply), in input order."""
+        async def one(ip: str) -> float | None:
+            async with self._semaphore:
+                await self._limiter.wait()
+                return await self.ping(ip)
+
+        return list(await asyncio.gather(*(one(ip) for ip in ips)))
+
+    async def close(self) -> None:
+        pass
+
+
+class SubprocessBackend(PingBackend):
+    name = "subprocess"
+
+    async def ping(self, ip: str) -> float | None:
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                "ping", "-c", "1", "-W", str(max(1, round(self.timeout))), ip,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+            )
+            stdout, _ = await proc.communicate()
+        except Exception:
+            return None
+        if proc.returncode != 0:
+            return None
+        match = _RTT_RE.search(stdout or b"")
+        return float(match.group(1)) / 1000 if match else 0.0
+
+
+class IcmpSocketBackend(PingBackend):
+    name = "icmp"
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._sock: socket.socket | None = None
+        self._raw = False
+        self._ident = os.getpid() & 0xFFFF
+        self._seq = itertools.count()
+        self._pending: dict[tuple[str, int], tuple[asyncio.Future, float]] = {}
+        self._fallback = SubprocessBackend(timeout=self.timeout)
+
+    def open(self) -> "IcmpSocketBackend":
+        """Open the shared socket; raises OSError when ICMP sockets are not permitted."""
+        try:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM, socket.IPPROTO_ICMP)
+            self._raw = False
+        except OSError:
+            sock = socket.socket(socket.AF_INET, socket.SOCK_RAW, socket.IPPROTO_ICMP)
+            self._raw = True
+        sock.setblocking(False)
+        # Large bursts of replies must not overflow the default receive buffer.
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, RECV_BUFFER)
+        self._sock = sock
+        asyncio.get_running_loop().add_reader(sock.fileno(), self._on_readable)
+        log.info("ICMP backend using %s socket", "raw" if self._raw else "datagram")
+        return self
+
+    async def close(self) -> None:
+        if self._sock:
+            asyncio.get_running_loop().remove_reader(self._sock.fileno())
+            self._sock.close()
+            self._sock = None
+
+    async def ping(self, ip: str) -> float | None:
+        if ":" in ip:
+            return await self._fallback.ping(ip)  # the shared socket is IPv4 only
+        loop = asyncio.get_running_loop()
+        seq = next(self._seq) & 0xFFFF
+        key = (ip, seq)
+        future = loop.create_future()
+        self._pending[key] = (future, time.perf_counter())
+        try:
+            await loop.sock_sendto(self._sock, build_echo_request(self._ident, seq), (ip, 0))
+            return await asyncio.wait_for(future, self.timeout)
+        except (OSError, TimeoutError):
+            return None
+        finally:
+            self._pending.pop(key, None)
+
+    def _on_readable(self) -> None:
+        received = time.perf_counter()
+        while True:
+            try:
+                packet, (src, _port) = self._sock.recvfrom(2048)
+            except (BlockingIOError, InterruptedError):
+                return
+            except OSError:
+                return
+            reply = parse_echo_reply(packet, self._raw)
+            if reply is None:
+                continue
+            ident, seq = reply
+            # Datagram sockets get their identifier rewritten by the kernel and
+            # only ever see their own replies; raw sockets see everyone's.
+            if self._raw and ident != self._ident:
+                continue
+            pending = self._pending.get((src, seq))
+            if pending and not pending[0].done():
+                pending[0].set_result(received - pending[1])
+
+
+def make_backend(name: str = "auto", **options) -> PingBackend:
+    """
+    Build a ping backend. Must be called from a running event loop.
+
+    "auto" prefers the ICMP socket and falls back to subprocess ping when the
+    socket cannot be opened.
+    """
+    if name in ("auto", "icmp"):
+        try:
+            return IcmpSocketBackend(**options).open()
+        except OSError as exc:
+            if name == "icmp":
+                raise
+            log.warning("ICMP socket unavailable (%s), falling back to subprocess ping", exc)
+    elif name != "subprocess":
+        raise ValueError(f"unknown ping backend {name!r}")
+    return SubprocessBackend(**options)
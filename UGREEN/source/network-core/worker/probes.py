@@ -0,0 +1,145 @@
+"""
+Historia pingow: surowe wyniki w device_probes, agregaty w device_probe_rollups.
+
+Kazda paczka sond:
+  1. agregacja paczki w pamieci per (urzadzenie, rozdzielczosc, kubelek),
+  2. jeden INSERT ... ON CONFLICT DO UPDATE, ktory dokleja agregaty do
+     istniejacych kubelkow (samples/lost/rtt_sum sumowane, min/max laczone),
+  3. COPY surowych wierszy (device_id, ts, rtt_ms, lost) do device_probes.
+
+Wszystko w transakcji rundy, razem ze zmianami statusu. Czas w UTC.
+
+device_probes jest partycjonowana po dniu (device_probes_YYYYMMDD);
+maintain_partitions() tworzy partycje na dzis i jutro oraz usuwa te starsze
+niz PROBE_RETENTION_DAYS, razem z kubelkami 1m z tego okresu.
+"""
+import logging
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+log = logging.getLogger("ping_worker.probes")
+
+PROBE_TABLE = "device_probes"
+PROBE_COLUMNS = ("device_id", "ts", "rtt_ms", "lost")
+
+# resolution -> bucket truncation; must match RESOLUTIONS in backend probe_service.py
+ROLLUPS = {
+    "1m": lambda ts: ts.replace(second=0, microsecond=0),
+    "1h": lambda ts: ts.replace(minute=0, second=0, microsecond=0),
+}
+
+ROLLUP_COLUMNS = ("device_id", "resolution", "bucket", "samples", "lost", "rtt_min", "rtt_max", "rtt_sum")
+
+# One statement per batch; each parameter is an array holding one column.
+_UPSERT_ROLLUPS = text(
+    "INSERT INTO device_probe_rollups "
+    "(device_id, resolution, bucket, samples, lost, rtt_min, rtt_max, rtt_sum) "
+    "SELECT * FROM unnest("
+    "CAST(:device_id AS text[]), CAST(:resolution AS text[]), CAST(:bucket AS timestamp[]), "
+    "CAST(:samples AS integer[]), CAST(:lost AS integer[]), "
+    "CAST(:rtt_min AS double precision[]), CAST(:rtt_max AS double precision[]), "
+    "CAST(:rtt_sum AS double precision[])) "
+    "ON CONFLICT (device_id, resolution, bucket) DO UPDATE SET "
+    "samples = device_probe_rollups.samples + EXCLUDED.samples, "
+    "lost = device_probe_rollups.lost + EXCLUDED.lost, "
+    "rtt_min = LEAST(device_probe_rollups.rtt_min, EXCLUDED.rtt_min), "
+    "rtt_max = GREATEST(device_probe_rollups.rtt_max, EXCLUDED.rtt_max), "
+    "rtt_sum = device_probe_rollups.rtt_sum + EXCLUDED.rtt_sum"
+)
+
+
+def utcnow() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def probe_records(
+    devices: list[tuple[str, str]], rtts: list[float | None], ts: datetime,
+) -> list[tuple[str, datetime, float | None, bool]]:
+    """Wiersze do COPY: (device_id, ts, rtt_ms, lost)."""
+    return [
+        (device_id, ts, round(rtt * 1000, 3) if rtt is not None else None, rtt is None)
+        for (device_id, _ip), rtt in zip(devices, rtts)
+    ]
+
+
+def aggregate_rollups(records: list[tuple[str, datetime, float | None, bool]]) -> list[dict]:
+    """Agreguje paczke rekordow do wierszy device_probe_rollups (jeden na kubelek)."""
+    buckets: dict[tuple[str, str, datetime], dict] = {}
+    for device_id, ts, rtt_ms, lost in records:
+        for resolution, truncate in ROLLUPS.items():
+            key = (device_id, resolution, truncate(ts))
+            row = buckets.get(key)
+            if row is None:
+                row = buckets[key] = {"samples": 0, "lost": 0, "rtt_min": None, "rtt_max": None, "rtt_sum": 0.0}
+            row["samples"] += 1
+            if lost:
+                row["lost"] += 1
+                continue
+            row["rtt_sum"] += rtt_ms
+            row["rtt_min"] = rtt_ms if row["rtt_min"] is None else min(row["rtt_min"], rtt_ms)
+            row["rtt_max"] = rtt_ms if row["rtt_max"] is None else max(row["rtt_max"], rtt_ms)
+    return [
+        {"device_id": device_id, "resolution": resolution, "bucket": bucket, **row}
+        for (device_id, resolution, bucket), row in buckets.items()
+    ]
+
+
+async def record_probes(
+    session: AsyncSession, devices: list[tuple[str, str]], rtts: list[float | None],
+) -> None:
+    """
+    Zapisuje paczke wynikow (przyrostowe agregaty + COPY) w biezacej transakcji.
+
+    Agregaty ida pierwsze: dopiero execute() sesji wysyla BEGIN, a COPY
+    przez surowe polaczenie asyncpg tego nie robi — wykonane jako pierwsze
+    zatwierdziloby sie samo, niezaleznie od rollbacku rundy.
+    """
+    records = probe_records(devices, rtts, utcnow())
+    if not records:
+        return
+    rows = aggregate_rollups(records)
+    await session.execute(
+        _UPSERT_ROLLUPS, {column: [row[column] for row in rows] for column in ROLLUP_COLUMNS},
+    )
+
+    conn = await session.connection()
+    raw = await conn.get_raw_connection()
+    # The upsert above opened the transaction; COPY on the same connection joins it.
+    await raw.driver_connection.copy_records_to_table(PROBE_TABLE, records=records, columns=PROBE_COLUMNS)
+
+
+def partition_name(day: date) -> str:
+    return f"{PROBE_TABLE}_{day:%Y%m%d}"
+
+
+async def maintain_partitions(session: AsyncSession, retention_days: int, today: date | None = None) -> None:
+    """Tworzy partycje na dzis i jutro, usuwa starsze niz retention_days (0 = bez usuwania)."""
+    today = today or utcnow().date()
+    for day in (today, today + timedelta(days=1)):
+        await session.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {PROBE_TABLE} "
+            f"FOR VALUES FROM ('{day.isoformat()}') TO ('{(day + timedelta(days=1)).isoformat()}')"
+        ))
+    if retention_days > 0:
+        cutoff = today - timedelta(days=retention_days)
+        result = await session.execute(
+            text(
+                "SELECT c.relname FROM pg_inherits i "
+                "JOIN pg_class c ON c.oid = i.inhrelid "
+                "JOIN pg_class p ON p.oid = i.inhparent "
+                "WHERE p.relname = :parent"
+            ),
+            {"parent": PROBE_TABLE},
+        )
+        for (name,) in result.fetchall():
+            suffix = name.removeprefix(f"{PROBE_TABLE}_")
+            if suffix.isdigit() and len(suffix) == 8 and suffix < f"{cutoff:%Y%m%d}":
+                await session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+                log.info("Dropped expired probe partition %s", name)
+        await session.execute(
+            text("DELETE FROM device_probe_rollups WHERE resolution = '1m' AND bucket < :cutoff"),
+            {"cutoff": datetime.combine(cutoff, datetime.min.time())},
+        )
+    await session.commit()
@@ -0,0 +1,162 @@
+"""
+Continuous probe scheduler for the ping worker.
+
+Instead of pinging every device in one burst per INTERVAL, each device gets
+its own due time on a min-heap. A device's first probe is placed at a stable,
+hash-derived phase inside its interval, so probes are spread evenly over time
+and a restart does not bunch them up again. Intervals are set per device_type
+(routers often, IoT rarely) with INTERVAL as the default.
+
+Replicas split the device set with rendezvous (highest-random-weight)
+hashing: every replica computes the same owner for a device from its id
+alone, so no coordination is needed and changing SHARD_COUNT moves only
+about 1/SHARD_COUNT of the devices.
+"""
+import hashlib
+import heapq
+import itertools
+import time
+from collections.abc import Callable, Iterable
+
+# Seconds between probes per device_type; INTERVAL covers everything else.
+DEFAULT_TYPE_INTERVALS = {"router": 15.0, "network": 15.0, "iot": 300.0}
+
+
+def _hash64(value: str) -> int:
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def parse_intervals(spec: str) -> dict[str, float]:
+    """Parse "router=15,iot=300" into {"router": 15.0, "iot": 300.0}."""
+    intervals = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        device_type, sep, seconds = part.partition("=")
+        if not sep:
+            raise ValueError(f"invalid interval {part!r}, expected type=seconds")
+        value = float(seconds)
+        if value <= 0:
+            raise ValueError(f"interval for {device_type.strip()!r} must be positive")
+        intervals[device_type.strip()] = value
+    return intervals
+
+
+def shard_owner(device_id: str, shard_count: int) -> int:
+    """Index of the replica responsible for device_id (rendezvous hashing)."""
+    if shard_count <= 1:
+        return 0
+    return max(range(shard_count), key=lambda shard: _hash64(f"{shard}:{device_id}"))
+
+
+class ProbeScheduler:
+    """Min-heap of (due time, device id) for the devices owned by this shard."""
+
+    def __init__(
+        self,
+        default_interval: float,
+        type_intervals: dict[str, float] | None = None,
+        shard_index: int = 0,
+        shard_count: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        backoff: Callable[[str], float] | None = None,
+    ) -> None:
+        if not 0 <= shard_index < max(shard_count, 1):
+            raise ValueError(f"shard index {shard_index} out of range for {shard_count} shard(s)")
+        self.default_interval = default_interval
+        self.type_intervals = dict(DEFAULT_TYPE_INTERVALS if type_intervals is None else type_intervals)
+        self.shard_index = shard_index
+        self.shard_count = shard_count
+        self._clock = clock
+        # device id -> interval multiplier, e.g. HealthTracker.backoff for devices that stay down
+        self._backoff = backoff
+        self._heap: list[tuple[float, int, str]] = []
+        self._tiebreak = itertools.count()
+        # device id -> [ip, interval, due]; heap entries whose due no longer
+        # matches (or whose device is gone) are skipped when popped.
+        self._devices: dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._devices)
+
+    def device_ids(self) -> set[str]:
+        return set(self._devices)
+
+    def interval_for(self, device_type: str | None) -> float:
+        return self.type_intervals.get(device_type or "", self.default_interval)
+
+    def sync(self, devices: Iterable[tuple[str, str, str | None]]) -> None:
+        """
+        Reconcile with the current (id, ip, device_type) list from the database.
+
+        Devices owned by another shard are ignored, vanished ones dropped and
+        new ones scheduled at their hash phase within the interval.
+        """
+        now = self._clock()
+        seen = set()
+        for device_id, ip, device_type in devices:
+            if shard_owner(device_id, self.shard_count) != self.shard_index:
+                continue
+            seen.add(device_id)
+            interval = self.interval_for(device_type)
+            entry = self._devices.get(device_id)
+            if entry is None:
+                phase = _hash64(device_id) / 2**64 * interval
+                self._push(device_id, [ip, interval, now + phase])
+                continue
+            entry[0] = ip
+            if entry[1] != interval:
+                # Never wait longer than the new interval for the next probe.
+                entry[1] = interval
+                if entry[2] > now + interval:
+                    self._push(device_id, [ip, interval, now + interval])
+        for device_id in self._devices.keys() - seen:
+            del self._devices[device_id]
+
+    def pop_due(self, now: float | None = None) -> list[tuple[str, str]]:
+        """Return (id, ip) of every device due by now and schedule its next probe."""
+        now = self._clock() if now is None else now
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            when, _, device_id = heapq.heappop(self._heap)
+            entry = self._devices.get(device_id)
+            if entry is None or entry[2] != when:
+                continue
+            ip, interval, _ = entry
+            due.append((device_id, ip))
+            step = interval * self._backoff(device_id) if self._backoff else interval
+            # Keep the phase unless we fell more than a whole step behind.
+            next_due = when + step
+            self._push(device_id, [ip, interval, next_due if next_due > now else now + step])
+        return due
+
+    def reschedule(self, device_ids: Iterable[str], now: float | None = None) -> None:
+        """
+        Re-apply backoff after new probe results, only ever moving a probe earlier.
+
+        pop_due sets the next due before the probe is answered, so a device
+        that comes back would otherwise wait out its last backed-off step.
+        """
+        now = self._clock() if now is None else now
+        for device_id in device_ids:
+            entry = self._devices.get(device_id)
+            if entry is None:
+                continue
+            ip, interval, due = entry
+            step = interval * self._backoff(device_id) if self._backoff else interval
+            if due > now + step:
+                self._push(device_id, [ip, interval, now + step])
+
+    def next_due(self) -> float | None:
+        """Due time of the earliest live entry, or None when nothing is scheduled."""
+        while self._heap:
+            when, _, device_id = self._heap[0]
+            entry = self._devices.get(device_id)
+            if entry is not None and entry[2] == when:
+                return when
+            heapq.heappop(self._heap)
+        return None
+
+    def _push(self, device_id: str, entry: list) -> None:
+        self._devices[device_id] = entry
+        heapq.heappush(self._heap, (entry[2], next(self._tiebreak), device_id))